@@ -0,0 +1,349 @@
+"""
+命令行入口
+用法: python -m app.cli {add,list,complete,delete,tag,search,stats,import,export} ...
+
+不导入 PySide6；SQLAlchemy、模型和控制器在命令真正需要时才导入。
+添加任务默认走 sqlite3 快速路径，完全不导入 SQLAlchemy：
+全文索引和标签计数由数据库触发器维护，直接插入行即可保持一致。
+"""
+
+import time
+
+# 尽早记录时间，用于 --timing 报告导入耗时
+_START = time.perf_counter()
+
+import argparse
+import sqlite3
+import sys
+from datetime import date, datetime
+
+from app.utils.db_config import load_db_path, load_profile, sql_stats_enabled
+
+# 快速路径按这个结构版本编写；数据库版本不同时退回控制器路径。
+# 新增迁移后确认下面的 INSERT 语句仍然正确，再同步更新该版本号
+FAST_PATH_SCHEMA_VERSION = 7
+
+# 优先级的命令行写法
+PRIORITY_ALIASES = {
+    "none": 0, "low": 1, "medium": 2, "high": 3,
+    "无": 0, "低": 1, "中": 2, "高": 3,
+    "0": 0, "1": 1, "2": 2, "3": 3,
+}
+
+def _parse_priority(value: str) -> int:
+    """解析 --priority 参数"""
+    try:
+        return PRIORITY_ALIASES[value.strip().lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"无效的优先级: {value}（可选 none/low/medium/high 或 0-3）")
+
+def _parse_date(value: str) -> str:
+    """解析 --due 参数，返回 yyyy-MM-dd 字符串"""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的日期: {value}（格式 yyyy-MM-dd）")
+
+def _controllers():
+    """初始化数据库并创建控制器（此时才导入 SQLAlchemy）
+
+    Returns:
+        (TaskController, TagController)
+    """
+    from app.models.base import init_db
+    from app.controllers.tag_controller import TagController
+    from app.controllers.task_controller import TaskController
+
+    session = init_db()
+    tag_controller = TagController(session)
+    return TaskController(session, tag_controller), tag_controller
+
+def _add_fast(title, due_date, priority, tag_names):
+    """不经过 SQLAlchemy 直接插入任务
+
+    Returns:
+        新任务ID；数据库结构版本与快速路径不一致时返回None
+    """
+    db_path = load_db_path()
+    if not db_path.exists():
+        return None
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        for statement in load_profile().pragma_statements():
+            conn.execute(statement)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != FAST_PATH_SCHEMA_VERSION:
+            return None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 与模型默认值一致：completed 为 False，created_at 为 UTC 时间
+            task_id = conn.execute(
+                "INSERT INTO task (title, completed, created_at, due_date, priority) VALUES (?, 0, ?, ?, ?)",
+                (title, datetime.utcnow().isoformat(" ", timespec="microseconds"), due_date, priority),
+            ).lastrowid
+            for tag_name in dict.fromkeys(tag_names):
+                conn.execute("INSERT OR IGNORE INTO tag (tag) VALUES (?)", (tag_name,))
+                tag_id = conn.execute("SELECT id FROM tag WHERE tag = ?", (tag_name,)).fetchone()[0]
+                conn.execute("INSERT OR IGNORE INTO task_tags (task_id, tag_id) VALUES (?, ?)", (task_id, tag_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return task_id
+    finally:
+        conn.close()
+
+def _format_row(row) -> str:
+    """格式化一行任务"""
+    from app.models.task import PRIORITY_NAMES
+
+    mark = "[x]" if row.completed else "[ ]"
+    due = row.due_date.isoformat() if row.due_date else "----------"
+    tags = " ".join(f"#{tag}" for tag in row.tags)
+    return f"{mark} {row.id:>6}  {due}  {PRIORITY_NAMES.get(row.priority, '?')}  {row.title}  {tags}".rstrip()
+
+def cmd_add(args):
+    """添加任务"""
+    tag_names = [name.strip() for name in args.tag if name.strip()]
+    task_id = None
+    if not args.no_fast_path:
+        task_id = _add_fast(args.title, args.due, args.priority, tag_names)
+    if task_id is None:
+        tasks, tags = _controllers()
+        tag_ids = [tags.get_or_create_tag(name).id for name in tag_names]
+        task_id = tasks.create_task(args.title, args.due, tag_ids, args.priority).id
+    print(f"已添加任务 {task_id}")
+    return 0
+
+def cmd_list(args):
+    """按默认排序列出任务"""
+    tasks, tags = _controllers()
+    task_ids = None
+    if args.tag:
+        from app.controllers.tag_index import TagFilter
+
+        tag_ids = [tags.get_tag_id(name) for name in args.tag]
+        if None in tag_ids:
+            print("没有符合条件的任务")
+            return 0
+        task_ids = tasks.filter_by_tags(TagFilter(all_of=tuple(tag_ids)))
+
+    shown = 0
+    cursor = None
+    while shown < args.limit:
+        rows, cursor = tasks.get_task_page(cursor, task_ids=task_ids)
+        for row in rows:
+            if row.completed and args.pending:
+                # 已完成的任务排在最后，之后不会再有未完成的任务
+                cursor = None
+                break
+            print(_format_row(row))
+            shown += 1
+            if shown == args.limit:
+                break
+        if cursor is None:
+            break
+    if not shown:
+        print("没有符合条件的任务")
+    return 0
+
+def cmd_complete(args):
+    """标记任务完成（--undo 时标记为未完成）"""
+    tasks, _ = _controllers()
+    count = tasks.bulk_set_completed(args.ids, not args.undo)
+    print(f"已更新 {count} 个任务")
+    return 0 if count == len(set(args.ids)) else 1
+
+def cmd_delete(args):
+    """删除任务"""
+    tasks, _ = _controllers()
+    count = tasks.bulk_delete(args.ids)
+    print(f"已删除 {count} 个任务")
+    return 0 if count == len(set(args.ids)) else 1
+
+def cmd_tag(args):
+    """为任务追加标签（标签不存在时创建）"""
+    tasks, tags = _controllers()
+    tag_ids = [tags.get_or_create_tag(name.strip()).id for name in args.add if name.strip()]
+    existing = [row.id for row in tasks.list_task_rows(args.ids)]
+    missing = sorted(set(args.ids) - set(existing))
+    if missing:
+        print(f"任务不存在: {', '.join(map(str, missing))}", file=sys.stderr)
+    tasks.bulk_add_tags(existing, tag_ids)
+    print(f"已为 {len(existing)} 个任务添加标签")
+    return 1 if missing else 0
+
+def cmd_search(args):
+    """全文检索任务"""
+    tasks, _ = _controllers()
+    rows = tasks.search(args.query, args.limit)
+    for row in rows:
+        print(_format_row(row))
+    if not rows:
+        print("没有找到匹配的任务")
+    return 0
+
+def cmd_stats(args):
+    """显示任务统计"""
+    from sqlalchemy import func
+    from app.controllers.due_index import DUE_BUCKET_NAMES
+    from app.models.task import Task
+
+    tasks, tags = _controllers()
+    query = tasks.session.query(func.count(Task.id))
+    total = query.scalar()
+    completed = query.filter(Task.completed.is_(True)).scalar()
+    buckets = tasks.count_due_buckets()
+
+    print(f"任务总数: {total}")
+    print(f"已完成: {completed}")
+    print(f"未完成: {total - completed}")
+    for bucket, count in buckets.items():
+        print(f"  {DUE_BUCKET_NAMES[bucket]}: {count}")
+    tag_counts = sorted(tags.get_tags_with_counts(use_cached=True), key=lambda tag: -tag.count)
+    if tag_counts:
+        print("标签:")
+        for tag in tag_counts[:args.top]:
+            print(f"  #{tag.name}: {tag.count}")
+    return 0
+
+def cmd_import(args):
+    """从 CSV/JSONL 文件批量导入任务"""
+    from app.models.base import init_db
+    from app.utils.importer import MAX_REPORTED_ERRORS, TaskImporter
+
+    init_db().close()
+    importer = TaskImporter(workers=args.workers, **({"chunk_size": args.chunk_size} if args.chunk_size else {}))
+
+    def report(progress):
+        rate = progress.records / progress.elapsed if progress.elapsed else 0
+        print(
+            f"\r已处理 {progress.records} 条，导入 {progress.imported}，失败 {progress.failed}（{rate:.0f} 条/秒）",
+            end="", file=sys.stderr, flush=True,
+        )
+
+    try:
+        result = importer.run(args.path, args.format, progress=report, restart=args.restart)
+    except (OSError, ValueError) as e:
+        print(f"导入失败: {e}", file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+
+    for error in result.errors[:args.show_errors]:
+        print(f"第 {error.record} 条记录: {error.message}", file=sys.stderr)
+    hidden = len(result.errors) - args.show_errors
+    if hidden > 0:
+        more = "+" if len(result.errors) == MAX_REPORTED_ERRORS else ""
+        print(f"……另有 {hidden}{more} 条错误未显示", file=sys.stderr)
+    if result.resumed_from:
+        print(f"从第 {result.resumed_from} 条记录之后继续导入")
+    print(f"共处理 {result.records} 条记录，导入 {result.imported} 个任务，{result.failed} 条记录无效")
+    return 1 if result.errors else 0
+
+def cmd_export(args):
+    """导出全部任务"""
+    from app.models.base import init_db
+    from app.utils.exporter import detect_export_format, export_tasks, write_tasks
+
+    init_db().close()
+    if args.path == "-":
+        # 输出到标准输出时不压缩，需要压缩可以通过管道交给 gzip
+        count = write_tasks(sys.stdout, args.format or "jsonl")
+    else:
+        try:
+            fmt = args.format or detect_export_format(args.path)
+            count = export_tasks(args.path, fmt, compress=args.gzip or None)
+        except (OSError, ValueError) as e:
+            print(f"导出失败: {e}", file=sys.stderr)
+            return 2
+    print(f"已导出 {count} 个任务", file=sys.stderr)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    """构造命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="TaskMoment 命令行工具")
+    parser.add_argument("--timing", action="store_true", help="在标准错误输出中报告导入和执行耗时")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="添加任务")
+    add.add_argument("title", help="任务标题")
+    add.add_argument("--due", type=_parse_date, help="截止日期 yyyy-MM-dd")
+    add.add_argument("--priority", type=_parse_priority, default=0, help="优先级 none/low/medium/high")
+    add.add_argument("--tag", action="append", default=[], help="标签名称，可重复指定")
+    add.add_argument("--no-fast-path", action="store_true", help="通过控制器添加（不使用 sqlite3 快速路径）")
+    add.set_defaults(func=cmd_add)
+
+    list_ = commands.add_parser("list", help="列出任务")
+    list_.add_argument("--limit", type=int, default=50, help="最多显示的任务数")
+    list_.add_argument("--tag", action="append", default=[], help="只显示包含该标签的任务，可重复指定")
+    list_.add_argument("--pending", action="store_true", help="只显示未完成的任务")
+    list_.set_defaults(func=cmd_list)
+
+    complete = commands.add_parser("complete", help="标记任务完成")
+    complete.add_argument("ids", type=int, nargs="+", help="任务ID")
+    complete.add_argument("--undo", action="store_true", help="标记为未完成")
+    complete.set_defaults(func=cmd_complete)
+
+    delete = commands.add_parser("delete", help="删除任务")
+    delete.add_argument("ids", type=int, nargs="+", help="任务ID")
+    delete.set_defaults(func=cmd_delete)
+
+    tag = commands.add_parser("tag", help="为任务添加标签")
+    tag.add_argument("ids", type=int, nargs="+", help="任务ID")
+    tag.add_argument("--add", action="append", required=True, help="标签名称，可重复指定")
+    tag.set_defaults(func=cmd_tag)
+
+    search = commands.add_parser("search", help="搜索任务标题和标签")
+    search.add_argument("query", help="搜索关键词")
+    search.add_argument("--limit", type=int, default=20, help="最多显示的结果数")
+    search.set_defaults(func=cmd_search)
+
+    stats = commands.add_parser("stats", help="显示任务统计")
+    stats.add_argument("--top", type=int, default=10, help="显示任务最多的前几个标签")
+    stats.set_defaults(func=cmd_stats)
+
+    import_ = commands.add_parser("import", help="从 CSV/JSONL 文件批量导入任务")
+    import_.add_argument("path", help="文件路径（.csv / .jsonl）")
+    import_.add_argument("--format", choices=["csv", "jsonl"], help="文件格式，默认根据扩展名判断")
+    import_.add_argument("--chunk-size", type=int, help="每个事务写入的记录数")
+    import_.add_argument("--workers", type=int, help="解析进程数，1 表示不使用进程池")
+    import_.add_argument("--restart", action="store_true", help="忽略断点，从头导入")
+    import_.add_argument("--show-errors", type=int, default=10, help="最多显示的无效记录数")
+    import_.set_defaults(func=cmd_import)
+
+    export = commands.add_parser("export", help="导出全部任务到 CSV/JSONL/iCalendar 文件")
+    export.add_argument("path", help="输出文件路径（.csv / .jsonl / .ics，可加 .gz），- 表示标准输出")
+    export.add_argument("--format", choices=["csv", "jsonl", "ics"], help="导出格式，默认根据扩展名判断")
+    export.add_argument("--gzip", action="store_true", help="使用 gzip 压缩（扩展名为 .gz 时自动压缩）")
+    export.set_defaults(func=cmd_export)
+    return parser
+
+def main(argv=None) -> int:
+    """命令行入口函数
+
+    Args:
+        argv: 参数列表，默认为 sys.argv[1:]
+
+    Returns:
+        退出码
+    """
+    started = time.perf_counter()
+    args = build_parser().parse_args(argv)
+    if sql_stats_enabled():
+        # 统计需要经过 SQLAlchemy，不使用 sqlite3 快速路径
+        from app.utils.instrumentation import install
+        install(dump_at_exit=True)
+        if args.command == "add":
+            args.no_fast_path = True
+    status = args.func(args)
+    if args.timing:
+        finished = time.perf_counter()
+        print(
+            f"导入 {(started - _START) * 1000:.1f}ms，"
+            f"执行 {(finished - started) * 1000:.1f}ms，"
+            f"总计 {(finished - _START) * 1000:.1f}ms",
+            file=sys.stderr,
+        )
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
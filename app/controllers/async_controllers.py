@@ -0,0 +1,283 @@
+"""
+异步控制器
+以协程形式提供 TaskController / TagController 的操作，供脚本和无界面场景并发调用。
+每次调用在有界线程池中执行，并使用独立的会话；并发的相同读取请求合并为一次查询。
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers.tag_controller import TagController, TagCount
+from app.controllers.tag_index import TagFilter
+from app.controllers.task_controller import PAGE_SIZE, SEARCH_LIMIT, TaskController, TaskRow, load_task_tags
+from app.models.base import engine
+from app.models.tag import Tag
+from app.models.task import Priority, Task
+
+# 线程池的默认线程数（SQLite 同一时间只有一个写入者，更多线程只对读取有帮助）
+DEFAULT_MAX_WORKERS = 4
+
+def _freeze(value) -> Hashable:
+    """把参数转换为可哈希的形式，用作合并读取请求的键"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    hash(value)  # 不可哈希时抛出 TypeError
+    return value
+
+class AsyncStore:
+    """异步控制器共用的执行环境
+
+    - 有界线程池：最多 max_workers 个调用同时访问数据库，其余排队等待
+    - 每次调用一个会话：调用结束即关闭，不同协程之间不共享会话状态
+    - 写入串行化：SQLite 只允许一个写入者，写操作在线程内依次执行，避免锁升级冲突
+    - 合并读取：相同参数的读取请求在执行期间只查询一次，结果分发给所有等待者
+    """
+
+    def __init__(self, bind=None, max_workers: int = DEFAULT_MAX_WORKERS):
+        """初始化执行环境
+
+        Args:
+            bind: 数据库引擎，默认为全局引擎
+            max_workers: 线程池大小
+        """
+        # 提交后不让对象过期，会话关闭后调用方仍可读取返回对象的属性
+        self._session_factory = sessionmaker(bind=bind or engine, expire_on_commit=False)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="taskmoment-db")
+        self._write_lock = threading.Lock()
+        # 写入代数：每次写入加一，只有同一代的读取才会合并，保证写后读能看到写入结果
+        self._generation = 0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    def _call(self, owner: str, name: str, args: tuple, kwargs: dict, write: bool):
+        """在线程池中执行一次控制器调用"""
+        session = self._session_factory()
+        try:
+            tag_controller = TagController(session)
+            task_controller = TaskController(session, tag_controller)
+            method = getattr(task_controller if owner == "tasks" else tag_controller, name)
+            if write:
+                with self._write_lock:
+                    result = method(*args, **kwargs)
+            else:
+                result = method(*args, **kwargs)
+            load_task_tags(session, result)
+            return result
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    async def _submit(self, owner: str, name: str, args: tuple, kwargs: dict, write: bool):
+        """把调用提交到线程池并等待结果"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(self._call, owner, name, args, kwargs, write)
+        )
+
+    async def read(self, owner: str, name: str, *args, **kwargs):
+        """执行读取操作，合并并发的相同请求
+
+        Args:
+            owner: "tasks" 或 "tags"
+            name: 控制器方法名
+
+        Returns:
+            方法的返回值；列表结果为每个调用方复制一份，列表中的元素是共享的
+        """
+        try:
+            key = (self._generation, owner, name, _freeze(args), _freeze(kwargs))
+        except TypeError:
+            # 参数不可哈希（如 Bitmap）时不合并
+            return await self._submit(owner, name, args, kwargs, False)
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._submit(owner, name, args, kwargs, False))
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._forget, key))
+        # shield：某个等待者被取消时不影响其他等待者
+        result = await asyncio.shield(future)
+        return list(result) if isinstance(result, list) else result
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        """请求完成后从合并表中移除"""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def write(self, owner: str, name: str, *args, **kwargs):
+        """执行写入操作
+
+        Args:
+            owner: "tasks" 或 "tags"
+            name: 控制器方法名
+
+        Returns:
+            方法的返回值
+        """
+        self._generation += 1
+        return await self._submit(owner, name, args, kwargs, True)
+
+    def close(self):
+        """关闭线程池（等待已提交的调用完成）"""
+        self._executor.shutdown(wait=True)
+
+class AsyncTaskController:
+    """TaskController 的协程版本"""
+
+    def __init__(self, store: Optional[AsyncStore] = None):
+        """初始化控制器
+
+        Args:
+            store: 共用的执行环境，为None时新建一个（默认数据库）
+        """
+        self.store = store or AsyncStore()
+
+    async def get_all_tasks(self) -> List[Task]:
+        """获取所有任务（已加载标签）"""
+        return await self.store.read("tasks", "get_all_tasks")
+
+    async def list_task_rows(self, task_ids: Optional[List[int]] = None) -> List[TaskRow]:
+        """获取任务的列表行"""
+        return await self.store.read("tasks", "list_task_rows", task_ids)
+
+    async def get_task_page(self, cursor: Optional[str] = None, limit: int = PAGE_SIZE,
+                            task_ids=None) -> Tuple[List[TaskRow], Optional[str]]:
+        """按默认排序分页读取任务"""
+        return await self.store.read("tasks", "get_task_page", cursor, limit, task_ids)
+
+    async def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[TaskRow]:
+        """全文检索任务"""
+        return await self.store.read("tasks", "search", query, limit)
+
+    async def filter_by_tags(self, tag_filter: TagFilter):
+        """按标签组合筛选任务（每次调用重新建立位图索引，并发的相同筛选只建立一次）"""
+        return await self.store.read("tasks", "filter_by_tags", tag_filter)
+
+    async def filter_by_due(self, bucket: str):
+        """按截止日期分组筛选任务（每次调用重新建立位图索引）"""
+        return await self.store.read("tasks", "filter_by_due", bucket)
+
+    async def count_due_buckets(self, today: Optional[date] = None) -> Dict[str, int]:
+        """统计各截止日期分组的未完成任务数量（索引范围扫描计数）"""
+        return await self.store.read("tasks", "count_due_buckets", False, today)
+
+    async def tasks_due_between(self, start: date, end: date) -> List[TaskRow]:
+        """获取截止日期在 [start, end) 内的任务"""
+        return await self.store.read("tasks", "tasks_due_between", start, end)
+
+    async def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        """根据ID获取任务（已加载标签）"""
+        return await self.store.read("tasks", "get_task_by_id", task_id)
+
+    async def get_tasks_by_priority(self, priority: int) -> List[Task]:
+        """获取指定优先级的所有任务（已加载标签）"""
+        return await self.store.read("tasks", "get_tasks_by_priority", priority)
+
+    async def create_task(self, title: str, due_date: Optional[str] = None, tag_ids: List[int] = None,
+                          priority: int = Priority.NONE) -> Task:
+        """创建新任务"""
+        return await self.store.write("tasks", "create_task", title, due_date, tag_ids, priority)
+
+    async def update_task(self, task_id: int, data: Dict[str, Any]) -> Optional[Task]:
+        """更新任务"""
+        return await self.store.write("tasks", "update_task", task_id, data)
+
+    async def delete_task(self, task_id: int) -> bool:
+        """删除任务"""
+        return await self.store.write("tasks", "delete_task", task_id)
+
+    async def toggle_task_completed(self, task_id: int) -> Optional[Task]:
+        """切换任务完成状态"""
+        return await self.store.write("tasks", "toggle_task_completed", task_id)
+
+    async def bulk_create(self, items: List[Dict[str, Any]]) -> List[int]:
+        """批量创建任务"""
+        return await self.store.write("tasks", "bulk_create", items)
+
+    async def bulk_update(self, task_ids: List[int], data: Dict[str, Any]) -> int:
+        """批量更新任务"""
+        return await self.store.write("tasks", "bulk_update", task_ids, data)
+
+    async def bulk_set_completed(self, task_ids: List[int], completed: bool) -> int:
+        """批量设置完成状态"""
+        return await self.store.write("tasks", "bulk_set_completed", task_ids, completed)
+
+    async def bulk_add_tags(self, task_ids: List[int], tag_ids: List[int]) -> None:
+        """为多个任务追加标签"""
+        return await self.store.write("tasks", "bulk_add_tags", task_ids, tag_ids)
+
+    async def bulk_delete(self, task_ids: List[int]) -> int:
+        """批量删除任务"""
+        return await self.store.write("tasks", "bulk_delete", task_ids)
+
+    extract_tag = staticmethod(TaskController.extract_tag)
+
+class AsyncTagController:
+    """TagController 的协程版本"""
+
+    def __init__(self, store: Optional[AsyncStore] = None):
+        """初始化控制器
+
+        Args:
+            store: 共用的执行环境，为None时新建一个（默认数据库）
+        """
+        self.store = store or AsyncStore()
+
+    async def get_tag_id(self, tag_name: str) -> Optional[int]:
+        """根据名称获取标签ID"""
+        return await self.store.read("tags", "get_tag_id", tag_name)
+
+    async def get_tag_names(self, tag_ids: List[int]) -> Dict[int, str]:
+        """批量获取标签名称"""
+        return await self.store.read("tags", "get_tag_names", list(tag_ids))
+
+    async def list_tags(self) -> List[Tuple[int, str]]:
+        """获取所有标签的ID和名称"""
+        return await self.store.read("tags", "list_tags")
+
+    async def get_all_tags(self) -> List[Tag]:
+        """获取所有标签"""
+        return await self.store.read("tags", "get_all_tags")
+
+    async def get_tags_with_counts(self, use_cached: bool = False) -> List[TagCount]:
+        """获取所有标签及其关联的任务数量"""
+        return await self.store.read("tags", "get_tags_with_counts", use_cached)
+
+    async def get_tag_by_id(self, tag_id: int) -> Optional[Tag]:
+        """根据ID获取标签"""
+        return await self.store.read("tags", "get_tag_by_id", tag_id)
+
+    async def get_tag_by_name(self, tag_name: str) -> Optional[Tag]:
+        """根据名称获取标签"""
+        return await self.store.read("tags", "get_tag_by_name", tag_name)
+
+    async def create_tag(self, tag_name: str) -> Optional[Tag]:
+        """创建新标签"""
+        return await self.store.write("tags", "create_tag", tag_name)
+
+    async def update_tag(self, tag_id: int, new_name: str) -> Optional[Tag]:
+        """更新标签名称"""
+        return await self.store.write("tags", "update_tag", tag_id, new_name)
+
+    async def delete_tag(self, tag_id: int) -> bool:
+        """删除标签"""
+        return await self.store.write("tags", "delete_tag", tag_id)
+
+    async def merge_tags(self, source_ids: List[int], target_id: int) -> int:
+        """把多个标签合并到目标标签"""
+        return await self.store.write("tags", "merge_tags", list(source_ids), target_id)
+
+    async def get_or_create_tag(self, tag_name: str) -> Tag:
+        """获取标签，如果不存在则创建"""
+        return await self.store.write("tags", "get_or_create_tag", tag_name)
@@ -0,0 +1,168 @@
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.controllers.events import ChangeEvent, DELETED
+from app.controllers.unit_of_work import SessionSource
+from app.models.task import Task
+from app.utils.bitmap import Bitmap
+from app.utils.bulk import chunked
+
+# 截止日期分组，只包含未完成的任务
+OVERDUE = "overdue"
+TODAY = "today"
+THIS_WEEK = "this_week"
+LATER = "later"
+NO_DUE_DATE = "none"
+
+DUE_BUCKETS = (OVERDUE, TODAY, THIS_WEEK, LATER, NO_DUE_DATE)
+
+DUE_BUCKET_NAMES = {
+    OVERDUE: "已逾期",
+    TODAY: "今天",
+    THIS_WEEK: "本周",
+    LATER: "以后",
+    NO_DUE_DATE: "无截止日期",
+}
+
+def bucket_range(bucket: str, today: date) -> Tuple[Optional[date], Optional[date]]:
+    """有截止日期的分组对应的日期范围 [start, end)
+
+    本周指明天到本周日（周一为一周的第一天），周日时本周分组为空。
+
+    Args:
+        bucket: OVERDUE / TODAY / THIS_WEEK / LATER
+        today: 当天日期
+
+    Returns:
+        (start, end)，None 表示该端不限
+
+    Raises:
+        ValueError: 未知的分组或 NO_DUE_DATE
+    """
+    tomorrow = today + timedelta(days=1)
+    next_week = today + timedelta(days=7 - today.weekday())
+    ranges = {
+        OVERDUE: (None, today),
+        TODAY: (today, tomorrow),
+        THIS_WEEK: (tomorrow, next_week),
+        LATER: (next_week, None),
+    }
+    if bucket not in ranges:
+        raise ValueError(f"没有日期范围的截止日期分组: {bucket}")
+    return ranges[bucket]
+
+def due_bucket(due_date: Optional[date], completed: bool, today: date) -> Optional[str]:
+    """任务所属的截止日期分组
+
+    Returns:
+        分组名称，已完成的任务返回None
+    """
+    if completed:
+        return None
+    if due_date is None:
+        return NO_DUE_DATE
+    for bucket in (OVERDUE, TODAY, THIS_WEEK):
+        if due_date < bucket_range(bucket, today)[1]:
+            return bucket
+    return LATER
+
+def bucket_conditions(bucket: str, today: date) -> list:
+    """分组的查询条件
+
+    完成状态、有无截止日期两个条件与 ix_task_list_order 索引的前两列表达式一致，
+    截止日期为第三列上的范围条件，SQLite 在该索引上做一次范围扫描，
+    计数或只读取ID时不需要回表。
+
+    Args:
+        bucket: DUE_BUCKETS 中的分组
+        today: 当天日期
+
+    Returns:
+        可传给 filter / where 的条件列表
+
+    Raises:
+        ValueError: 未知的分组
+    """
+    if bucket == NO_DUE_DATE:
+        return [Task.completed.is_(True) == 0, Task.due_date.is_(None) == 1]
+    start, end = bucket_range(bucket, today)
+    conditions = [Task.completed.is_(True) == 0, Task.due_date.is_(None) == 0]
+    if start is not None:
+        conditions.append(Task.due_date >= start)
+    if end is not None:
+        conditions.append(Task.due_date < end)
+    return conditions
+
+class DueIndex:
+    """截止日期分组到任务ID的位图索引
+
+    首次使用时按分组各做一次索引范围扫描建立，之后根据任务变更事件增量维护，
+    分组计数只是位图的元素个数。日期变化（跨过零点）后下次使用时重新建立。
+    """
+
+    def __init__(self, session, clock: Callable[[], date] = date.today):
+        """初始化索引
+
+        Args:
+            session: 数据库会话、会话工厂或 SessionSource（在所属控制器的操作中使用）
+            clock: 返回当天日期的函数
+        """
+        self._sessions = SessionSource(session)
+        self._clock = clock
+        # 未建立时为None
+        self._buckets: Optional[Dict[str, Bitmap]] = None
+        self._today: Optional[date] = None
+
+    @property
+    def session(self):
+        """当前操作使用的会话"""
+        return self._sessions.session
+
+    def _index(self) -> Dict[str, Bitmap]:
+        """返回分组到任务位图的映射，首次调用或跨天后重新建立"""
+        today = self._clock()
+        if self._buckets is None or today != self._today:
+            self._today = today
+            self._buckets = {
+                bucket: Bitmap(self.session.scalars(select(Task.id).where(*bucket_conditions(bucket, today))))
+                for bucket in DUE_BUCKETS
+            }
+        return self._buckets
+
+    def invalidate(self):
+        """丢弃索引，下次使用时重新建立"""
+        self._buckets = None
+        self._today = None
+
+    def counts(self) -> Dict[str, int]:
+        """各分组的任务数量，按 DUE_BUCKETS 的顺序"""
+        return {bucket: len(task_ids) for bucket, task_ids in self._index().items()}
+
+    def tasks_in(self, bucket: str) -> Bitmap:
+        """分组中的任务ID集合（返回索引内部对象，调用方不要修改）
+
+        Raises:
+            ValueError: 未知的分组
+        """
+        if bucket not in DUE_BUCKETS:
+            raise ValueError(f"未知的截止日期分组: {bucket}")
+        return self._index()[bucket]
+
+    def on_task_changes(self, event: ChangeEvent):
+        """任务变更后更新索引（由 TaskController 订阅）"""
+        if self._buckets is None:
+            return
+        for task_ids in self._buckets.values():
+            for task_id in event.ids:
+                task_ids.discard(task_id)
+        if event.kind == DELETED:
+            return
+
+        for chunk in chunked(list(event.ids)):
+            rows = self.session.query(Task.id, Task.completed, Task.due_date).filter(Task.id.in_(chunk))
+            for task_id, completed, due_date in rows:
+                bucket = due_bucket(due_date, bool(completed), self._today)
+                if bucket is not None:
+                    self._buckets[bucket].add(task_id)
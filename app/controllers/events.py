@@ -0,0 +1,51 @@
+from typing import Callable, List, NamedTuple, Tuple
+
+# 变更类型
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+# 标签合并：ids[0] 为目标标签，其余为已并入目标并删除的标签
+MERGED = "merged"
+
+class ChangeEvent(NamedTuple):
+    """控制器发出的细粒度变更事件"""
+    kind: str
+    ids: Tuple[int, ...]
+
+class ChangeNotifier:
+    """变更通知器，控制器通过它把增删改事件发布给订阅者（如视图）"""
+
+    def __init__(self):
+        """初始化通知器"""
+        self._listeners: List[Callable[[ChangeEvent], None]] = []
+
+    def subscribe(self, listener: Callable[[ChangeEvent], None]):
+        """订阅变更事件
+
+        Args:
+            listener: 接收 ChangeEvent 的回调函数
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ChangeEvent], None]):
+        """取消订阅
+
+        Args:
+            listener: 之前订阅的回调函数
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def emit(self, kind: str, ids):
+        """发布变更事件
+
+        Args:
+            kind: 变更类型 (CREATED / UPDATED / DELETED)
+            ids: 受影响的对象ID序列
+        """
+        event = ChangeEvent(kind, tuple(ids))
+        if not event.ids:
+            return
+        for listener in list(self._listeners):
+            listener(event)
@@ -1,6 +1,18 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, NamedTuple, Tuple
 
+from sqlalchemy import bindparam, delete, func, select, text
+
+from app.controllers.events import ChangeNotifier, CREATED, UPDATED, DELETED, MERGED
+from app.controllers.unit_of_work import SessionSource, unit_of_work
+from app.models.base import task_tags
 from app.models.tag import Tag
+from app.utils.bulk import chunked
+
+class TagCount(NamedTuple):
+    """标签及其关联任务数量"""
+    id: int
+    name: str
+    count: int
 
 class TagController:
     """标签控制器，处理标签相关的业务逻辑"""
@@ -9,10 +21,125 @@ class TagController:
         """初始化控制器
         
         Args:
-            session: 数据库会话
+            session: 数据库会话，或会话工厂（每个操作使用一个短期会话）
+        """
+        self._sessions = SessionSource(session)
+        # 标签增删改事件
+        self.changes = ChangeNotifier()
+        # 标签名称与ID的双向缓存，首次使用时整体加载
+        self._names_by_id: Optional[Dict[int, str]] = None
+        self._ids_by_name: Dict[str, int] = {}
+        
+    @property
+    def session(self):
+        """当前操作使用的会话"""
+        return self._sessions.session
+        
+    def _tag_cache(self) -> Dict[int, str]:
+        """返回ID到名称的缓存，首次调用时用一条查询加载全部标签
+        
+        Returns:
+            {标签ID: 标签名称}
         """
-        self.session = session
+        if self._names_by_id is None:
+            self._names_by_id = {}
+            self._ids_by_name = {}
+            for tag_id, tag_name in self.session.query(Tag.id, Tag.tag):
+                self._cache_tag(tag_id, tag_name)
+        return self._names_by_id
+        
+    def _cache_tag(self, tag_id: int, tag_name: str):
+        """写入缓存（已加载时）"""
+        if self._names_by_id is None:
+            return
+        old_name = self._names_by_id.get(tag_id)
+        if old_name is not None:
+            self._ids_by_name.pop(old_name, None)
+        self._names_by_id[tag_id] = tag_name
+        self._ids_by_name[tag_name] = tag_id
         
+    def _uncache_tag(self, tag_id: int):
+        """从缓存中移除标签"""
+        if self._names_by_id is None:
+            return
+        tag_name = self._names_by_id.pop(tag_id, None)
+        if tag_name is not None:
+            self._ids_by_name.pop(tag_name, None)
+        
+    def invalidate_cache(self):
+        """丢弃标签缓存，下次使用时重新加载"""
+        self._names_by_id = None
+        self._ids_by_name = {}
+        
+    @unit_of_work
+    def get_tag_id(self, tag_name: str) -> Optional[int]:
+        """根据名称获取标签ID（走缓存）
+        
+        缓存未命中时再按名称查询一次数据库：标签可能由命令行、导入
+        或其他控制器实例创建，不在本实例的缓存中。
+        
+        Args:
+            tag_name: 标签名称
+            
+        Returns:
+            标签ID，如果不存在则返回None
+        """
+        self._tag_cache()
+        tag_id = self._ids_by_name.get(tag_name)
+        if tag_id is None:
+            tag_id = self.session.query(Tag.id).filter(Tag.tag == tag_name).scalar()
+            if tag_id is not None:
+                self._cache_tag(tag_id, tag_name)
+        return tag_id
+        
+    @unit_of_work
+    def get_tag_names(self, tag_ids: Iterable[int]) -> Dict[int, str]:
+        """批量获取标签名称
+        
+        缓存未命中的ID合并为一条 IN (...) 查询。
+        
+        Args:
+            tag_ids: 标签ID序列
+            
+        Returns:
+            {标签ID: 标签名称}，按传入顺序排列，不存在的ID被忽略
+        """
+        cache = self._tag_cache()
+        tag_ids = list(dict.fromkeys(tag_ids))
+        missing = [tag_id for tag_id in tag_ids if tag_id not in cache]
+        if missing:
+            for tag_id, tag_name in self.session.query(Tag.id, Tag.tag).filter(Tag.id.in_(missing)):
+                self._cache_tag(tag_id, tag_name)
+        return {tag_id: cache[tag_id] for tag_id in tag_ids if tag_id in cache}
+        
+    @unit_of_work
+    def existing_tag_ids(self, tag_ids: Iterable[int]) -> List[int]:
+        """过滤出数据库中实际存在的标签ID（去重并保持顺序）
+        
+        不走缓存：缓存中可能还留有被命令行、导入或其他程序实例删除的标签。
+        
+        Args:
+            tag_ids: 标签ID序列
+            
+        Returns:
+            存在的标签ID列表
+        """
+        tag_ids = list(dict.fromkeys(tag_ids))
+        existing = set()
+        for chunk in chunked(tag_ids):
+            existing.update(self.session.scalars(select(Tag.id).where(Tag.id.in_(chunk))))
+        return [tag_id for tag_id in tag_ids if tag_id in existing]
+        
+    @unit_of_work
+    def list_tags(self) -> List[Tuple[int, str]]:
+        """获取所有标签的ID和名称，按名称排序（走标签缓存，加载后不再查询数据库）
+        
+        Returns:
+            [(标签ID, 标签名称)]
+        """
+        return sorted(self._tag_cache().items(), key=lambda item: item[1])
+        
+    @unit_of_work
     def get_all_tags(self) -> List[Tag]:
         """获取所有标签，按标签名称排序
         
@@ -21,6 +148,27 @@ class TagController:
         """
         return self.session.query(Tag).order_by(Tag.tag).all()
         
+    @unit_of_work
+    def get_tags_with_counts(self, use_cached: bool = False) -> List[TagCount]:
+        """获取所有标签及其关联的任务数量，按标签名称排序
+        
+        Args:
+            use_cached: 为True时直接读取触发器维护的 tag.task_count，
+                否则在 task_tags 上做一次 GROUP BY 统计
+            
+        Returns:
+            TagCount 列表
+        """
+        if use_cached:
+            query = self.session.query(Tag.id, Tag.tag, Tag.task_count)
+        else:
+            query = self.session.query(
+                Tag.id, Tag.tag, func.count(task_tags.c.task_id)
+            ).outerjoin(task_tags, task_tags.c.tag_id == Tag.id).group_by(Tag.id)
+        
+        return [TagCount(*row) for row in query.order_by(Tag.tag)]
+        
+    @unit_of_work
     def get_tag_by_id(self, tag_id: int) -> Optional[Tag]:
         """根据ID获取标签
         
@@ -32,6 +180,7 @@ class TagController:
         """
         return self.session.query(Tag).get(tag_id)
         
+    @unit_of_work
     def get_tag_by_name(self, tag_name: str) -> Optional[Tag]:
         """根据名称获取标签
         
@@ -41,8 +190,19 @@ class TagController:
         Returns:
             标签对象，如果不存在则返回None
         """
-        return self.session.query(Tag).filter_by(tag=tag_name).first()
+        tag_id = self.get_tag_id(tag_name)
+        if tag_id is None:
+            return None
+        tag = self.get_tag_by_id(tag_id)
+        if tag is None or tag.tag != tag_name:
+            # 缓存中的ID已失效（标签在别处被删除或改名），按名称重新查询
+            self._uncache_tag(tag_id)
+            tag = self.session.query(Tag).filter(Tag.tag == tag_name).first()
+            if tag is not None:
+                self._cache_tag(tag.id, tag_name)
+        return tag
         
+    @unit_of_work
     def create_tag(self, tag_name: str) -> Optional[Tag]:
         """创建新标签
         
@@ -61,8 +221,11 @@ class TagController:
         tag = Tag(tag=tag_name)
         self.session.add(tag)
         self.session.commit()
+        self._cache_tag(tag.id, tag_name)
+        self.changes.emit(CREATED, [tag.id])
         return tag
         
+    @unit_of_work
     def update_tag(self, tag_id: int, new_name: str) -> Optional[Tag]:
         """更新标签名称
         
@@ -79,15 +242,18 @@ class TagController:
             return None
             
         # 检查新名称是否已存在
-        existing = self.session.query(Tag).filter(Tag.tag == new_name, Tag.id != tag_id).first()
-        if existing:
+        existing_id = self.get_tag_id(new_name)
+        if existing_id is not None and existing_id != tag_id:
             return None
             
         # 更新标签名称
         tag.tag = new_name
         self.session.commit()
+        self._cache_tag(tag_id, new_name)
+        self.changes.emit(UPDATED, [tag_id])
         return tag
         
+    @unit_of_work
     def delete_tag(self, tag_id: int) -> bool:
         """删除标签
         
@@ -97,14 +263,50 @@ class TagController:
         Returns:
             是否成功删除
         """
-        tag = self.get_tag_by_id(tag_id)
-        if not tag:
+        # 一条 DELETE，task_tags 中的关联由外键级联删除，不加载标签的任务集合
+        if not self.session.execute(delete(Tag).where(Tag.id == tag_id)).rowcount:
             return False
             
-        self.session.delete(tag)
         self.session.commit()
+        self._uncache_tag(tag_id)
+        self.changes.emit(DELETED, [tag_id])
         return True
         
+    @unit_of_work
+    def merge_tags(self, source_ids: Iterable[int], target_id: int) -> int:
+        """把多个标签合并到目标标签
+        
+        在一个事务中用一条 INSERT OR IGNORE ... SELECT 把源标签的关联复制到目标标签
+        （已有目标标签的任务跳过），再删除源标签，其关联由外键级联删除。
+        关联行在 SQLite 内部复制，不经过 Python，源标签有数万个任务时也很快。
+        
+        Args:
+            source_ids: 要并入的标签ID（包含目标标签ID时忽略）
+            target_id: 目标标签ID
+            
+        Returns:
+            合并的源标签数量，目标标签不存在时返回0
+        """
+        source_ids = [tag_id for tag_id in self.existing_tag_ids(source_ids) if tag_id != target_id]
+        if not source_ids or not self.existing_tag_ids([target_id]):
+            return 0
+            
+        sources = bindparam("source_ids", source_ids, expanding=True)
+        self.session.execute(
+            text(
+                "INSERT OR IGNORE INTO task_tags (task_id, tag_id) "
+                "SELECT task_id, :target_id FROM task_tags WHERE tag_id IN :source_ids"
+            ).bindparams(sources),
+            {"target_id": target_id},
+        )
+        self.session.execute(delete(Tag).where(Tag.id.in_(source_ids)))
+        self.session.commit()
+        for tag_id in source_ids:
+            self._uncache_tag(tag_id)
+        self.changes.emit(MERGED, [target_id] + source_ids)
+        return len(source_ids)
+        
+    @unit_of_work
     def get_or_create_tag(self, tag_name: str) -> Tag:
         """获取标签，如果不存在则创建
         
@@ -119,4 +321,6 @@ class TagController:
             tag = Tag(tag=tag_name)
             self.session.add(tag)
             self.session.commit()
+            self._cache_tag(tag.id, tag_name)
+            self.changes.emit(CREATED, [tag.id])
         return tag
@@ -0,0 +1,153 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from app.controllers.events import ChangeEvent, DELETED, MERGED
+from app.controllers.unit_of_work import SessionSource
+from app.models.base import task_tags
+from app.models.task import Task
+from app.utils.bitmap import Bitmap
+from app.utils.bulk import chunked
+
+class TagFilter(NamedTuple):
+    """标签筛选条件（标签ID）"""
+    all_of: Tuple[int, ...] = ()  # 必须包含全部这些标签
+    any_of: Tuple[int, ...] = ()  # 至少包含其中一个标签
+    none_of: Tuple[int, ...] = ()  # 不能包含这些标签
+
+    def is_empty(self) -> bool:
+        """是否没有任何筛选条件"""
+        return not (self.all_of or self.any_of or self.none_of)
+
+class TagIndex:
+    """标签到任务ID的位图索引
+
+    首次筛选时用两条查询从 task 和 task_tags 建立索引，
+    之后根据任务、标签的变更事件增量维护，筛选只做内存中的位图运算。
+    """
+
+    def __init__(self, session):
+        """初始化索引
+
+        Args:
+            session: 数据库会话、会话工厂或 SessionSource（在所属控制器的操作中使用）
+        """
+        self._sessions = SessionSource(session)
+        # 未建立时为None
+        self._tasks_by_tag: Optional[Dict[int, Bitmap]] = None
+        self._tags_by_task: Dict[int, Tuple[int, ...]] = {}
+        self._all_tasks = Bitmap()
+
+    @property
+    def session(self):
+        """当前操作使用的会话"""
+        return self._sessions.session
+        
+    def _index(self) -> Dict[int, Bitmap]:
+        """返回标签ID到任务位图的映射，首次调用时建立索引"""
+        if self._tasks_by_tag is None:
+            self._all_tasks = Bitmap(task_id for (task_id,) in self.session.query(Task.id))
+            tags_by_task: Dict[int, List[int]] = {}
+            for task_id, tag_id in self.session.query(task_tags.c.task_id, task_tags.c.tag_id):
+                tags_by_task.setdefault(task_id, []).append(tag_id)
+            self._tags_by_task = {task_id: tuple(tag_ids) for task_id, tag_ids in tags_by_task.items()}
+            task_ids_by_tag: Dict[int, List[int]] = {}
+            for task_id, tag_ids in self._tags_by_task.items():
+                for tag_id in tag_ids:
+                    task_ids_by_tag.setdefault(tag_id, []).append(task_id)
+            self._tasks_by_tag = {tag_id: Bitmap(task_ids) for tag_id, task_ids in task_ids_by_tag.items()}
+        return self._tasks_by_tag
+
+    def invalidate(self):
+        """丢弃索引，下次筛选时重新建立"""
+        self._tasks_by_tag = None
+        self._tags_by_task = {}
+        self._all_tasks = Bitmap()
+
+    def tasks_with_tag(self, tag_id: int) -> Bitmap:
+        """包含指定标签的任务ID集合（返回索引内部对象，调用方不要修改）"""
+        return self._index().get(tag_id, Bitmap())
+
+    def filter(self, tag_filter: TagFilter) -> Bitmap:
+        """按标签条件筛选任务
+
+        Args:
+            tag_filter: 筛选条件
+
+        Returns:
+            符合条件的任务ID位图
+        """
+        self._index()
+        if tag_filter.all_of:
+            result = Bitmap.intersection(self.tasks_with_tag(tag_id) for tag_id in tag_filter.all_of)
+        else:
+            result = self._all_tasks
+        if tag_filter.any_of:
+            result = result & Bitmap.union(self.tasks_with_tag(tag_id) for tag_id in tag_filter.any_of)
+        if tag_filter.none_of:
+            result = result - Bitmap.union(self.tasks_with_tag(tag_id) for tag_id in tag_filter.none_of)
+        return result.copy() if result is self._all_tasks else result
+
+    def on_task_changes(self, event: ChangeEvent):
+        """任务变更后更新索引（由 TaskController 订阅）"""
+        if self._tasks_by_tag is None:
+            return
+        for task_id in event.ids:
+            self._unlink_task(task_id)
+        if event.kind == DELETED:
+            for task_id in event.ids:
+                self._all_tasks.discard(task_id)
+            return
+
+        for task_id in event.ids:
+            self._all_tasks.add(task_id)
+        tags_by_task: Dict[int, List[int]] = {}
+        for chunk in chunked(list(event.ids)):
+            links = self.session.query(task_tags.c.task_id, task_tags.c.tag_id).filter(task_tags.c.task_id.in_(chunk))
+            for task_id, tag_id in links:
+                tags_by_task.setdefault(task_id, []).append(tag_id)
+        for task_id, tag_ids in tags_by_task.items():
+            self._tags_by_task[task_id] = tuple(tag_ids)
+            for tag_id in tag_ids:
+                self._tasks_by_tag.setdefault(tag_id, Bitmap()).add(task_id)
+
+    def on_tag_changes(self, event: ChangeEvent):
+        """标签删除、合并后更新索引（由 TaskController 订阅）"""
+        if self._tasks_by_tag is None:
+            return
+        if event.kind == MERGED:
+            self._merge(event.ids[0], event.ids[1:])
+            return
+        if event.kind != DELETED:
+            return
+        for tag_id in event.ids:
+            task_ids = self._tasks_by_tag.pop(tag_id, None)
+            if task_ids is None:
+                continue
+            for task_id in task_ids:
+                remaining = tuple(t for t in self._tags_by_task.get(task_id, ()) if t != tag_id)
+                if remaining:
+                    self._tags_by_task[task_id] = remaining
+                else:
+                    self._tags_by_task.pop(task_id, None)
+
+    def _merge(self, target_id: int, source_ids: Tuple[int, ...]):
+        """把源标签的任务并入目标标签，并移除源标签"""
+        sources = set(source_ids)
+        merged = Bitmap.union(self._tasks_by_tag.pop(tag_id, Bitmap()) for tag_id in source_ids)
+        if not merged:
+            return
+        target = self._tasks_by_tag.setdefault(target_id, Bitmap())
+        for task_id in merged:
+            tag_ids = tuple(t for t in self._tags_by_task.get(task_id, ()) if t not in sources)
+            if task_id not in target:
+                target.add(task_id)
+                tag_ids += (target_id,)
+            self._tags_by_task[task_id] = tag_ids
+
+    def _unlink_task(self, task_id: int):
+        """从所有标签位图中移除任务"""
+        for tag_id in self._tags_by_task.pop(task_id, ()):
+            task_ids = self._tasks_by_tag.get(tag_id)
+            if task_ids is not None:
+                task_ids.discard(task_id)
+                if not task_ids:
+                    del self._tasks_by_tag[tag_id]
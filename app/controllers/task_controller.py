@@ -1,22 +1,96 @@
-from datetime import datetime, date
-from typing import List, Dict, Optional, Any
+import base64
+import json
+from datetime import datetime, date, timedelta
+from typing import List, Dict, Optional, Any, NamedTuple, Tuple
 
-from sqlalchemy import case, desc, asc
+from sqlalchemy import desc, asc, insert, select, update, delete, and_, or_, text, bindparam, func
+from sqlalchemy import inspect as inspect_state
+from sqlalchemy.orm import selectinload
 
-from app.models.task import Task, Priority
+from app.controllers.due_index import DUE_BUCKETS, DueIndex, bucket_conditions
+from app.controllers.events import ChangeNotifier, CREATED, UPDATED, DELETED
+from app.controllers.tag_controller import TagController
+from app.controllers.tag_index import TagFilter, TagIndex
+from app.controllers.unit_of_work import SessionSource, unit_of_work
+from app.models.base import task_tags
+from app.models.task import Task, Priority, LEGACY_NO_DUE_DATE
 from app.models.tag import Tag
+from app.utils.bulk import chunked, insert_returning_ids
+from app.utils.data_version import DataVersion
+
+class TaskRow(NamedTuple):
+    """任务列表行（只读投影，不经过ORM对象）"""
+    id: int
+    title: str
+    completed: bool
+    due_date: Optional[date]
+    priority: int
+    created_at: Optional[datetime]
+    tags: Tuple[str, ...]
+
+# 分页读取时每页的默认行数
+PAGE_SIZE = 200
+
+# 按任务ID筛选分页时，不超过该数量的ID直接写入 IN 条件，
+# 更多时按索引顺序扫描并在内存中判断（此时匹配的任务足够密集，很快能凑满一页）
+FILTER_IN_LIMIT = 10000
+
+# 搜索结果的默认数量
+SEARCH_LIMIT = 100
+
+# 全文检索排序时标题、标签两列的权重（bm25，标题命中更靠前）
+SEARCH_RANK = "bm25(task_fts, 10.0, 1.0)"
+
+def load_task_tags(session, result):
+    """为返回的任务对象加载尚未加载的标签关系
+    
+    会话关闭后对象处于分离状态，不能再懒加载，
+    这里在关闭前用 selectinload 一次性补齐，调用方之后仍可访问 task.tags。
+    
+    Args:
+        session: 任务所在的会话
+        result: 任务对象、任务列表或其他返回值（其他值忽略）
+    """
+    if isinstance(result, Task):
+        tasks = [result]
+    elif isinstance(result, list) and result and isinstance(result[0], Task):
+        tasks = result
+    else:
+        return
+    task_ids = [task.id for task in tasks if "tags" in inspect_state(task).unloaded]
+    for chunk in chunked(task_ids):
+        session.query(Task).options(selectinload(Task.tags)).populate_existing().filter(Task.id.in_(chunk)).all()
 
 class TaskController:
     """任务控制器，处理任务相关的业务逻辑"""
     
-    def __init__(self, session):
+    def __init__(self, session, tag_controller: Optional[TagController] = None):
         """初始化控制器
         
         Args:
-            session: 数据库会话
+            session: 数据库会话，或会话工厂（每个操作使用一个短期会话，返回的任务已加载标签）
+            tag_controller: 标签控制器，用于通过其缓存解析标签ID；为None时自动创建
         """
-        self.session = session
+        self._sessions = SessionSource(session)
+        self.tag_controller = tag_controller or TagController(session)
+        # 任务增删改事件，视图据此增量刷新
+        self.changes = ChangeNotifier()
+        # 标签位图索引，先于视图订阅变更事件，保证视图收到事件时索引已更新
+        self.tag_index = TagIndex(self._sessions)
+        self.changes.subscribe(self.tag_index.on_task_changes)
+        self.tag_controller.changes.subscribe(self.tag_index.on_tag_changes)
+        # 截止日期分组的位图索引，同样先于视图更新
+        self.due_index = DueIndex(self._sessions)
+        self.changes.subscribe(self.due_index.on_task_changes)
+        # 检测命令行、导入等在控制器之外的修改，这些修改不会发出变更事件
+        self._data_version = DataVersion()
+        
+    @property
+    def session(self):
+        """当前操作使用的会话"""
+        return self._sessions.session
         
+    @unit_of_work(prepare=load_task_tags)
     def get_all_tasks(self) -> List[Task]:
         """获取所有任务，按截止日期、优先级和创建时间排序
         
@@ -29,26 +103,391 @@ class TaskController:
         Returns:
             任务列表
         """
-        # 使用case when语句处理截止日期为空的情况
-        due_date_case = case(
-            (Task.due_date == None, 1),  # 无截止日期的排在后面
-            else_=0
+        return self.session.query(Task).options(selectinload(Task.tags)).order_by(*self._list_order()).all()
+        
+    @unit_of_work
+    def list_task_rows(self, task_ids: Optional[List[int]] = None) -> List[TaskRow]:
+        """获取任务的列表行，排序规则与 get_all_tasks 相同
+        
+        只执行两条查询：一条按排序读取任务列，一条读取任务-标签关联，
+        避免逐个任务懒加载标签。
+        
+        Args:
+            task_ids: 只读取这些任务，为None时读取全部任务
+        
+        Returns:
+            TaskRow 列表
+        """
+        tag_names = self._load_tag_names(task_ids)
+        return self._to_task_rows(self.task_rows_query(task_ids), tag_names)
+        
+    @unit_of_work
+    def get_task_page(self, cursor: Optional[str] = None, limit: int = PAGE_SIZE,
+                      task_ids=None) -> Tuple[List[TaskRow], Optional[str]]:
+        """按默认排序分页读取任务（键集分页）
+        
+        游标记录上一页最后一行的排序键，下一页从该位置直接在
+        ix_task_list_order 索引上定位，不使用 OFFSET，翻到多深都只读取一页的数据。
+        
+        Args:
+            cursor: 上一页返回的游标，为None时读取第一页
+            limit: 每页行数
+            task_ids: 只返回这些任务（支持 len 和 in 的集合，如 filter_by_tags 的结果），
+                为None时不筛选
+            
+        Returns:
+            (TaskRow 列表, 下一页游标)，没有更多数据时游标为None
+            
+        Raises:
+            ValueError: 游标格式不正确
+            RuntimeError: 游标没有向后移动（库中的排序键与 SQLAlchemy 写入的格式不一致），
+                继续翻页会一直返回同样的行
+        """
+        query = self.task_rows_query()
+        scan_filter = None
+        if task_ids is not None:
+            if len(task_ids) <= FILTER_IN_LIMIT:
+                # ID直接写入SQL，不受SQLite参数个数限制
+                query = query.filter(Task.id.in_(
+                    bindparam("filter_task_ids", list(task_ids), expanding=True, literal_execute=True)
+                ))
+            else:
+                scan_filter = task_ids
+        
+        key = start_key = None if cursor is None else self._decode_cursor(cursor)
+        batch_size = limit if scan_filter is None else max(limit, PAGE_SIZE * 10)
+        rows = []
+        while len(rows) < limit:
+            batch = self._rows_after(query, key, batch_size)
+            for row in batch:
+                key = self._row_key(row)
+                if scan_filter is None or row.id in scan_filter:
+                    rows.append(row)
+                    if len(rows) == limit:
+                        break
+            if len(batch) < batch_size:
+                break
+        
+        tag_names = self._load_tag_names([row[0] for row in rows])
+        page = self._to_task_rows(rows, tag_names)
+        next_cursor = self._encode_cursor(key) if len(page) == limit else None
+        if next_cursor is not None and start_key is not None \
+                and self._sort_position(key) <= self._sort_position(start_key):
+            raise RuntimeError(f"分页游标没有前进，任务 {key[-1]} 的排序键格式可能不正确")
+        return page, next_cursor
+        
+    def _rows_after(self, query, key: Optional[tuple], limit: int) -> list:
+        """读取排在排序键 key 之后的 limit 行
+        
+        Args:
+            query: task_rows_query 构造的查询（可带额外筛选条件）
+            key: _row_key 格式的排序键，为None时从头读取
+            limit: 行数
+        """
+        if key is None:
+            return query.limit(limit).all()
+            
+        completed, no_due_date, due_date, priority, created_at, task_id = key
+        completed_key, no_due_date_key = self._list_order()[:2]
+        
+        # 先在游标所在的分组（完成状态、有无截止日期相同）内向后读取。
+        # 分组前缀是等值条件，SQLite 可以在索引上直接定位；
+        # 排序中去掉已固定的两个分组键，否则 SQLite 会额外做一次临时排序
+        rows = query.filter(
+            completed_key == completed,
+            no_due_date_key == no_due_date,
+            self._after_in_group(due_date, priority, created_at, task_id),
+        ).order_by(None).order_by(*self._list_order()[2:]).limit(limit).all()
+        
+        # 当前分组不足一页时，从下一个分组的开头继续读取
+        if len(rows) < limit:
+            rows += query.filter(
+                completed_key >= completed,
+                or_(completed_key > completed, no_due_date_key > no_due_date),
+            ).limit(limit - len(rows)).all()
+        return rows
+        
+    @unit_of_work
+    def filter_by_tags(self, tag_filter: TagFilter):
+        """按标签组合筛选任务（在内存位图索引上计算，不查询数据库）
+        
+        Args:
+            tag_filter: 筛选条件，all_of 全部包含、any_of 包含其一、none_of 都不包含
+            
+        Returns:
+            符合条件的任务ID位图（Bitmap），可作为 get_task_page 的 task_ids
+        """
+        return self.tag_index.filter(tag_filter)
+        
+    @unit_of_work
+    def filter_by_due(self, bucket: str):
+        """按截止日期分组筛选任务（在内存位图索引上计算，不查询数据库）
+        
+        Args:
+            bucket: DUE_BUCKETS 中的分组，只包含未完成的任务
+            
+        Returns:
+            该分组的任务ID位图（Bitmap），可作为 get_task_page 的 task_ids
+            
+        Raises:
+            ValueError: 未知的分组
+        """
+        return self.due_index.tasks_in(bucket).copy()
+        
+    @unit_of_work
+    def count_due_buckets(self, use_cached: bool = False, today: Optional[date] = None) -> Dict[str, int]:
+        """统计各截止日期分组的未完成任务数量
+        
+        每个分组是 ix_task_list_order 索引上的一次范围扫描计数，不读取表中的行。
+        
+        Args:
+            use_cached: 为True时直接返回位图索引中的数量（由变更事件增量维护，不查询数据库）
+            today: 按哪一天划分分组，默认为当天（use_cached 时总是当天）
+            
+        Returns:
+            {分组: 数量}，按 DUE_BUCKETS 的顺序
+        """
+        if use_cached:
+            return self.due_index.counts()
+        today = today or date.today()
+        return {
+            bucket: self.session.query(func.count(Task.id)).filter(*bucket_conditions(bucket, today)).scalar()
+            for bucket in DUE_BUCKETS
+        }
+        
+    @unit_of_work
+    def tasks_due_between(self, start: date, end: date) -> List[TaskRow]:
+        """获取截止日期在 [start, end) 内的任务，按默认排序（包括已完成的任务）
+        
+        Args:
+            start: 起始日期（包含）
+            end: 结束日期（不包含）
+            
+        Returns:
+            TaskRow 列表
+        """
+        rows = self.task_rows_query().filter(Task.due_date >= start, Task.due_date < end).all()
+        tag_names: Dict[int, Tuple[str, ...]] = {}
+        for chunk in chunked([row[0] for row in rows]):
+            tag_names.update(self._load_tag_names(chunk))
+        return self._to_task_rows(rows, tag_names)
+        
+    @unit_of_work
+    def sync_indexes(self) -> bool:
+        """数据库有新的提交时丢弃标签缓存以及标签和截止日期的位图索引，下次使用时重新建立
+        
+        控制器之外的修改（命令行、导入、其他程序实例）不会发出变更事件，
+        只能通过 PRAGMA data_version 发现。本控制器自己的修改同样会改变该值，
+        因此自己修改后的第一次调用也会丢弃索引（只多一次重建，结果仍然正确）。
+        
+        Returns:
+            是否丢弃了缓存和索引
+        """
+        if not self._data_version.changed(self.session.get_bind()):
+            return False
+        self.tag_controller.invalidate_cache()
+        self.tag_index.invalidate()
+        self.due_index.invalidate()
+        return True
+        
+    @staticmethod
+    def _after_in_group(due_date: Optional[date], priority: int, created_at: Optional[datetime], task_id: int):
+        """同一分组内排在游标之后的条件
+        
+        对应排序中 due_date 升序、priority 降序、created_at 降序、id 降序四个键。
+        
+        Args:
+            due_date: 游标行的截止日期（无截止日期的分组中为None）
+            priority: 游标行的优先级
+            created_at: 游标行的创建时间
+            task_id: 游标行的任务ID
+        """
+        condition = Task.id < task_id
+        
+        # created_at 降序，SQLite 中 NULL 排在最后
+        if created_at is None:
+            condition = and_(Task.created_at.is_(None), condition)
+        else:
+            condition = or_(
+                Task.created_at < created_at,
+                Task.created_at.is_(None),
+                and_(Task.created_at == created_at, condition),
+            )
+            
+        condition = or_(Task.priority < priority, and_(Task.priority == priority, condition))
+        
+        # 无截止日期的分组内 due_date 都为 NULL，不参与比较
+        if due_date is not None:
+            condition = and_(
+                Task.due_date >= due_date,  # 冗余的范围条件，便于使用索引定位
+                or_(Task.due_date > due_date, and_(Task.due_date == due_date, condition)),
+            )
+        return condition
+        
+    @staticmethod
+    def _row_key(row) -> tuple:
+        """行的排序键，格式与 _decode_cursor 的结果相同"""
+        return (
+            1 if row.completed else 0,
+            1 if row.due_date is None else 0,
+            row.due_date,
+            row.priority,
+            row.created_at,
+            row.id,
         )
         
-        # 使用case when语句处理已完成任务
-        completed_case = case(
-            (Task.completed == True, 1),  # 已完成的排在后面
-            else_=0
+    @staticmethod
+    def _sort_position(key: tuple) -> tuple:
+        """排序键在默认排序中的位置，可直接比较先后（与 _list_order 一致）"""
+        completed, no_due_date, due_date, priority, created_at, task_id = key
+        return (
+            completed,
+            no_due_date,
+            due_date or date.min,
+            -priority,
+            created_at is None,
+            datetime.min - created_at if created_at else timedelta(0),
+            -task_id,
         )
         
-        return self.session.query(Task).order_by(
-            completed_case,  # 未完成的排在前面
-            due_date_case,   # 有截止日期的排在前面
+    @staticmethod
+    def _encode_cursor(key: tuple) -> str:
+        """将排序键编码为游标字符串"""
+        completed, no_due_date, due_date, priority, created_at, task_id = key
+        key = [
+            completed,
+            no_due_date,
+            due_date.isoformat() if due_date else None,
+            priority,
+            created_at.isoformat() if created_at else None,
+            task_id,
+        ]
+        return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+        
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        """解析游标字符串
+        
+        Returns:
+            (completed, no_due_date, due_date, priority, created_at, task_id)
+        """
+        try:
+            completed, no_due_date, due_date, priority, created_at, task_id = json.loads(
+                base64.urlsafe_b64decode(cursor.encode("ascii"))
+            )
+            return (
+                int(completed),
+                int(no_due_date),
+                date.fromisoformat(due_date) if due_date else None,
+                int(priority),
+                datetime.fromisoformat(created_at) if created_at else None,
+                int(task_id),
+            )
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"无效的分页游标: {cursor}") from e
+        
+    @staticmethod
+    def _to_task_rows(rows, tag_names: Dict[int, Tuple[str, ...]]) -> List[TaskRow]:
+        """把查询结果转换为 TaskRow 列表"""
+        return [
+            TaskRow(task_id, title, bool(completed), due_date, priority, created_at, tag_names.get(task_id, ()))
+            for task_id, title, completed, due_date, priority, created_at in rows
+        ]
+        
+    @unit_of_work
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[TaskRow]:
+        """在任务标题和标签中全文检索
+        
+        使用 task_fts 全文索引，每个关键词按前缀匹配，多个关键词需同时命中，
+        结果按相关度排序，不会对 task 表做 LIKE 全表扫描。
+        
+        Args:
+            query: 用户输入的搜索文本，按空白分词
+            limit: 最多返回的结果数
+            
+        Returns:
+            按相关度排序的 TaskRow 列表，没有关键词时返回空列表
+        """
+        match = self._fts_match_expression(query)
+        if not match:
+            return []
+        task_ids = list(self.session.execute(
+            text(f"SELECT rowid FROM task_fts WHERE task_fts MATCH :match ORDER BY {SEARCH_RANK} LIMIT :limit"),
+            {"match": match, "limit": limit},
+        ).scalars())
+        if not task_ids:
+            return []
+        rows = {row.id: row for row in self.list_task_rows(task_ids)}
+        return [rows[task_id] for task_id in task_ids if task_id in rows]
+        
+    @staticmethod
+    def _fts_match_expression(query: str) -> str:
+        """把用户输入转换为 FTS5 MATCH 表达式
+        
+        每个关键词作为带引号的字符串（避免输入中的运算符、引号被解释为语法），
+        并加上 * 做前缀匹配。
+        
+        Args:
+            query: 用户输入的搜索文本
+            
+        Returns:
+            MATCH 表达式，没有关键词时返回空字符串
+        """
+        terms = []
+        for term in query.split():
+            term = term.replace('"', '""')
+            terms.append(f'"{term}"*')
+        return " ".join(terms)
+        
+    def task_rows_query(self, task_ids: Optional[List[int]] = None):
+        """构造任务列表行的查询（按默认排序）
+        
+        Args:
+            task_ids: 只读取这些任务，为None时读取全部任务
+            
+        Returns:
+            Query 对象
+        """
+        query = self.session.query(
+            Task.id, Task.title, Task.completed, Task.due_date, Task.priority, Task.created_at
+        )
+        if task_ids is not None:
+            query = query.filter(Task.id.in_(task_ids))
+        return query.order_by(*self._list_order())
+        
+    def _load_tag_names(self, task_ids: Optional[List[int]] = None) -> Dict[int, Tuple[str, ...]]:
+        """一次性读取任务ID到标签名称的映射
+        
+        Args:
+            task_ids: 只读取这些任务的标签，为None时读取全部
+        
+        Returns:
+            {任务ID: 标签名称元组}
+        """
+        names: Dict[int, List[str]] = {}
+        query = self.session.query(task_tags.c.task_id, Tag.tag).join(Tag, Tag.id == task_tags.c.tag_id)
+        if task_ids is not None:
+            query = query.filter(task_tags.c.task_id.in_(task_ids))
+        for task_id, tag_name in query:
+            names.setdefault(task_id, []).append(tag_name)
+        return {task_id: tuple(tags) for task_id, tags in names.items()}
+        
+    @staticmethod
+    def _list_order():
+        """任务列表的排序表达式
+        
+        与 ix_task_list_order 索引的表达式一一对应，修改时需同步修改索引。
+        """
+        return (
+            Task.completed.is_(True),  # 未完成的排在前面
+            Task.due_date.is_(None),   # 有截止日期的排在前面
             asc(Task.due_date),  # 按截止日期升序
             desc(Task.priority),  # 按优先级降序
-            desc(Task.created_at)  # 按创建时间降序
-        ).all()
+            desc(Task.created_at),  # 按创建时间降序
+            desc(Task.id)  # ID降序，保证排序唯一
+        )
         
+    @unit_of_work(prepare=load_task_tags)
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
         """根据ID获取任务
         
@@ -60,6 +499,7 @@ class TaskController:
         """
         return self.session.query(Task).get(task_id)
         
+    @unit_of_work(prepare=load_task_tags)
     def create_task(self, title: str, due_date: Optional[str] = None, tag_ids: List[int] = None, priority: int = Priority.NONE) -> Task:
         """创建新任务
         
@@ -72,27 +512,19 @@ class TaskController:
         Returns:
             创建的任务对象
         """
-        parsed_due_date: Optional[date] = None
-        if due_date:
-            try:
-                parsed_due_date = datetime.strptime(due_date, "%Y-%m-%d").date()
-            except ValueError:
-                # 如果格式不正确，可以记录日志或按 None 处理
-                parsed_due_date = None
-
-        task = Task(title=title, due_date=parsed_due_date, priority=priority)
+        task = Task(title=title, due_date=self._parse_due_date(due_date), priority=priority)
         self.session.add(task)
         
         # 添加标签
         if tag_ids:
-            for tag_id in tag_ids:
-                tag = self.session.query(Tag).get(tag_id)
-                if tag:
-                    task.tags.append(tag)
+            self.session.flush()
+            self._insert_tag_links([task.id], tag_ids)
         
         self.session.commit()
+        self.changes.emit(CREATED, [task.id])
         return task
         
+    @unit_of_work(prepare=load_task_tags)
     def update_task(self, task_id: int, data: Dict[str, Any]) -> Optional[Task]:
         """更新任务
         
@@ -111,15 +543,7 @@ class TaskController:
         if 'title' in data:
             task.title = data['title']
         if 'due_date' in data:
-            due_date_str = data['due_date']
-            if due_date_str:
-                try:
-                    task.due_date = datetime.strptime(due_date_str, "%Y-%m-%d").date()
-                except ValueError:
-                    # 如果格式不正确，可以记录日志或保持原样/设为None
-                    task.due_date = None # 或者选择不修改: pass
-            else:
-                task.due_date = None # 如果传入 None，则设为 None
+            task.due_date = self._parse_due_date(data['due_date'])
 
         if 'completed' in data:
             task.completed = data['completed']
@@ -128,18 +552,17 @@ class TaskController:
             
         # 更新任务标签
         if 'tag_ids' in data:
-            # 清除所有现有标签
-            task.tags.clear()
-            
-            # 添加新标签
-            for tag_id in data['tag_ids']:
-                tag = self.session.query(Tag).get(tag_id)
-                if tag:
-                    task.tags.append(tag)
+            # 清除所有现有标签，再添加新标签
+            self.session.execute(delete(task_tags).where(task_tags.c.task_id == task_id))
+            self._insert_tag_links([task_id], data['tag_ids'] or ())
+            # 关联表已被直接修改，重新加载标签关系
+            self.session.expire(task, ['tags'])
         
         self.session.commit()
+        self.changes.emit(UPDATED, [task_id])
         return task
         
+    @unit_of_work
     def delete_task(self, task_id: int) -> bool:
         """删除任务
         
@@ -149,14 +572,15 @@ class TaskController:
         Returns:
             是否成功删除
         """
-        task = self.get_task_by_id(task_id)
-        if not task:
+        # 标签关联由外键级联删除
+        if not self.session.execute(delete(Task).where(Task.id == task_id)).rowcount:
             return False
             
-        self.session.delete(task)
         self.session.commit()
+        self.changes.emit(DELETED, [task_id])
         return True
         
+    @unit_of_work(prepare=load_task_tags)
     def toggle_task_completed(self, task_id: int) -> Optional[Task]:
         """切换任务完成状态
         
@@ -172,8 +596,231 @@ class TaskController:
             
         task.completed = not task.completed
         self.session.commit()
+        self.changes.emit(UPDATED, [task_id])
         return task
         
+    @unit_of_work
+    def bulk_create(self, items: List[Dict[str, Any]]) -> List[int]:
+        """批量创建任务，在一个事务中用一条 executemany 插入
+        
+        Args:
+            items: 任务数据字典列表，可包含title, due_date (yyyy-MM-dd str or None), tag_ids, priority, completed
+            
+        Returns:
+            新任务ID列表，顺序与 items 相同
+        """
+        if not items:
+            return []
+            
+        params = [
+            {
+                "title": item["title"],
+                "due_date": self._parse_due_date(item.get("due_date")),
+                "priority": item.get("priority", Priority.NONE),
+                "completed": bool(item.get("completed", False)),
+            }
+            for item in items
+        ]
+        task_ids = insert_returning_ids(self.session, Task, params)
+        self._link_tags([
+            {"task_id": task_id, "tag_id": tag_id}
+            for task_id, item in zip(task_ids, items)
+            for tag_id in dict.fromkeys(item.get("tag_ids") or ())
+        ])
+            
+        self.session.commit()
+        self.changes.emit(CREATED, task_ids)
+        return task_ids
+        
+    @unit_of_work
+    def bulk_update(self, task_ids: List[int], data: Dict[str, Any]) -> int:
+        """将相同的修改批量应用到多个任务
+        
+        Args:
+            task_ids: 任务ID列表
+            data: 要更新的数据字典，键与 update_task 相同；tag_ids 会替换原有标签
+            
+        Returns:
+            受影响的任务数量（不存在的任务不计入，也不发出变更事件）
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        values = self._column_values(data)
+        if not values and 'tag_ids' not in data:
+            return 0
+            
+        updated = []
+        for chunk in chunked(task_ids):
+            if values:
+                statement = update(Task).where(Task.id.in_(chunk)).values(**values).returning(Task.id)
+            else:
+                statement = select(Task.id).where(Task.id.in_(chunk))
+            existing = list(self.session.scalars(statement))
+            if 'tag_ids' in data and existing:
+                self.session.execute(delete(task_tags).where(task_tags.c.task_id.in_(existing)))
+                self._insert_tag_links(existing, data['tag_ids'] or ())
+            updated.extend(existing)
+        if not updated:
+            return 0
+            
+        self.session.commit()
+        self.changes.emit(UPDATED, updated)
+        return len(updated)
+        
+    @unit_of_work
+    def apply_changes(self, changes: Dict[int, Dict[str, Any]]) -> List[int]:
+        """在一个事务中应用多个任务各自的字段修改（供写回队列合并提交）
+        
+        修改内容相同的任务合并为一条 UPDATE，只发出一次变更事件。
+        
+        Args:
+            changes: {任务ID: 要更新的数据字典}，键为 title, due_date, priority, completed（不支持 tag_ids）
+            
+        Returns:
+            实际更新的任务ID列表（不存在的任务不在其中）
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for task_id, data in changes.items():
+            values = self._column_values(data)
+            if values:
+                groups.setdefault(tuple(sorted(values.items())), []).append(task_id)
+        
+        updated = []
+        for values, task_ids in groups.items():
+            for chunk in chunked(task_ids):
+                statement = update(Task).where(Task.id.in_(chunk)).values(dict(values)).returning(Task.id)
+                updated.extend(self.session.scalars(statement))
+        if not updated:
+            return []
+            
+        self.session.commit()
+        self.changes.emit(UPDATED, updated)
+        return updated
+        
+    def _column_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """把 update_task 格式的数据转换为 task 表的列值（忽略 tag_ids）"""
+        values = {}
+        if 'title' in data:
+            values['title'] = data['title']
+        if 'due_date' in data:
+            values['due_date'] = self._parse_due_date(data['due_date'])
+        if 'completed' in data:
+            values['completed'] = bool(data['completed'])
+        if 'priority' in data:
+            values['priority'] = data['priority']
+        return values
+        
+    @unit_of_work
+    def bulk_set_completed(self, task_ids: List[int], completed: bool) -> int:
+        """批量设置任务完成状态
+        
+        Args:
+            task_ids: 任务ID列表
+            completed: 完成状态
+            
+        Returns:
+            受影响的任务数量
+        """
+        return self.bulk_update(task_ids, {"completed": completed})
+        
+    @unit_of_work
+    def bulk_add_tags(self, task_ids: List[int], tag_ids: List[int]) -> None:
+        """为多个任务追加标签，已有的关联保持不变
+        
+        Args:
+            task_ids: 任务ID列表（不存在的任务被忽略）
+            tag_ids: 标签ID列表
+        """
+        task_ids = [
+            task_id
+            for chunk in chunked(list(dict.fromkeys(task_ids)))
+            for task_id in self.session.scalars(select(Task.id).where(Task.id.in_(chunk)))
+        ]
+        if not self._insert_tag_links(task_ids, tag_ids, ignore_existing=True):
+            return
+            
+        self.session.commit()
+        self.changes.emit(UPDATED, task_ids)
+        
+    @unit_of_work
+    def bulk_delete(self, task_ids: List[int]) -> int:
+        """批量删除任务（标签关联由外键级联删除）
+        
+        Args:
+            task_ids: 任务ID列表
+            
+        Returns:
+            删除的任务数量（不存在的任务不计入，也不发出变更事件）
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        deleted = []
+        for chunk in chunked(task_ids):
+            # 标签关联由外键级联删除
+            deleted.extend(self.session.scalars(delete(Task).where(Task.id.in_(chunk)).returning(Task.id)))
+        if not deleted:
+            return 0
+            
+        self.session.commit()
+        self.changes.emit(DELETED, deleted)
+        return len(deleted)
+        
+    def _insert_tag_links(self, task_ids: List[int], tag_ids, ignore_existing: bool = False) -> int:
+        """为任务插入标签关联（不提交），不存在的标签ID会被忽略
+        
+        Args:
+            task_ids: 任务ID列表
+            tag_ids: 标签ID序列
+            ignore_existing: 为True时使用 INSERT OR IGNORE 跳过已有关联
+            
+        Returns:
+            插入的关联行数
+        """
+        tag_ids = list(dict.fromkeys(tag_ids))
+        links = [{"task_id": task_id, "tag_id": tag_id} for task_id in task_ids for tag_id in tag_ids]
+        return self._link_tags(links, ignore_existing)
+        
+    def _link_tags(self, links: List[Dict[str, int]], ignore_existing: bool = False) -> int:
+        """用一条 executemany 插入标签关联（不提交），不存在的标签ID会被忽略
+        
+        每行是 INSERT ... SELECT ... FROM tag WHERE id = :tag_id，标签是否存在在同一事务中由数据库判断：
+        标签缓存可能没有包含命令行、导入或其他程序实例删除的标签，按缓存插入会违反外键约束。
+        
+        Args:
+            links: [{"task_id": 任务ID, "tag_id": 标签ID}]
+            ignore_existing: 为True时使用 INSERT OR IGNORE 跳过已有关联
+            
+        Returns:
+            插入的关联行数
+        """
+        if not links:
+            return 0
+        statement = insert(task_tags).from_select(
+            ["task_id", "tag_id"],
+            select(bindparam("task_id"), Tag.id).where(Tag.id == bindparam("tag_id")),
+        )
+        if ignore_existing:
+            statement = statement.prefix_with("OR IGNORE")
+        return self.session.execute(statement, links).rowcount
+        
+    @staticmethod
+    def _parse_due_date(due_date: Optional[str]) -> Optional[date]:
+        """解析截止日期字符串
+        
+        Args:
+            due_date: yyyy-MM-dd 格式字符串或 None
+            
+        Returns:
+            日期对象，格式不正确或为空时返回None
+        """
+        if not due_date:
+            return None
+        try:
+            parsed = datetime.strptime(due_date, "%Y-%m-%d").date()
+        except ValueError:
+            # 如果格式不正确，按 None 处理
+            return None
+        return None if parsed == LEGACY_NO_DUE_DATE else parsed
+        
+    @unit_of_work(prepare=load_task_tags)
     def get_tasks_by_priority(self, priority: int) -> List[Task]:
         """获取指定优先级的任务
         
@@ -183,7 +830,7 @@ class TaskController:
         Returns:
             任务列表
         """
-        return self.session.query(Task).filter(Task.priority == priority).all()
+        return self.session.query(Task).options(selectinload(Task.tags)).filter(Task.priority == priority).all()
     
     @staticmethod
     def extract_tag(title: str) -> tuple:
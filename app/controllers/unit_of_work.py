@@ -0,0 +1,79 @@
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy.orm import Session as SessionType
+
+from app.models.base import current_session, session_scope
+
+class SessionSource:
+    """控制器使用的会话来源
+
+    - 传入会话对象：始终使用该会话，由调用方负责关闭（后台线程、脚本中每个请求一个会话）
+    - 传入会话工厂：每个控制器操作在 session_scope 中打开一个短期会话，操作结束即关闭；
+      操作中调用其他控制器时共享同一个会话
+    """
+
+    def __init__(self, session_or_factory):
+        """初始化会话来源
+
+        Args:
+            session_or_factory: 会话对象，或会话工厂（如 app.models.base.OperationSession）
+        """
+        if isinstance(session_or_factory, SessionSource):
+            self._session = session_or_factory._session
+            self._factory = session_or_factory._factory
+        elif isinstance(session_or_factory, SessionType):
+            self._session = session_or_factory
+            self._factory = None
+        else:
+            self._session = None
+            self._factory = session_or_factory
+
+    @property
+    def session(self) -> SessionType:
+        """当前操作使用的会话
+
+        Raises:
+            RuntimeError: 使用会话工厂时在控制器操作之外访问
+        """
+        if self._session is not None:
+            return self._session
+        session = current_session()
+        if session is None:
+            raise RuntimeError("会话只能在控制器操作（session_scope）中使用")
+        return session
+
+    @contextmanager
+    def scope(self) -> Iterator[bool]:
+        """控制器操作的会话范围
+
+        Yields:
+            本次操作是否新开了会话（最外层操作），返回值需要在会话关闭前加载完整
+        """
+        if self._session is not None or current_session() is not None:
+            yield False
+            return
+        with session_scope(self._factory):
+            yield True
+
+def unit_of_work(method: Optional[Callable] = None, *, prepare: Optional[Callable[[Any, Any], None]] = None):
+    """控制器方法装饰器：方法在一个工作单元中执行
+
+    可以直接使用 @unit_of_work，也可以用 @unit_of_work(prepare=...) 指定
+    在会话关闭前处理返回值的函数 prepare(session, result)（如加载关系属性）。
+    被装饰方法所属的对象需要有 _sessions 属性（SessionSource）。
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self._sessions.scope() as owned:
+                result = func(self, *args, **kwargs)
+                if owned and prepare is not None:
+                    prepare(self._sessions.session, result)
+                return result
+        return wrapper
+
+    if method is not None:
+        return decorator(method)
+    return decorator
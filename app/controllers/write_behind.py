@@ -0,0 +1,136 @@
+"""
+任务修改的写回队列
+界面上的快速修改（如连续勾选复选框）先进入队列，按任务ID合并，
+短暂延迟后在一个事务中统一写入，界面在此期间乐观地显示修改后的状态。
+写入失败时只回滚失败的任务，其余任务的修改保持生效。
+"""
+
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+# 最后一次修改后等待多久再写入（秒），期间的修改会合并
+FLUSH_DELAY = 0.5
+
+# 第一条未写入的修改最多等待多久（秒），持续修改时也不会无限推迟
+MAX_FLUSH_DELAY = 2.0
+
+class PendingChange(NamedTuple):
+    """一个任务尚未写入的修改"""
+    values: Dict[str, Any]  # 合并后的新值
+    previous: Dict[str, Any]  # 修改前的值（调用方提供时），用于失败时回滚界面
+
+class FlushResult(NamedTuple):
+    """一次写入的结果"""
+    written: Tuple[int, ...]  # 已写入的任务ID
+    failed: Dict[int, PendingChange]  # 未能写入的任务（任务已不存在或写入出错）
+    error: Optional[Exception]  # 写入出错时的最后一个异常
+
+class WriteBehindQueue:
+    """按任务ID合并修改、延迟批量写入的队列
+
+    调度器由调用方注入，队列本身不依赖具体的事件循环：
+    schedule(delay) 安排在 delay 秒后调用 flush()，之前安排的尚未执行的调用作废
+    （如界面中的单次 QTimer）。不提供调度器时每次修改立即写入。
+    """
+
+    def __init__(self, task_controller, schedule: Optional[Callable[[float], None]] = None,
+                 on_failed: Optional[Callable[[FlushResult], None]] = None,
+                 delay: float = FLUSH_DELAY, max_delay: float = MAX_FLUSH_DELAY,
+                 clock: Callable[[], float] = time.monotonic):
+        """初始化队列
+
+        Args:
+            task_controller: 任务控制器，写入时调用其 apply_changes
+            schedule: 延迟刷新的调度函数
+            on_failed: 有任务写入失败时的回调，接收 FlushResult
+            delay: 最后一次修改后的等待时间（秒）
+            max_delay: 第一条未写入的修改的最长等待时间（秒）
+            clock: 计时函数
+        """
+        self.task_controller = task_controller
+        self._schedule = schedule
+        self.on_failed = on_failed
+        self.delay = delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._pending: Dict[int, PendingChange] = {}
+        # 第一条未写入的修改进入队列的时间
+        self._first_pending_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def pending(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """任务尚未写入的新值，没有时返回None"""
+        change = self._pending.get(task_id)
+        return None if change is None else dict(change.values)
+
+    def submit(self, task_id: int, values: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """提交一个任务的修改
+
+        同一任务的多次修改合并为一次写入；提供 previous 时，
+        改回原值的字段直接从队列中去掉（如复选框勾选后又取消）。
+
+        Args:
+            task_id: 任务ID
+            values: 要更新的数据字典，键与 TaskController.update_task 相同（不支持 tag_ids）
+            previous: 修改前界面显示的值，写入失败时用于回滚界面
+        """
+        change = self._pending.get(task_id) or PendingChange({}, {})
+        for field, value in values.items():
+            if field not in change.values and previous is not None and field in previous:
+                change.previous[field] = previous[field]
+            if field in change.previous and change.previous[field] == value:
+                # 改回了原值，不需要写入
+                change.values.pop(field, None)
+                change.previous.pop(field)
+            else:
+                change.values[field] = value
+
+        if change.values:
+            self._pending[task_id] = change
+        else:
+            self._pending.pop(task_id, None)
+        if not self._pending:
+            self._first_pending_at = None
+            return
+
+        now = self._clock()
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+        if self._schedule is None or now - self._first_pending_at >= self.max_delay:
+            self.flush()
+        else:
+            self._schedule(min(self.delay, self._first_pending_at + self.max_delay - now))
+
+    def flush(self) -> FlushResult:
+        """在一个事务中写入所有未写入的修改
+
+        整批写入出错时逐个任务重试，只有仍然失败的任务计入 failed。
+
+        Returns:
+            写入结果；有失败的任务时同时调用 on_failed
+        """
+        pending, self._pending = self._pending, {}
+        self._first_pending_at = None
+        if not pending:
+            return FlushResult((), {}, None)
+
+        error = None
+        try:
+            written = self.task_controller.apply_changes({task_id: change.values for task_id, change in pending.items()})
+        except Exception as e:
+            error = e
+            written = []
+            for task_id, change in pending.items():
+                try:
+                    written += self.task_controller.apply_changes({task_id: change.values})
+                except Exception as e:
+                    error = e
+
+        written_ids = set(written)
+        failed = {task_id: change for task_id, change in pending.items() if task_id not in written_ids}
+        result = FlushResult(tuple(written), failed, error)
+        if failed and self.on_failed is not None:
+            self.on_failed(result)
+        return result
@@ -1,37 +1,236 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, ForeignKey, Table
+from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, ForeignKey, Table, Index, DDL, event
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 
+from app.utils.db_config import SqliteProfile, load_db_path, load_profile
+
 # 创建基础模型类
 Base = declarative_base()
 
-# 在当前文件夹下创建数据库
+# 数据库路径（可通过 TASKMOMENT_DB_PATH 或配置文件修改）
 CURRENT_DIR = Path(__file__).resolve().parent.parent.parent
-DB_PATH = CURRENT_DIR / "data" / "tasks.db"
+DB_PATH = load_db_path()
 
 # 确保数据目录存在
-DB_PATH.parent.mkdir(exist_ok=True)
+DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+def create_sqlite_engine(db_path, profile: Optional[SqliteProfile] = None, **kwargs):
+    """创建 SQLite 引擎，每个新连接都会应用 PRAGMA 性能配置
+    
+    Args:
+        db_path: 数据库路径
+        profile: SQLite 性能配置，为None时从配置文件/环境变量加载
+        **kwargs: 传给 create_engine 的其他参数
+        
+    Returns:
+        数据库引擎，使用的配置保存在 engine.sqlite_profile 中
+    """
+    if profile is None:
+        profile = load_profile()
+    
+    new_engine = create_engine(
+        f"sqlite:///{db_path}",
+        echo=False,
+        connect_args={"check_same_thread": False},
+        **kwargs
+    )
+    
+    @event.listens_for(new_engine, "connect")
+    def _apply_profile(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in profile.pragma_statements():
+            cursor.execute(statement)
+        cursor.close()
+    
+    new_engine.sqlite_profile = profile
+    return new_engine
+
+def get_active_profile(bind=None) -> Dict[str, Any]:
+    """读取连接上实际生效的 PRAGMA 值（用于诊断）
+    
+    Args:
+        bind: 引擎，默认为全局引擎
+        
+    Returns:
+        {PRAGMA 名称: 当前值}
+    """
+    bind = bind or engine
+    with bind.connect() as conn:
+        return {
+            name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+            for name in SqliteProfile._fields
+        }
 
 # 创建数据库引擎
-engine = create_engine(f"sqlite:///{DB_PATH}", echo=False, connect_args={"check_same_thread": False})
+engine = create_sqlite_engine(DB_PATH)
 Session = sessionmaker(bind=engine)
 
-# 任务标签关联表（多对多关系）
+# 工作单元会话：每个操作一个会话，操作结束即关闭，身份映射不会随运行时间增长。
+# 会话关闭后对象不会再被刷新，提交时无需让对象过期，调用方仍可读取已加载的属性
+OperationSession = sessionmaker(bind=engine, expire_on_commit=False)
+
+# 当前上下文（线程/协程）中由 session_scope 打开的会话
+_current_session: ContextVar[Optional[Any]] = ContextVar("taskmoment_session", default=None)
+
+def current_session():
+    """当前上下文中 session_scope 打开的会话，没有时返回None"""
+    return _current_session.get()
+
+@contextmanager
+def session_scope(session_factory=None) -> Iterator[Any]:
+    """工作单元：在代码块内使用同一个会话
+    
+    当前上下文已有打开的会话时直接复用（嵌套调用共享一个会话和事务），
+    否则新建会话：正常结束时提交，出现异常时回滚，最后关闭。
+    
+    Args:
+        session_factory: 会话工厂，默认为 OperationSession
+        
+    Yields:
+        会话
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+    
+    session = (session_factory or OperationSession)()
+    token = _current_session.set(session)
+    try:
+        yield session
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    finally:
+        _current_session.reset(token)
+        session.close()
+
+# 任务标签关联表（多对多关系），删除任务或标签时由外键级联删除关联行
 task_tags = Table(
     'task_tags',
     Base.metadata,
-    Column('task_id', Integer, ForeignKey('task.id'), primary_key=True),
-    Column('tag_id', Integer, ForeignKey('tag.id'), primary_key=True)
+    Column('task_id', Integer, ForeignKey('task.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tag.id', ondelete='CASCADE'), primary_key=True)
 )
 
+# 反向索引：按标签查找任务（主键只覆盖 task_id 在前的查找）
+Index('ix_task_tags_tag_id_task_id', task_tags.c.tag_id, task_tags.c.task_id)
+
+# 维护 tag.task_count 冗余计数的触发器
+TAG_TASK_COUNT_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS task_tags_count_insert AFTER INSERT ON task_tags
+    BEGIN
+        UPDATE tag SET task_count = task_count + 1 WHERE id = NEW.tag_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_tags_count_delete AFTER DELETE ON task_tags
+    BEGIN
+        UPDATE tag SET task_count = task_count - 1 WHERE id = OLD.tag_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_tags_count_update AFTER UPDATE OF tag_id ON task_tags
+    BEGIN
+        UPDATE tag SET task_count = task_count - 1 WHERE id = OLD.tag_id;
+        UPDATE tag SET task_count = task_count + 1 WHERE id = NEW.tag_id;
+    END
+    """,
+)
+
+# 新建数据库时随关联表一起创建触发器
+for _trigger_sql in TAG_TASK_COUNT_TRIGGERS:
+    event.listen(task_tags, "after_create", DDL(_trigger_sql))
+
+# 任务全文索引：rowid 即任务ID，tags 列为该任务标签名的空格拼接
+TASK_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+    title, tags, tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3'
+)
+"""
+
+# 任务的标签名拼接（触发器中使用，:task_id 替换为 NEW.task_id 等）
+_TASK_TAG_NAMES = (
+    "(SELECT coalesce(group_concat(tag.tag, ' '), '') FROM task_tags "
+    "JOIN tag ON tag.id = task_tags.tag_id WHERE task_tags.task_id = {task_id})"
+)
+
+# 保持 task_fts 与任务标题、标签同步的触发器
+TASK_FTS_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task
+    BEGIN
+        INSERT INTO task_fts (rowid, title, tags) VALUES (NEW.id, NEW.title, '');
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF title ON task
+    BEGIN
+        UPDATE task_fts SET title = NEW.title WHERE rowid = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task
+    BEGIN
+        DELETE FROM task_fts WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_fts_tag_link_insert AFTER INSERT ON task_tags
+    BEGIN
+        UPDATE task_fts SET tags = {_TASK_TAG_NAMES.format(task_id="NEW.task_id")}
+        WHERE rowid = NEW.task_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_fts_tag_link_delete AFTER DELETE ON task_tags
+    BEGIN
+        UPDATE task_fts SET tags = {_TASK_TAG_NAMES.format(task_id="OLD.task_id")}
+        WHERE rowid = OLD.task_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS task_fts_tag_rename AFTER UPDATE OF tag ON tag
+    BEGIN
+        UPDATE task_fts SET tags = {_TASK_TAG_NAMES.format(task_id="task_fts.rowid")}
+        WHERE rowid IN (SELECT task_id FROM task_tags WHERE tag_id = NEW.id);
+    END
+    """,
+)
+
+# 用现有数据重建全文索引
+TASK_FTS_REBUILD = (
+    "DELETE FROM task_fts",
+    "INSERT INTO task_fts (rowid, title, tags) "
+    f"SELECT task.id, task.title, {_TASK_TAG_NAMES.format(task_id='task.id')} FROM task",
+)
+
+# 新建数据库时在所有表建好之后创建全文索引及触发器
+for _fts_sql in (TASK_FTS_TABLE,) + TASK_FTS_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_fts_sql))
+
 def init_db():
-    """初始化数据库"""
+    """初始化数据库
+    
+    结构版本已是最新时只读取一次 PRAGMA user_version，
+    否则先建出缺失的表，再执行待执行的迁移步骤。
+    """
     # 创建数据目录
     DB_PATH.parent.mkdir(exist_ok=True)
     
-    # 创建表
-    Base.metadata.create_all(engine)
+    from app.utils.migrate_db import is_schema_current, migrate_database
+    if not is_schema_current(DB_PATH):
+        # 创建表
+        Base.metadata.create_all(engine)
+        
+        # 升级已有数据库的表结构
+        migrate_database(DB_PATH, verbose=False)
     
     return Session()
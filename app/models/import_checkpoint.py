@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+
+from app.models.base import Base
+
+class ImportCheckpoint(Base):
+    """批量导入的断点记录，每个导入源一行，与每块数据在同一事务中更新"""
+    __tablename__ = "import_checkpoint"
+
+    source = Column(String, primary_key=True)  # 导入文件的绝对路径
+    records = Column(Integer, nullable=False, default=0)  # 已处理的记录数（含校验失败的记录）
+    imported = Column(Integer, nullable=False, default=0)  # 已导入的任务数
+    failed = Column(Integer, nullable=False, default=0)  # 校验失败的记录数
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ImportCheckpoint {self.source}: {self.records}>"
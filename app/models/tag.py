@@ -8,6 +8,8 @@ class Tag(Base):
 
     id = Column(Integer, primary_key=True)
     tag = Column(String(50), nullable=False, unique=True)
+    # 关联任务数量，由 task_tags 上的触发器维护
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     def __repr__(self):
         return f"<Tag {self.tag}>"
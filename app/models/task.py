@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import IntEnum
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, SmallInteger, Date
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, SmallInteger, Date, Index
+from sqlalchemy.orm import backref, relationship
 
 from app.models.base import Base, task_tags
 
@@ -12,6 +12,26 @@ class Priority(IntEnum):
     MEDIUM = 2
     HIGH = 3
 
+# 优先级显示名称
+PRIORITY_NAMES = {
+    Priority.NONE: "无",
+    Priority.LOW: "低",
+    Priority.MEDIUM: "中",
+    Priority.HIGH: "高",
+}
+
+# 优先级颜色
+PRIORITY_COLORS = {
+    Priority.NONE: "#808080",  # 灰色
+    Priority.LOW: "#4D94FF",  # 蓝色
+    Priority.MEDIUM: "#FFD700",  # 黄色
+    Priority.HIGH: "#FF4D4D",  # 红色
+}
+
+# 旧版本用 QDate 的最小值 1752-09-14 表示“无截止日期”，
+# 已由迁移7改为 NULL，导入旧数据时同样按无截止日期处理
+LEGACY_NO_DUE_DATE = date(1752, 9, 14)
+
 class Task(Base):
     """任务模型"""
     __tablename__ = "task"
@@ -20,11 +40,11 @@ class Task(Base):
     title = Column(String(100), nullable=False)
     completed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    due_date = Column(Date, nullable=True)
-    priority = Column(SmallInteger, default=Priority.NONE, nullable=False)
+    due_date = Column(Date, nullable=True, index=True)
+    priority = Column(SmallInteger, default=Priority.NONE, nullable=False, index=True)
     
-    # 多对多标签关系
-    tags = relationship("Tag", secondary=task_tags, backref="tasks")
+    # 多对多标签关系，关联行由外键级联删除，删除时不加载集合
+    tags = relationship("Tag", secondary=task_tags, backref=backref("tasks", passive_deletes=True), passive_deletes=True)
 
     def display_title(self):
         """返回带有标签的任务标题（用于UI显示）"""
@@ -41,14 +61,7 @@ class Task(Base):
         Returns:
             str: 颜色代码
         """
-        if self.priority == Priority.HIGH:
-            return "#FF4D4D"  # 红色
-        elif self.priority == Priority.MEDIUM:
-            return "#FFD700"  # 黄色
-        elif self.priority == Priority.LOW:
-            return "#4D94FF"  # 蓝色
-        else:
-            return "#808080"  # 灰色
+        return PRIORITY_COLORS.get(self.priority, PRIORITY_COLORS[Priority.NONE])
             
     def get_priority_name(self):
         """返回优先级名称
@@ -56,11 +69,17 @@ class Task(Base):
         Returns:
             str: 优先级名称
         """
-        if self.priority == Priority.HIGH:
-            return "高"
-        elif self.priority == Priority.MEDIUM:
-            return "中"
-        elif self.priority == Priority.LOW:
-            return "低"
-        else:
-            return "无"
+        return PRIORITY_NAMES.get(self.priority, PRIORITY_NAMES[Priority.NONE])
+
+
+# 与任务列表默认排序完全一致的表达式索引，SQLite 可按索引顺序直接返回结果而无需临时排序
+# 注意：TaskController._list_order 中的排序表达式必须与这里保持一致
+Index(
+    "ix_task_list_order",
+    Task.completed.is_(True),
+    Task.due_date.is_(None),
+    Task.due_date,
+    Task.priority.desc(),
+    Task.created_at.desc(),
+    Task.id.desc(),
+)
@@ -0,0 +1,191 @@
+"""
+存储后端接口
+行级的存储层：任务和标签以只读投影（TaskRow、TagCount）和ID读写，
+不暴露 ORM 对象和会话，SQLite 实现与内存实现可以互换。
+
+TaskController 和 TagController 不经过这一层，仍直接使用 SQLAlchemy：
+键集分页、FTS5 检索、位图索引的建立和对话框使用的 ORM 对象都依赖数据库会话，
+接口中没有对应的操作，内存实现也不能代替数据库运行控制器。
+
+两个实现的行为由 app.repositories.conformance 中的一致性检查相互校验（tests/test_repositories.py）。
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.controllers.tag_controller import TagCount
+from app.controllers.task_controller import TaskRow
+from app.models.task import Priority
+
+# 可以通过 update_tasks 修改的任务字段
+TASK_FIELDS = ("title", "due_date", "priority", "completed")
+
+def task_order_key(row) -> tuple:
+    """任务在默认排序中的排序键（升序排列即为 get_all_tasks 的顺序）
+
+    与 TaskController._list_order 的 SQL 排序语义一致：
+    未完成在前、有截止日期在前、截止日期升序、优先级降序、
+    创建时间降序（无创建时间的排在最后，同 SQLite 中 NULL 的降序位置）、ID 降序。
+
+    Args:
+        row: 带 id、completed、due_date、priority、created_at 属性的对象
+
+    Returns:
+        可直接比较的元组
+    """
+    created_at = row.created_at
+    return (
+        1 if row.completed else 0,
+        1 if row.due_date is None else 0,
+        row.due_date or date.min,
+        -row.priority,
+        created_at is None,
+        -(created_at - datetime.min) if created_at is not None else timedelta(0),
+        -row.id,
+    )
+
+class TaskRepository:
+    """任务与标签存储的接口
+
+    写操作各自构成一个事务；不存在的任务ID、标签ID会被忽略而不是报错，
+    与控制器的行为一致。日期参数均为 date 对象（字符串解析由控制器负责）。
+    """
+
+    # ---- 标签 ----
+
+    def create_tag(self, name: str) -> Optional[int]:
+        """创建标签
+
+        Returns:
+            新标签ID，名称已存在时返回None
+        """
+        raise NotImplementedError
+
+    def get_tag_id(self, name: str) -> Optional[int]:
+        """根据名称查找标签ID，不存在时返回None"""
+        raise NotImplementedError
+
+    def tag_names(self, tag_ids: Iterable[int]) -> Dict[int, str]:
+        """批量读取标签名称
+
+        Returns:
+            {标签ID: 标签名称}，不存在的ID不出现在结果中
+        """
+        raise NotImplementedError
+
+    def list_tags(self) -> List[Tuple[int, str]]:
+        """所有标签的ID和名称，按名称排序"""
+        raise NotImplementedError
+
+    def tag_counts(self) -> List[TagCount]:
+        """所有标签及其关联任务数量，按名称排序"""
+        raise NotImplementedError
+
+    def rename_tag(self, tag_id: int, name: str) -> bool:
+        """重命名标签
+
+        Returns:
+            是否成功，标签不存在或新名称已被其他标签使用时返回False
+        """
+        raise NotImplementedError
+
+    def delete_tag(self, tag_id: int) -> bool:
+        """删除标签及其任务关联
+
+        Returns:
+            是否成功删除
+        """
+        raise NotImplementedError
+
+    # ---- 任务 ----
+
+    def create_tasks(self, items: List[Dict[str, Any]]) -> List[int]:
+        """批量创建任务
+
+        Args:
+            items: 任务数据字典列表，键为 title、due_date、priority、completed、
+                created_at（默认为当前UTC时间）和 tag_ids
+
+        Returns:
+            新任务ID列表，顺序与 items 相同
+        """
+        raise NotImplementedError
+
+    def create_task(self, title: str, due_date: Optional[date] = None, priority: int = Priority.NONE,
+                    completed: bool = False, tag_ids: Iterable[int] = (),
+                    created_at: Optional[datetime] = None) -> int:
+        """创建一个任务，返回任务ID"""
+        return self.create_tasks([{
+            "title": title,
+            "due_date": due_date,
+            "priority": priority,
+            "completed": completed,
+            "tag_ids": list(tag_ids),
+            "created_at": created_at,
+        }])[0]
+
+    def get_task(self, task_id: int) -> Optional[TaskRow]:
+        """读取一个任务，不存在时返回None"""
+        raise NotImplementedError
+
+    def count_tasks(self) -> int:
+        """任务总数"""
+        raise NotImplementedError
+
+    def list_tasks(self, task_ids: Optional[Iterable[int]] = None) -> List[TaskRow]:
+        """按默认排序读取任务
+
+        Args:
+            task_ids: 只读取这些任务，为None时读取全部任务
+        """
+        raise NotImplementedError
+
+    def tasks_by_priority(self, priority: int) -> List[TaskRow]:
+        """指定优先级的任务，按默认排序"""
+        raise NotImplementedError
+
+    def tasks_due_between(self, start: date, end: date) -> List[TaskRow]:
+        """截止日期在 [start, end) 内的任务，按默认排序"""
+        raise NotImplementedError
+
+    def task_ids_with_tag(self, tag_id: int) -> Set[int]:
+        """关联了该标签的任务ID"""
+        raise NotImplementedError
+
+    def update_tasks(self, task_ids: Iterable[int], values: Dict[str, Any]) -> int:
+        """把相同的字段值应用到多个任务
+
+        Args:
+            task_ids: 任务ID
+            values: 要修改的字段，键为 TASK_FIELDS 中的字段
+
+        Returns:
+            受影响的任务数量
+        """
+        raise NotImplementedError
+
+    def set_task_tags(self, task_ids: Iterable[int], tag_ids: Iterable[int]) -> None:
+        """把任务的标签替换为 tag_ids"""
+        raise NotImplementedError
+
+    def add_task_tags(self, task_ids: Iterable[int], tag_ids: Iterable[int]) -> None:
+        """为任务追加标签，已有的关联保持不变"""
+        raise NotImplementedError
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        """删除任务及其标签关联
+
+        Returns:
+            删除的任务数量
+        """
+        raise NotImplementedError
+
+def check_task_fields(values: Dict[str, Any]) -> None:
+    """检查 update_tasks 的字段名
+
+    Raises:
+        ValueError: 包含不支持修改的字段
+    """
+    unknown = set(values) - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"不支持修改的任务字段: {', '.join(sorted(unknown))}")
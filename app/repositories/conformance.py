@@ -0,0 +1,347 @@
+"""
+存储后端一致性检查
+同一组场景在每个后端上执行，结果必须符合预期；
+另外把同一串随机操作同时作用于多个后端，逐步比较返回值和完整状态。
+
+用法:
+    python -m app.repositories.conformance [--operations 2000] [--seed 0]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base, create_sqlite_engine
+from app.models.task import Priority
+from app.repositories.base import TaskRepository, task_order_key
+from app.repositories.memory import MemoryRepository
+from app.repositories.sqlalchemy_repository import SqlAlchemyRepository
+from app.utils.migrate_db import migrate_database
+
+# 场景中使用的固定时间，保证各后端的创建时间相同
+BASE_TIME = datetime(2024, 1, 1, 9, 0, 0)
+BASE_DATE = date(2024, 1, 1)
+
+class ConformanceError(AssertionError):
+    """后端行为与预期不一致"""
+
+class Check(NamedTuple):
+    """一致性检查场景"""
+    name: str
+    run: Callable[[TaskRepository], None]
+
+# 按注册顺序排列的检查场景
+CHECKS: List[Check] = []
+
+def check(name: str):
+    """注册检查场景的装饰器，场景接收一个空的存储"""
+    def decorator(func):
+        CHECKS.append(Check(name, func))
+        return func
+    return decorator
+
+def _expect(actual, expected, what: str):
+    if actual != expected:
+        raise ConformanceError(f"{what}: 期望 {expected!r}，实际 {actual!r}")
+
+def _ids(rows) -> List[int]:
+    return [row.id for row in rows]
+
+@check("标签增删改")
+def _check_tags(repo: TaskRepository):
+    work = repo.create_tag("work")
+    home = repo.create_tag("home")
+    _expect(repo.create_tag("work"), None, "重复创建标签")
+    _expect(repo.get_tag_id("home"), home, "按名称查找标签")
+    _expect(repo.get_tag_id("missing"), None, "查找不存在的标签")
+    _expect(repo.list_tags(), [(home, "home"), (work, "work")], "标签按名称排序")
+    _expect(repo.tag_names([work, 999]), {work: "work"}, "批量读取标签名称")
+    _expect(repo.rename_tag(work, "home"), False, "重命名为已存在的名称")
+    _expect(repo.rename_tag(work, "work"), True, "重命名为原名称")
+    _expect(repo.rename_tag(999, "x"), False, "重命名不存在的标签")
+    _expect(repo.rename_tag(work, "office"), True, "重命名标签")
+    _expect(repo.get_tag_id("work"), None, "旧名称不再可用")
+    _expect(repo.create_tag("work") is not None, True, "旧名称可以重新创建")
+    _expect(repo.delete_tag(home), True, "删除标签")
+    _expect(repo.delete_tag(home), False, "重复删除标签")
+    _expect([name for _, name in repo.list_tags()], ["office", "work"], "删除后的标签列表")
+
+@check("默认排序")
+def _check_order(repo: TaskRepository):
+    specs = [
+        ("done", True, BASE_DATE, Priority.HIGH, BASE_TIME),
+        ("no due", False, None, Priority.HIGH, BASE_TIME),
+        ("later", False, BASE_DATE + timedelta(days=3), Priority.NONE, BASE_TIME),
+        ("soon low", False, BASE_DATE, Priority.LOW, BASE_TIME + timedelta(minutes=5)),
+        ("soon high", False, BASE_DATE, Priority.HIGH, BASE_TIME),
+        ("soon high newer", False, BASE_DATE, Priority.HIGH, BASE_TIME + timedelta(seconds=1)),
+        ("soon high same time", False, BASE_DATE, Priority.HIGH, BASE_TIME),
+        ("done no due", True, None, Priority.NONE, BASE_TIME),
+    ]
+    ids = repo.create_tasks([
+        {"title": title, "completed": completed, "due_date": due_date, "priority": priority, "created_at": created_at}
+        for title, completed, due_date, priority, created_at in specs
+    ])
+    expected = [ids[5], ids[6], ids[4], ids[3], ids[2], ids[1], ids[0], ids[7]]
+    rows = repo.list_tasks()
+    _expect(_ids(rows), expected, "默认排序")
+    _expect(_ids(sorted(rows, key=task_order_key)), expected, "排序键与默认排序一致")
+    _expect(_ids(repo.list_tasks([ids[0], ids[4], 999, ids[4]])), [ids[4], ids[0]], "按ID读取任务")
+    _expect(_ids(repo.tasks_by_priority(Priority.HIGH)), [ids[5], ids[6], ids[4], ids[1], ids[0]], "按优先级读取任务")
+    _expect(
+        _ids(repo.tasks_due_between(BASE_DATE, BASE_DATE + timedelta(days=3))),
+        [ids[5], ids[6], ids[4], ids[3], ids[0]],
+        "截止日期区间不包含结束日期",
+    )
+    repo.update_tasks([ids[0]], {"completed": False})
+    _expect(_ids(repo.list_tasks())[:4], [ids[5], ids[6], ids[4], ids[0]], "修改后重新排序")
+
+@check("任务字段")
+def _check_fields(repo: TaskRepository):
+    tag_id = repo.create_tag("tag")
+    task_id = repo.create_task("title", BASE_DATE, Priority.MEDIUM, tag_ids=[tag_id], created_at=BASE_TIME)
+    row = repo.get_task(task_id)
+    _expect(
+        (row.title, row.completed, row.due_date, row.priority, row.created_at, row.tags),
+        ("title", False, BASE_DATE, Priority.MEDIUM, BASE_TIME, ("tag",)),
+        "读取任务字段",
+    )
+    _expect(repo.get_task(999), None, "读取不存在的任务")
+    _expect(repo.update_tasks([task_id, 999], {"title": "new", "due_date": None}), 1, "更新任务数量")
+    row = repo.get_task(task_id)
+    _expect((row.title, row.due_date), ("new", None), "更新后的字段")
+    _expect(repo.update_tasks([task_id], {}), 1, "没有字段的更新")
+    try:
+        repo.update_tasks([task_id], {"id": 5})
+    except ValueError:
+        pass
+    else:
+        raise ConformanceError("更新不支持的字段应抛出 ValueError")
+    _expect(repo.get_task(task_id).id, task_id, "拒绝的更新不改变任务")
+
+@check("任务标签")
+def _check_task_tags(repo: TaskRepository):
+    a, b, c = repo.create_tag("a"), repo.create_tag("b"), repo.create_tag("c")
+    t1, t2, t3 = repo.create_tasks([
+        {"title": "t1", "tag_ids": [b, a, b, 999], "created_at": BASE_TIME},
+        {"title": "t2", "tag_ids": [], "created_at": BASE_TIME},
+        {"title": "t3", "tag_ids": [c], "created_at": BASE_TIME},
+    ])
+    _expect(repo.get_task(t1).tags, ("a", "b"), "创建时关联标签（按标签ID排列，忽略重复和不存在的ID）")
+    repo.set_task_tags([t1, 999], [c])
+    _expect(repo.get_task(t1).tags, ("c",), "替换标签")
+    repo.add_task_tags([t1, t2], [a, c])
+    repo.add_task_tags([t1], [a])
+    _expect((repo.get_task(t1).tags, repo.get_task(t2).tags), (("a", "c"), ("a", "c")), "追加标签")
+    _expect(repo.task_ids_with_tag(c), {t1, t2, t3}, "按标签查找任务")
+    _expect([count for _, _, count in repo.tag_counts()], [2, 0, 3], "标签关联任务数量")
+    repo.rename_tag(c, "z")
+    _expect(repo.get_task(t3).tags, ("z",), "重命名标签后任务标签名称")
+    _expect(repo.delete_tag(a), True, "删除已关联的标签")
+    _expect((repo.get_task(t1).tags, repo.task_ids_with_tag(a)), (("z",), set()), "删除标签后移除关联")
+    repo.set_task_tags([t1], [])
+    _expect(repo.get_task(t1).tags, (), "清空标签")
+
+@check("删除任务")
+def _check_delete(repo: TaskRepository):
+    tag_id = repo.create_tag("tag")
+    ids = repo.create_tasks([{"title": f"t{i}", "tag_ids": [tag_id]} for i in range(3)])
+    _expect(repo.delete_tasks([ids[0], ids[0], 999]), 1, "删除任务数量")
+    _expect((repo.count_tasks(), repo.task_ids_with_tag(tag_id)), (2, {ids[1], ids[2]}), "删除后的任务和关联")
+    # 与 SQLite 的 INTEGER PRIMARY KEY 一致：删除最大ID后新任务复用该ID
+    repo.delete_tasks([ids[2]])
+    _expect(repo.create_task("again"), ids[2], "新任务ID为当前最大ID加一")
+
+@check("大量ID")
+def _check_many_ids(repo: TaskRepository):
+    count = 1200
+    ids = repo.create_tasks([
+        {"title": f"t{i}", "priority": i % 4, "created_at": BASE_TIME + timedelta(seconds=i % 7)}
+        for i in range(count)
+    ])
+    expected = _ids(repo.list_tasks())
+    _expect(_ids(repo.list_tasks(reversed(ids))), expected, "超过分块大小的ID列表保持默认排序")
+    tag_id = repo.create_tag("bulk")
+    repo.add_task_tags(ids, [tag_id])
+    _expect(len(repo.task_ids_with_tag(tag_id)), count, "批量追加标签")
+    _expect(repo.update_tasks(ids[::2], {"completed": True}), count // 2, "批量更新")
+    _expect(repo.delete_tasks(ids[:700]), 700, "批量删除")
+    _expect(repo.count_tasks(), count - 700, "批量删除后的任务数")
+
+def run_checks(factory: Callable[[], TaskRepository]) -> List[Tuple[str, Optional[str]]]:
+    """在新建的存储上逐个执行检查场景
+
+    Args:
+        factory: 每次调用返回一个空存储
+
+    Returns:
+        [(场景名称, 失败信息)]，通过时失败信息为None
+    """
+    results = []
+    for item in CHECKS:
+        try:
+            item.run(factory())
+        except ConformanceError as e:
+            results.append((item.name, str(e)))
+        else:
+            results.append((item.name, None))
+    return results
+
+def snapshot(repo: TaskRepository) -> tuple:
+    """存储的完整状态：按默认排序的全部任务、标签及计数"""
+    return repo.list_tasks(), repo.tag_counts()
+
+def _random_operation(rng: random.Random, step: int, task_ids: List[int], tag_ids: List[int]):
+    """生成一个随机操作 (方法名, 参数)，ID 取自当前已知的任务和标签"""
+    def some(ids, most=5):
+        # 偶尔混入不存在的ID
+        picked = rng.sample(ids, min(len(ids), rng.randint(0, most))) if ids else []
+        return picked + ([10 ** 6] if rng.random() < 0.1 else [])
+
+    def task_item():
+        return {
+            "title": f"task {step}",
+            "completed": rng.random() < 0.2,
+            "due_date": BASE_DATE + timedelta(days=rng.randint(-10, 30)) if rng.random() < 0.7 else None,
+            "priority": rng.choice(list(Priority)),
+            # 创建时间经常相同，检验 ID 作为最后的排序键
+            "created_at": BASE_TIME + timedelta(minutes=rng.randint(0, 20)),
+            "tag_ids": some(tag_ids, 3),
+        }
+
+    roll = rng.random()
+    if roll < 0.1:
+        return "create_tag", (f"tag{rng.randint(0, 30)}",)
+    if roll < 0.35:
+        return "create_tasks", ([task_item() for _ in range(rng.randint(1, 4))],)
+    if roll < 0.5:
+        field = rng.choice(["title", "due_date", "priority", "completed"])
+        value = task_item()[field] if field != "title" else f"renamed {step}"
+        return "update_tasks", (some(task_ids), {field: value})
+    if roll < 0.6:
+        return "set_task_tags", (some(task_ids), some(tag_ids, 3))
+    if roll < 0.7:
+        return "add_task_tags", (some(task_ids), some(tag_ids, 3))
+    if roll < 0.8:
+        return "delete_tasks", (some(task_ids, 3),)
+    if roll < 0.85:
+        return "rename_tag", (rng.choice(tag_ids) if tag_ids else 1, f"tag{rng.randint(0, 30)}")
+    if roll < 0.9:
+        return "delete_tag", (rng.choice(tag_ids) if tag_ids else 1,)
+    start = BASE_DATE + timedelta(days=rng.randint(-10, 30))
+    if roll < 0.95:
+        return "tasks_due_between", (start, start + timedelta(days=rng.randint(0, 10)))
+    return "tasks_by_priority", (rng.choice(list(Priority)),)
+
+def compare_backends(repos: Dict[str, TaskRepository], operations: int, seed: int = 0,
+                     snapshot_every: int = 50) -> List[str]:
+    """把同一串随机操作作用于多个后端并比较结果
+
+    Args:
+        repos: {后端名称: 空存储}
+        operations: 操作数量
+        seed: 随机种子
+        snapshot_every: 每隔多少个操作比较一次完整状态
+
+    Returns:
+        不一致的描述，遇到第一处不一致即停止；一致时为空列表
+    """
+    rng = random.Random(seed)
+    names = list(repos)
+    reference = names[0]
+    task_ids: List[int] = []
+    tag_ids: List[int] = []
+    for step in range(1, operations + 1):
+        method, args = _random_operation(rng, step, task_ids, tag_ids)
+        results = {name: getattr(repo, method)(*args) for name, repo in repos.items()}
+        for name in names[1:]:
+            if results[name] != results[reference]:
+                return [f"第 {step} 步 {method}{args!r}: {reference} 返回 {results[reference]!r}，{name} 返回 {results[name]!r}"]
+
+        result = results[reference]
+        if method == "create_tasks":
+            task_ids.extend(result)
+        elif method == "create_tag" and result is not None:
+            tag_ids.append(result)
+        elif method == "delete_tasks" and result:
+            deleted = set(args[0])
+            task_ids = [task_id for task_id in task_ids if task_id not in deleted]
+        elif method == "delete_tag" and result:
+            tag_ids.remove(args[0])
+
+        if step % snapshot_every == 0 or step == operations:
+            states = {name: snapshot(repo) for name, repo in repos.items()}
+            for name in names[1:]:
+                if states[name] != states[reference]:
+                    return [f"第 {step} 步后 {reference} 与 {name} 的状态不一致"]
+    return []
+
+class SqliteRepositories:
+    """在临时目录中为每次调用新建一个 SQLite 数据库的存储工厂"""
+
+    def __init__(self, directory):
+        """初始化工厂
+
+        Args:
+            directory: 存放临时数据库的目录
+        """
+        self.directory = Path(directory)
+        self._engines = []
+
+    def __call__(self) -> SqlAlchemyRepository:
+        db_path = self.directory / f"repository-{len(self._engines)}.db"
+        engine = create_sqlite_engine(db_path)
+        Base.metadata.create_all(engine)
+        migrate_database(db_path, verbose=False)
+        self._engines.append(engine)
+        return SqlAlchemyRepository(sessionmaker(bind=engine, expire_on_commit=False))
+
+    def dispose(self):
+        """释放所有数据库连接"""
+        for engine in self._engines:
+            engine.dispose()
+        self._engines.clear()
+
+def main(argv=None) -> int:
+    """命令行入口：检查内存后端和 SQLite 后端，不一致时返回1"""
+    parser = argparse.ArgumentParser(prog="python -m app.repositories.conformance", description="存储后端一致性检查")
+    parser.add_argument("--operations", type=int, default=2000, help="随机对比的操作数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args(argv)
+
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="taskmoment-conformance-") as directory:
+        sqlite_repositories = SqliteRepositories(directory)
+        try:
+            factories = {"memory": MemoryRepository, "sqlite": sqlite_repositories}
+            for backend, factory in factories.items():
+                started = time.perf_counter()
+                results = run_checks(factory)
+                elapsed = time.perf_counter() - started
+                for name, error in results:
+                    if error is not None:
+                        failed = True
+                        print(f"[{backend}] 失败 {name}: {error}")
+                passed = sum(1 for _, error in results if error is None)
+                print(f"[{backend}] {passed}/{len(results)} 项通过（{elapsed * 1000:.1f} ms）")
+
+            started = time.perf_counter()
+            mismatches = compare_backends({name: factory() for name, factory in factories.items()}, args.operations, args.seed)
+            for mismatch in mismatches:
+                failed = True
+                print(mismatch)
+            if not mismatches:
+                print(f"随机对比 {args.operations} 个操作一致（{time.perf_counter() - started:.1f}s）")
+        finally:
+            sqlite_repositories.dispose()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+内存存储后端
+纯 Python 实现，不依赖数据库，适合测试和临时数据。
+
+任务以字典按ID保存，另外维护几个二级索引：
+- 按默认排序的排序键有序列表，列表读取不需要再排序
+- 按截止日期排序的 (截止日期, 任务ID) 列表，日期范围查询用二分定位
+- 优先级到任务ID集合的分桶
+- 标签到任务ID集合、任务到标签ID集合的双向映射
+"""
+
+from bisect import bisect_left, insort
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.controllers.tag_controller import TagCount
+from app.controllers.task_controller import TaskRow
+from app.models.task import Priority
+from app.repositories.base import TaskRepository, check_task_fields, task_order_key
+
+class _TaskRecord:
+    """内存中的任务记录"""
+
+    __slots__ = ("id", "title", "completed", "due_date", "priority", "created_at")
+
+    def __init__(self, task_id: int, title: str, completed: bool, due_date: Optional[date],
+                 priority: int, created_at: Optional[datetime]):
+        self.id = task_id
+        self.title = title
+        self.completed = completed
+        self.due_date = due_date
+        self.priority = priority
+        self.created_at = created_at
+
+def _remove_sorted(items: list, item) -> None:
+    """从有序列表中删除一个元素"""
+    index = bisect_left(items, item)
+    if index < len(items) and items[index] == item:
+        del items[index]
+
+class MemoryRepository(TaskRepository):
+    """基于字典和二级索引的内存存储"""
+
+    def __init__(self):
+        """初始化空存储"""
+        self._tasks: Dict[int, _TaskRecord] = {}
+        self._tag_names: Dict[int, str] = {}
+        self._tag_ids: Dict[str, int] = {}
+        self._tags_by_task: Dict[int, Set[int]] = {}
+        self._tasks_by_tag: Dict[int, Set[int]] = {}
+        self._by_priority: Dict[int, Set[int]] = {}
+        # 默认排序的排序键，最后一项为 -任务ID
+        self._order: List[tuple] = []
+        # (截止日期, 任务ID)，只包含有截止日期的任务
+        self._due: List[Tuple[date, int]] = []
+        # 与 SQLite 的 INTEGER PRIMARY KEY 相同，新ID为当前最大ID加一
+        self._max_task_id = 0
+        self._max_tag_id = 0
+
+    # ---- 索引维护 ----
+
+    def _index_task(self, record: _TaskRecord):
+        insort(self._order, task_order_key(record))
+        if record.due_date is not None:
+            insort(self._due, (record.due_date, record.id))
+        self._by_priority.setdefault(record.priority, set()).add(record.id)
+
+    def _unindex_task(self, record: _TaskRecord):
+        _remove_sorted(self._order, task_order_key(record))
+        if record.due_date is not None:
+            _remove_sorted(self._due, (record.due_date, record.id))
+        bucket = self._by_priority.get(record.priority)
+        if bucket is not None:
+            bucket.discard(record.id)
+            if not bucket:
+                del self._by_priority[record.priority]
+
+    def _link(self, task_id: int, tag_id: int):
+        self._tags_by_task.setdefault(task_id, set()).add(tag_id)
+        self._tasks_by_tag.setdefault(tag_id, set()).add(task_id)
+
+    def _unlink_task(self, task_id: int):
+        for tag_id in self._tags_by_task.pop(task_id, ()):
+            self._tasks_by_tag[tag_id].discard(task_id)
+
+    def _row(self, record: _TaskRecord) -> TaskRow:
+        tag_ids = sorted(self._tags_by_task.get(record.id, ()))
+        return TaskRow(
+            record.id, record.title, record.completed, record.due_date, record.priority,
+            record.created_at, tuple(self._tag_names[tag_id] for tag_id in tag_ids),
+        )
+
+    def _sorted_rows(self, task_ids: Iterable[int]) -> List[TaskRow]:
+        records = [self._tasks[task_id] for task_id in set(task_ids) if task_id in self._tasks]
+        records.sort(key=task_order_key)
+        return [self._row(record) for record in records]
+
+    # ---- 标签 ----
+
+    def create_tag(self, name: str) -> Optional[int]:
+        if name in self._tag_ids:
+            return None
+        self._max_tag_id += 1
+        tag_id = self._max_tag_id
+        self._tag_names[tag_id] = name
+        self._tag_ids[name] = tag_id
+        return tag_id
+
+    def get_tag_id(self, name: str) -> Optional[int]:
+        return self._tag_ids.get(name)
+
+    def tag_names(self, tag_ids: Iterable[int]) -> Dict[int, str]:
+        return {tag_id: self._tag_names[tag_id] for tag_id in tag_ids if tag_id in self._tag_names}
+
+    def list_tags(self) -> List[Tuple[int, str]]:
+        return sorted(self._tag_names.items(), key=lambda item: item[1])
+
+    def tag_counts(self) -> List[TagCount]:
+        return [
+            TagCount(tag_id, name, len(self._tasks_by_tag.get(tag_id, ())))
+            for tag_id, name in self.list_tags()
+        ]
+
+    def rename_tag(self, tag_id: int, name: str) -> bool:
+        old_name = self._tag_names.get(tag_id)
+        if old_name is None or self._tag_ids.get(name, tag_id) != tag_id:
+            return False
+        del self._tag_ids[old_name]
+        self._tag_names[tag_id] = name
+        self._tag_ids[name] = tag_id
+        return True
+
+    def delete_tag(self, tag_id: int) -> bool:
+        name = self._tag_names.pop(tag_id, None)
+        if name is None:
+            return False
+        del self._tag_ids[name]
+        for task_id in self._tasks_by_tag.pop(tag_id, ()):
+            self._tags_by_task[task_id].discard(tag_id)
+        if tag_id == self._max_tag_id:
+            self._max_tag_id = max(self._tag_names, default=0)
+        return True
+
+    # ---- 任务 ----
+
+    def create_tasks(self, items: List[Dict[str, Any]]) -> List[int]:
+        task_ids = []
+        for item in items:
+            self._max_task_id += 1
+            record = _TaskRecord(
+                self._max_task_id,
+                item["title"],
+                bool(item.get("completed", False)),
+                item.get("due_date"),
+                item.get("priority", Priority.NONE),
+                item.get("created_at") or datetime.utcnow(),
+            )
+            self._tasks[record.id] = record
+            self._index_task(record)
+            for tag_id in item.get("tag_ids") or ():
+                if tag_id in self._tag_names:
+                    self._link(record.id, tag_id)
+            task_ids.append(record.id)
+        return task_ids
+
+    def get_task(self, task_id: int) -> Optional[TaskRow]:
+        record = self._tasks.get(task_id)
+        return None if record is None else self._row(record)
+
+    def count_tasks(self) -> int:
+        return len(self._tasks)
+
+    def list_tasks(self, task_ids: Optional[Iterable[int]] = None) -> List[TaskRow]:
+        if task_ids is not None:
+            return self._sorted_rows(task_ids)
+        # 排序键有序列表即为默认排序，最后一项是 -任务ID
+        return [self._row(self._tasks[-key[-1]]) for key in self._order]
+
+    def tasks_by_priority(self, priority: int) -> List[TaskRow]:
+        return self._sorted_rows(self._by_priority.get(priority, ()))
+
+    def tasks_due_between(self, start: date, end: date) -> List[TaskRow]:
+        # (日期, 0) 排在该日期的所有任务之前
+        lo = bisect_left(self._due, (start, 0))
+        hi = bisect_left(self._due, (end, 0))
+        return self._sorted_rows(task_id for _, task_id in self._due[lo:hi])
+
+    def task_ids_with_tag(self, tag_id: int) -> Set[int]:
+        return set(self._tasks_by_tag.get(tag_id, ()))
+
+    def update_tasks(self, task_ids: Iterable[int], values: Dict[str, Any]) -> int:
+        check_task_fields(values)
+        count = 0
+        for task_id in dict.fromkeys(task_ids):
+            record = self._tasks.get(task_id)
+            if record is None:
+                continue
+            self._unindex_task(record)
+            for field, value in values.items():
+                setattr(record, field, bool(value) if field == "completed" else value)
+            self._index_task(record)
+            count += 1
+        return count
+
+    def set_task_tags(self, task_ids: Iterable[int], tag_ids: Iterable[int]) -> None:
+        tag_ids = [tag_id for tag_id in dict.fromkeys(tag_ids) if tag_id in self._tag_names]
+        for task_id in dict.fromkeys(task_ids):
+            if task_id not in self._tasks:
+                continue
+            self._unlink_task(task_id)
+            for tag_id in tag_ids:
+                self._link(task_id, tag_id)
+
+    def add_task_tags(self, task_ids: Iterable[int], tag_ids: Iterable[int]) -> None:
+        tag_ids = [tag_id for tag_id in dict.fromkeys(tag_ids) if tag_id in self._tag_names]
+        for task_id in dict.fromkeys(task_ids):
+            if task_id in self._tasks:
+                for tag_id in tag_ids:
+                    self._link(task_id, tag_id)
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        count = 0
+        for task_id in dict.fromkeys(task_ids):
+            record = self._tasks.pop(task_id, None)
+            if record is None:
+                continue
+            self._unindex_task(record)
+            self._unlink_task(task_id)
+            count += 1
+        if count and self._max_task_id not in self._tasks:
+            self._max_task_id = max(self._tasks, default=0)
+        return count
@@ -0,0 +1,228 @@
+"""
+SQLite 存储后端
+用 SQLAlchemy 在 task、tag、task_tags 表上实现存储接口，
+标签计数和全文索引仍由数据库触发器维护。
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, insert, select, update
+
+from app.controllers.tag_controller import TagCount
+from app.controllers.task_controller import TaskController, TaskRow
+from app.controllers.unit_of_work import SessionSource, unit_of_work
+from app.models.base import task_tags
+from app.models.tag import Tag
+from app.models.task import Priority, Task
+from app.repositories.base import TaskRepository, check_task_fields, task_order_key
+from app.utils.bulk import IN_CHUNK_SIZE, chunked, insert_returning_ids
+
+class SqlAlchemyRepository(TaskRepository):
+    """基于 SQLAlchemy 会话的存储"""
+
+    def __init__(self, session):
+        """初始化存储
+
+        Args:
+            session: 数据库会话，或会话工厂（每个操作使用一个短期会话）
+        """
+        self._sessions = SessionSource(session)
+
+    @property
+    def session(self):
+        """当前操作使用的会话"""
+        return self._sessions.session
+
+    def _existing_ids(self, column, ids: Iterable[int]) -> List[int]:
+        """筛选出表中存在的ID，保持传入顺序并去重"""
+        ids = list(dict.fromkeys(ids))
+        existing = set()
+        for chunk in chunked(ids):
+            existing.update(self.session.scalars(select(column).where(column.in_(chunk))))
+        return [item for item in ids if item in existing]
+
+    def _rows(self, query) -> List[TaskRow]:
+        """按默认排序执行任务行查询，并一次性读取这些任务的标签"""
+        rows = query.order_by(*TaskController._list_order()).all()
+        names: Dict[int, List[str]] = {}
+        task_ids = [row[0] for row in rows]
+        for chunk in chunked(task_ids):
+            tag_query = self.session.query(task_tags.c.task_id, Tag.tag).join(
+                Tag, Tag.id == task_tags.c.tag_id
+            ).filter(task_tags.c.task_id.in_(chunk)).order_by(task_tags.c.task_id, task_tags.c.tag_id)
+            for task_id, tag_name in tag_query:
+                names.setdefault(task_id, []).append(tag_name)
+        return [
+            TaskRow(task_id, title, bool(completed), due_date, priority, created_at, tuple(names.get(task_id, ())))
+            for task_id, title, completed, due_date, priority, created_at in rows
+        ]
+
+    def _row_query(self):
+        return self.session.query(Task.id, Task.title, Task.completed, Task.due_date, Task.priority, Task.created_at)
+
+    # ---- 标签 ----
+
+    @unit_of_work
+    def create_tag(self, name: str) -> Optional[int]:
+        if self.get_tag_id(name) is not None:
+            return None
+        tag_id = self.session.execute(insert(Tag).values(tag=name)).inserted_primary_key[0]
+        self.session.commit()
+        return tag_id
+
+    @unit_of_work
+    def get_tag_id(self, name: str) -> Optional[int]:
+        return self.session.query(Tag.id).filter(Tag.tag == name).scalar()
+
+    @unit_of_work
+    def tag_names(self, tag_ids: Iterable[int]) -> Dict[int, str]:
+        names = {}
+        for chunk in chunked(list(dict.fromkeys(tag_ids))):
+            for tag_id, name in self.session.query(Tag.id, Tag.tag).filter(Tag.id.in_(chunk)):
+                names[tag_id] = name
+        return names
+
+    @unit_of_work
+    def list_tags(self) -> List[Tuple[int, str]]:
+        return [tuple(row) for row in self.session.query(Tag.id, Tag.tag).order_by(Tag.tag)]
+
+    @unit_of_work
+    def tag_counts(self) -> List[TagCount]:
+        query = self.session.query(Tag.id, Tag.tag, func.count(task_tags.c.task_id)).outerjoin(
+            task_tags, task_tags.c.tag_id == Tag.id
+        ).group_by(Tag.id).order_by(Tag.tag)
+        return [TagCount(*row) for row in query]
+
+    @unit_of_work
+    def rename_tag(self, tag_id: int, name: str) -> bool:
+        existing_id = self.get_tag_id(name)
+        if existing_id is not None and existing_id != tag_id:
+            return False
+        count = self.session.execute(update(Tag).where(Tag.id == tag_id).values(tag=name)).rowcount
+        self.session.commit()
+        return count > 0
+
+    @unit_of_work
+    def delete_tag(self, tag_id: int) -> bool:
+        # 标签关联由外键级联删除
+        count = self.session.execute(delete(Tag).where(Tag.id == tag_id)).rowcount
+        self.session.commit()
+        return count > 0
+
+    # ---- 任务 ----
+
+    @unit_of_work
+    def create_tasks(self, items: List[Dict[str, Any]]) -> List[int]:
+        if not items:
+            return []
+        params = [
+            {
+                "title": item["title"],
+                "due_date": item.get("due_date"),
+                "priority": item.get("priority", Priority.NONE),
+                "completed": bool(item.get("completed", False)),
+                "created_at": item.get("created_at") or datetime.utcnow(),
+            }
+            for item in items
+        ]
+        task_ids = insert_returning_ids(self.session, Task, params)
+
+        valid_tag_ids = set(self._existing_ids(Tag.id, (
+            tag_id for item in items for tag_id in (item.get("tag_ids") or ())
+        )))
+        links = [
+            {"task_id": task_id, "tag_id": tag_id}
+            for task_id, item in zip(task_ids, items)
+            for tag_id in dict.fromkeys(item.get("tag_ids") or ())
+            if tag_id in valid_tag_ids
+        ]
+        if links:
+            self.session.execute(insert(task_tags), links)
+        self.session.commit()
+        return task_ids
+
+    @unit_of_work
+    def get_task(self, task_id: int) -> Optional[TaskRow]:
+        rows = self._rows(self._row_query().filter(Task.id == task_id))
+        return rows[0] if rows else None
+
+    @unit_of_work
+    def count_tasks(self) -> int:
+        return self.session.query(func.count(Task.id)).scalar()
+
+    @unit_of_work
+    def list_tasks(self, task_ids: Optional[Iterable[int]] = None) -> List[TaskRow]:
+        if task_ids is None:
+            return self._rows(self._row_query())
+        rows = []
+        for chunk in chunked(list(dict.fromkeys(task_ids))):
+            rows += self._rows(self._row_query().filter(Task.id.in_(chunk)))
+        if len(rows) > IN_CHUNK_SIZE:
+            # 分块读取时各块分别有序，合并后按相同的排序键再排一次
+            rows.sort(key=task_order_key)
+        return rows
+
+    @unit_of_work
+    def tasks_by_priority(self, priority: int) -> List[TaskRow]:
+        return self._rows(self._row_query().filter(Task.priority == priority))
+
+    @unit_of_work
+    def tasks_due_between(self, start: date, end: date) -> List[TaskRow]:
+        return self._rows(self._row_query().filter(Task.due_date >= start, Task.due_date < end))
+
+    @unit_of_work
+    def task_ids_with_tag(self, tag_id: int) -> Set[int]:
+        return set(self.session.scalars(select(task_tags.c.task_id).where(task_tags.c.tag_id == tag_id)))
+
+    @unit_of_work
+    def update_tasks(self, task_ids: Iterable[int], values: Dict[str, Any]) -> int:
+        check_task_fields(values)
+        task_ids = list(dict.fromkeys(task_ids))
+        if "completed" in values:
+            values = dict(values, completed=bool(values["completed"]))
+        count = 0
+        for chunk in chunked(task_ids):
+            if values:
+                count += self.session.execute(update(Task).where(Task.id.in_(chunk)).values(**values)).rowcount
+            else:
+                count += len(self._existing_ids(Task.id, chunk))
+        self.session.commit()
+        return count
+
+    def _insert_links(self, task_ids: List[int], tag_ids: Iterable[int], ignore_existing: bool):
+        """为已存在的任务插入与已存在标签的关联（不提交）"""
+        tag_ids = self._existing_ids(Tag.id, tag_ids)
+        if not tag_ids:
+            return
+        statement = insert(task_tags)
+        if ignore_existing:
+            statement = statement.prefix_with("OR IGNORE")
+        for chunk in chunked(task_ids):
+            links = [
+                {"task_id": task_id, "tag_id": tag_id}
+                for task_id in self._existing_ids(Task.id, chunk) for tag_id in tag_ids
+            ]
+            if links:
+                self.session.execute(statement, links)
+
+    @unit_of_work
+    def set_task_tags(self, task_ids: Iterable[int], tag_ids: Iterable[int]) -> None:
+        task_ids = list(dict.fromkeys(task_ids))
+        for chunk in chunked(task_ids):
+            self.session.execute(delete(task_tags).where(task_tags.c.task_id.in_(chunk)))
+        self._insert_links(task_ids, tag_ids, ignore_existing=False)
+        self.session.commit()
+
+    @unit_of_work
+    def add_task_tags(self, task_ids: Iterable[int], tag_ids: Iterable[int]) -> None:
+        self._insert_links(list(dict.fromkeys(task_ids)), tag_ids, ignore_existing=True)
+        self.session.commit()
+
+    @unit_of_work
+    def delete_tasks(self, task_ids: Iterable[int]) -> int:
+        count = 0
+        for chunk in chunked(list(dict.fromkeys(task_ids))):
+            count += self.session.execute(delete(Task).where(Task.id.in_(chunk))).rowcount
+        self.session.commit()
+        return count
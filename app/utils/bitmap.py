@@ -0,0 +1,157 @@
+"""
+整数位图
+按 65536 为一块分块存储的非负整数集合，每块是一个 Python 整数位串，
+没有元素的块不占空间。交、并、差运算按块做整数位运算，
+用于标签筛选等需要大量集合运算的场景。
+"""
+
+from typing import Dict, Iterable, Iterator
+
+# 每块的位数
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+
+# 每个字节值中为1的位的偏移量
+_BYTE_OFFSETS = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1)
+    for value in range(256)
+)
+
+def _popcount(bits: int) -> int:
+    """位串中1的个数（兼容 Python 3.8，没有 int.bit_count）"""
+    return bin(bits).count("1")
+
+class Bitmap:
+    """分块压缩的非负整数集合"""
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, values: Iterable[int] = ()):
+        """初始化位图
+
+        Args:
+            values: 初始元素
+        """
+        # {块号: 块内位串}，不保存空块
+        self._chunks: Dict[int, int] = {}
+        chunk_bytes: Dict[int, bytearray] = {}
+        for value in values:
+            if value < 0:
+                raise ValueError(f"位图只能保存非负整数: {value}")
+            offset = value & CHUNK_MASK
+            data = chunk_bytes.get(value >> CHUNK_BITS)
+            if data is None:
+                data = chunk_bytes[value >> CHUNK_BITS] = bytearray(CHUNK_SIZE // 8)
+            data[offset >> 3] |= 1 << (offset & 7)
+        for key, data in chunk_bytes.items():
+            self._chunks[key] = int.from_bytes(data, "little")
+
+    @classmethod
+    def _from_chunks(cls, chunks: Dict[int, int]) -> "Bitmap":
+        """用块字典构造位图（调用方保证没有空块）"""
+        bitmap = cls()
+        bitmap._chunks = chunks
+        return bitmap
+
+    def add(self, value: int):
+        """添加元素"""
+        if value < 0:
+            raise ValueError(f"位图只能保存非负整数: {value}")
+        key = value >> CHUNK_BITS
+        self._chunks[key] = self._chunks.get(key, 0) | 1 << (value & CHUNK_MASK)
+
+    def discard(self, value: int):
+        """删除元素（不存在时忽略）"""
+        key = value >> CHUNK_BITS
+        bits = self._chunks.get(key)
+        if bits is None:
+            return
+        bits &= ~(1 << (value & CHUNK_MASK))
+        if bits:
+            self._chunks[key] = bits
+        else:
+            del self._chunks[key]
+
+    def copy(self) -> "Bitmap":
+        """返回副本"""
+        return self._from_chunks(dict(self._chunks))
+
+    def __contains__(self, value) -> bool:
+        if not isinstance(value, int) or value < 0:
+            return False
+        return bool(self._chunks.get(value >> CHUNK_BITS, 0) >> (value & CHUNK_MASK) & 1)
+
+    def __len__(self) -> int:
+        return sum(_popcount(bits) for bits in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        """按升序遍历元素"""
+        for key in sorted(self._chunks):
+            base = key << CHUNK_BITS
+            data = self._chunks[key].to_bytes(CHUNK_SIZE // 8, "little")
+            for index, byte in enumerate(data):
+                if byte:
+                    start = base + (index << 3)
+                    for bit in _BYTE_OFFSETS[byte]:
+                        yield start + bit
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Bitmap):
+            return NotImplemented
+        return self._chunks == other._chunks
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        small, large = (self, other) if len(self._chunks) <= len(other._chunks) else (other, self)
+        chunks = {}
+        for key, bits in small._chunks.items():
+            bits &= large._chunks.get(key, 0)
+            if bits:
+                chunks[key] = bits
+        return self._from_chunks(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self._chunks)
+        for key, bits in other._chunks.items():
+            chunks[key] = chunks.get(key, 0) | bits
+        return self._from_chunks(chunks)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        chunks = {}
+        for key, bits in self._chunks.items():
+            bits &= ~other._chunks.get(key, 0)
+            if bits:
+                chunks[key] = bits
+        return self._from_chunks(chunks)
+
+    def __repr__(self) -> str:
+        return f"Bitmap({len(self)} 个元素)"
+
+    @classmethod
+    def union(cls, bitmaps: Iterable["Bitmap"]) -> "Bitmap":
+        """多个位图的并集"""
+        chunks: Dict[int, int] = {}
+        for bitmap in bitmaps:
+            for key, bits in bitmap._chunks.items():
+                chunks[key] = chunks.get(key, 0) | bits
+        return cls._from_chunks(chunks)
+
+    @classmethod
+    def intersection(cls, bitmaps: Iterable["Bitmap"]) -> "Bitmap":
+        """多个位图的交集（从最小的位图开始，尽早得到空集）
+
+        Args:
+            bitmaps: 至少一个位图
+        """
+        bitmaps = sorted(bitmaps, key=lambda bitmap: len(bitmap._chunks))
+        if not bitmaps:
+            raise ValueError("交集至少需要一个位图")
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            if not result:
+                break
+            result = result & bitmap
+        return result.copy() if result is bitmaps[0] else result
@@ -0,0 +1,43 @@
+"""
+批量写入工具
+"""
+
+from typing import Any, Dict, Iterator, List, Sequence
+
+from sqlalchemy import func, insert, select
+
+# IN (...) 条件每块的ID数，避免超出 SQLite 参数上限
+IN_CHUNK_SIZE = 500
+
+def chunked(items: Sequence, size: int = IN_CHUNK_SIZE) -> Iterator[Sequence]:
+    """把序列切分为固定大小的块
+
+    Args:
+        items: 支持切片的序列（如ID列表）
+        size: 每块大小
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def insert_returning_ids(conn, model, rows: List[Dict[str, Any]]) -> List[int]:
+    """用一条 executemany 批量插入，返回新行的主键
+
+    INSERT ... RETURNING 要求按参数顺序返回主键时，SQLAlchemy 在 SQLite 上会退化为逐行执行，
+    这里改为不带 RETURNING 的 executemany，再读取一次最大主键推算新ID：
+    插入语句已使当前事务持有写锁，其他连接不能同时插入，
+    未指定主键时 SQLite 依次分配连续的 rowid，新ID即以插入后最大主键结尾的连续区间。
+
+    Args:
+        conn: 处于事务中的会话或连接（调用方负责提交）
+        model: 以单个整数列为主键的模型类
+        rows: 各行的列值，不能包含主键
+
+    Returns:
+        新行的主键，顺序与 rows 相同
+    """
+    if not rows:
+        return []
+    primary_key = model.__table__.primary_key.columns.values()[0]
+    conn.execute(insert(model), rows)
+    last_id = conn.execute(select(func.max(primary_key))).scalar()
+    return list(range(last_id - len(rows) + 1, last_id + 1))
@@ -0,0 +1,45 @@
+"""
+数据库修改检测
+用 PRAGMA data_version 判断数据库自上次检查以来是否有新的提交。
+"""
+
+class DataVersion:
+    """检测数据库是否被其他连接修改
+
+    同一连接上读取的 data_version 在其他连接提交修改后会变化，本连接自己的修改不会改变它。
+    这里为此单独保持一个只读取该值的连接，因此命令行、导入、其他程序实例，
+    以及本进程中其他连接（包括控制器自己的会话）的提交都会被检测到。
+    """
+
+    def __init__(self):
+        """初始化检测器（首次检查时才建立连接）"""
+        self._connection = None
+        self._version = None
+
+    def changed(self, bind) -> bool:
+        """数据库自上次调用以来是否有新的提交
+
+        Args:
+            bind: 数据库引擎或连接（取其引擎建立检测用的连接）
+
+        Returns:
+            有新的提交时返回True，首次调用总是返回True
+        """
+        if self._connection is None:
+            self._connection = getattr(bind, "engine", bind).raw_connection()
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute("PRAGMA data_version")
+            version = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+        changed = version != self._version
+        self._version = version
+        return changed
+
+    def close(self):
+        """关闭检测用的连接"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._version = None
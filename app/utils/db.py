@@ -1,35 +1,35 @@
 from pathlib import Path
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.models.base import Base
+from app.models.base import Base, create_sqlite_engine
+from app.utils.db_config import load_db_path
 
-def init_database(db_path=None):
+def init_database(db_path=None, profile=None):
     """初始化数据库
     
     Args:
-        db_path: 数据库路径，如果为None则使用默认路径
+        db_path: 数据库路径，如果为None则使用配置中的路径
+        profile: SQLite 性能配置，如果为None则从配置文件/环境变量加载
         
     Returns:
         数据库会话工厂
     """
     if db_path is None:
-        # 默认在项目根目录的data文件夹下创建数据库
-        current_dir = Path(__file__).resolve().parent.parent.parent
-        db_path = current_dir / "data" / "tasks.db"
+        # 默认使用配置中的路径（项目根目录的data文件夹下）
+        db_path = load_db_path()
+    db_path = Path(db_path)
     
     # 确保数据目录存在
-    db_path.parent.mkdir(exist_ok=True)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
     
     # 创建数据库引擎
-    engine = create_engine(
-        f"sqlite:///{db_path}", 
-        echo=False, 
-        connect_args={"check_same_thread": False}
-    )
+    engine = create_sqlite_engine(db_path, profile)
     
-    # 创建表
-    Base.metadata.create_all(engine)
+    # 创建表并升级到最新结构
+    from app.utils.migrate_db import is_schema_current, migrate_database
+    if not is_schema_current(db_path):
+        Base.metadata.create_all(engine)
+        migrate_database(db_path, verbose=False)
     
     # 创建会话工厂
     Session = sessionmaker(bind=engine)
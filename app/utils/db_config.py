@@ -0,0 +1,129 @@
+"""
+数据库配置
+SQLite 连接参数（PRAGMA 配置）和数据库路径的加载，
+优先级：环境变量 > 配置文件 > 默认值
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+# 项目根目录
+CURRENT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# 默认数据库路径与配置文件路径
+DEFAULT_DB_PATH = CURRENT_DIR / "data" / "tasks.db"
+DEFAULT_CONFIG_PATH = CURRENT_DIR / "data" / "config.json"
+
+# 环境变量名
+ENV_CONFIG_PATH = "TASKMOMENT_CONFIG"
+ENV_DB_PATH = "TASKMOMENT_DB_PATH"
+ENV_PREFIX = "TASKMOMENT_SQLITE_"
+ENV_SQL_STATS = "TASKMOMENT_SQL_STATS"
+
+# 各 PRAGMA 允许的取值
+_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+
+class SqliteProfile(NamedTuple):
+    """SQLite 性能配置，每个字段对应一条 PRAGMA"""
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -20000  # 负数表示 KiB，约 20MB
+    mmap_size: int = 256 * 1024 * 1024
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000  # 毫秒
+
+    def pragma_statements(self) -> List[str]:
+        """返回应用该配置的 PRAGMA 语句列表
+
+        外键约束始终开启，不可配置：task_tags 的关联行依赖 ON DELETE CASCADE 删除。
+        """
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA busy_timeout = {self.busy_timeout}",
+            "PRAGMA foreign_keys = ON",
+        ]
+
+def _coerce(field: str, value: Any) -> Any:
+    """把配置值转换为字段类型并校验
+
+    Args:
+        field: 字段名
+        value: 原始值（配置文件中的值或环境变量字符串）
+
+    Returns:
+        转换后的值
+
+    Raises:
+        ValueError: 取值不合法
+    """
+    default = SqliteProfile._field_defaults[field]
+    if isinstance(default, int):
+        return int(value)
+    value = str(value).strip().upper()
+    if value not in _CHOICES[field]:
+        raise ValueError(f"{field} 的取值无效: {value}")
+    return value
+
+def _read_config_file(config_path: Optional[Path] = None) -> Dict[str, Any]:
+    """读取 JSON 配置文件，文件不存在时返回空字典"""
+    if config_path is None:
+        config_path = Path(os.environ.get(ENV_CONFIG_PATH, DEFAULT_CONFIG_PATH))
+    if not Path(config_path).exists():
+        return {}
+    with open(config_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def load_profile(config_path: Optional[Path] = None, environ=None) -> SqliteProfile:
+    """加载 SQLite 性能配置
+
+    配置文件中 "sqlite" 节点下的字段覆盖默认值，
+    TASKMOMENT_SQLITE_<字段名> 环境变量再覆盖配置文件。
+
+    Args:
+        config_path: 配置文件路径，为None时使用 TASKMOMENT_CONFIG 或 data/config.json
+        environ: 环境变量字典，默认为 os.environ
+
+    Returns:
+        SqliteProfile
+    """
+    environ = os.environ if environ is None else environ
+    overrides = {}
+    for field, value in _read_config_file(config_path).get("sqlite", {}).items():
+        if field in SqliteProfile._fields:
+            overrides[field] = _coerce(field, value)
+    for field in SqliteProfile._fields:
+        value = environ.get(ENV_PREFIX + field.upper())
+        if value is not None:
+            overrides[field] = _coerce(field, value)
+    return SqliteProfile()._replace(**overrides)
+
+def load_db_path(config_path: Optional[Path] = None, environ=None) -> Path:
+    """获取数据库路径
+
+    Args:
+        config_path: 配置文件路径
+        environ: 环境变量字典，默认为 os.environ
+
+    Returns:
+        数据库文件路径
+    """
+    environ = os.environ if environ is None else environ
+    if environ.get(ENV_DB_PATH):
+        return Path(environ[ENV_DB_PATH])
+    db_path = _read_config_file(config_path).get("db_path")
+    return Path(db_path) if db_path else DEFAULT_DB_PATH
+
+def sql_stats_enabled(environ=None) -> bool:
+    """是否通过环境变量启用了 SQL 统计（TASKMOMENT_SQL_STATS=1）"""
+    environ = os.environ if environ is None else environ
+    return environ.get(ENV_SQL_STATS, "").strip().lower() in ("1", "true", "yes", "on")
@@ -0,0 +1,261 @@
+"""
+任务导出
+把全部任务流式导出为 CSV、JSONL 或 iCalendar（VTODO），可选 gzip 压缩。
+
+任务和标签由一条查询读出：标签通过相关子查询聚合为 JSON 数组，
+结果用服务端游标按批读取并逐行写出，内存占用与任务数量无关。
+导出先写入临时文件，完成后再替换目标文件，中途失败不会留下不完整的文件。
+CSV 和 JSONL 的字段与导入格式一致，导出的文件可以直接重新导入。
+"""
+
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, TextIO
+
+from sqlalchemy import func, select
+
+from app.controllers.task_controller import TaskRow
+from app.models.base import engine, task_tags
+from app.models.tag import Tag
+from app.models.task import Priority, Task
+
+# 文件扩展名对应的格式（.gz 后缀表示压缩，判断格式时忽略）
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".ics": "ics"}
+
+# 服务端游标每批读取的行数
+EXPORT_BATCH_SIZE = 1000
+
+# 每写出多少行报告一次进度
+PROGRESS_INTERVAL = 10000
+
+# 与导入格式一致的字段
+CSV_FIELDS = ("id", "title", "due_date", "priority", "tags", "completed", "created_at")
+
+# iCalendar 优先级：1 最高，9 最低，0 表示未定义
+ICS_PRIORITIES = {
+    Priority.NONE: 0,
+    Priority.LOW: 9,
+    Priority.MEDIUM: 5,
+    Priority.HIGH: 1,
+}
+
+# iCalendar 内容行的最大字节数（不含换行）
+ICS_LINE_LIMIT = 75
+
+def export_query():
+    """导出使用的查询：任务列和 JSON 数组形式的标签名称，按任务ID排序"""
+    tag_names = (
+        select(func.json_group_array(Tag.tag))
+        .select_from(task_tags.join(Tag, Tag.id == task_tags.c.tag_id))
+        .where(task_tags.c.task_id == Task.id)
+        .scalar_subquery()
+    )
+    return select(
+        Task.id, Task.title, Task.completed, Task.due_date, Task.priority, Task.created_at,
+        tag_names.label("tags"),
+    ).order_by(Task.id)
+
+def iter_tasks(bind=None, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[TaskRow]:
+    """流式读取全部任务
+
+    Args:
+        bind: 数据库引擎，默认为全局引擎
+        batch_size: 每批读取的行数
+
+    Yields:
+        TaskRow，标签按名称排序
+    """
+    with (bind or engine).connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(export_query())
+        for row in result:
+            yield TaskRow(
+                id=row.id,
+                title=row.title,
+                completed=bool(row.completed),
+                due_date=row.due_date,
+                priority=row.priority,
+                created_at=row.created_at,
+                tags=tuple(sorted(json.loads(row.tags))),
+            )
+
+def _priority_name(priority: int) -> str:
+    """优先级的导出写法（英文名称小写）"""
+    try:
+        return Priority(priority).name.lower()
+    except ValueError:
+        return Priority.NONE.name.lower()
+
+def _isoformat(value) -> str:
+    """日期/时间转换为 ISO 字符串，None 为空字符串"""
+    return value.isoformat() if value is not None else ""
+
+def _write_csv(rows: Iterator[TaskRow], out: TextIO) -> Iterator[None]:
+    """写出 CSV：标签以空格分隔，完成状态为 1/0"""
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    for row in rows:
+        writer.writerow((
+            row.id,
+            row.title,
+            _isoformat(row.due_date),
+            _priority_name(row.priority),
+            " ".join(row.tags),
+            int(row.completed),
+            _isoformat(row.created_at),
+        ))
+        yield
+
+def _write_jsonl(rows: Iterator[TaskRow], out: TextIO) -> Iterator[None]:
+    """写出 JSONL：每行一个任务对象"""
+    for row in rows:
+        out.write(json.dumps({
+            "id": row.id,
+            "title": row.title,
+            "due_date": row.due_date.isoformat() if row.due_date else None,
+            "priority": _priority_name(row.priority),
+            "tags": list(row.tags),
+            "completed": row.completed,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }, ensure_ascii=False))
+        out.write("\n")
+        yield
+
+def _ics_escape(text: str) -> str:
+    """转义 iCalendar 文本值中的特殊字符"""
+    return (
+        text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+def _ics_line(line: str) -> str:
+    """按 RFC 5545 折行：每行不超过 75 字节，续行以空格开头，不拆开多字节字符"""
+    parts = []
+    current = ""
+    size = 0
+    for char in line:
+        width = len(char.encode("utf-8"))
+        # 续行开头的空格占一个字节
+        limit = ICS_LINE_LIMIT if not parts else ICS_LINE_LIMIT - 1
+        if size + width > limit:
+            parts.append(current)
+            current, size = "", 0
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+def _ics_datetime(value: datetime) -> str:
+    """UTC 时间的 iCalendar 写法"""
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+def _write_ics(rows: Iterator[TaskRow], out: TextIO) -> Iterator[None]:
+    """写出 iCalendar：每个任务一个 VTODO"""
+    stamp = _ics_datetime(datetime.utcnow())
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//TaskMoment//TaskMoment//ZH", "CALSCALE:GREGORIAN"):
+        out.write(_ics_line(line))
+    for row in rows:
+        lines = [
+            "BEGIN:VTODO",
+            f"UID:task-{row.id}@taskmoment",
+            f"DTSTAMP:{stamp}",
+        ]
+        if row.created_at is not None:
+            # created_at 保存的是 UTC 时间
+            lines.append(f"CREATED:{_ics_datetime(row.created_at)}")
+        lines.append(f"SUMMARY:{_ics_escape(row.title)}")
+        if row.due_date is not None:
+            lines.append(f"DUE;VALUE=DATE:{row.due_date.strftime('%Y%m%d')}")
+        if ICS_PRIORITIES.get(row.priority):
+            lines.append(f"PRIORITY:{ICS_PRIORITIES[row.priority]}")
+        if row.tags:
+            lines.append("CATEGORIES:" + ",".join(_ics_escape(tag) for tag in row.tags))
+        lines.append("STATUS:COMPLETED" if row.completed else "STATUS:NEEDS-ACTION")
+        lines.append("END:VTODO")
+        out.write("".join(_ics_line(line) for line in lines))
+        yield
+    out.write(_ics_line("END:VCALENDAR"))
+
+# 各格式的写出函数：逐行写出，每写完一个任务 yield 一次用于统计进度
+_WRITERS: Dict[str, Callable[[Iterator[TaskRow], TextIO], Iterator[None]]] = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "ics": _write_ics,
+}
+
+def detect_export_format(path) -> str:
+    """根据扩展名判断导出格式（忽略 .gz 后缀）
+
+    Raises:
+        ValueError: 不支持的扩展名
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        suffix = Path(path.stem).suffix.lower()
+    fmt = EXPORT_FORMATS.get(suffix)
+    if fmt is None:
+        raise ValueError(f"无法识别的导出格式: {path}（支持 {', '.join(EXPORT_FORMATS)}，可加 .gz）")
+    return fmt
+
+def write_tasks(out: TextIO, fmt: str, bind=None,
+                progress: Optional[Callable[[int], None]] = None) -> int:
+    """把全部任务写入已打开的文本流
+
+    Args:
+        out: 文本输出流（CSV 需以 newline="" 打开）
+        fmt: "csv"、"jsonl" 或 "ics"
+        bind: 数据库引擎，默认为全局引擎
+        progress: 每写出 PROGRESS_INTERVAL 个任务调用一次，参数为已写出的任务数
+
+    Returns:
+        写出的任务数
+    """
+    writer = _WRITERS.get(fmt)
+    if writer is None:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    count = 0
+    for _ in writer(iter_tasks(bind), out):
+        count += 1
+        if progress is not None and count % PROGRESS_INTERVAL == 0:
+            progress(count)
+    return count
+
+def export_tasks(path, fmt: Optional[str] = None, compress: Optional[bool] = None, bind=None,
+                 progress: Optional[Callable[[int], None]] = None) -> int:
+    """导出全部任务到文件
+
+    Args:
+        path: 输出文件路径
+        fmt: "csv"、"jsonl" 或 "ics"，为None时根据扩展名判断
+        compress: 是否 gzip 压缩，为None时按扩展名是否为 .gz 判断
+        bind: 数据库引擎，默认为全局引擎
+        progress: 进度回调，参数为已写出的任务数
+
+    Returns:
+        导出的任务数
+    """
+    path = Path(path)
+    fmt = fmt or detect_export_format(path)
+    if compress is None:
+        compress = path.suffix.lower() == ".gz"
+
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        if compress:
+            out = gzip.open(temp_path, "wt", encoding="utf-8", newline="")
+        else:
+            out = open(temp_path, "w", encoding="utf-8", newline="")
+        with out:
+            count = write_tasks(out, fmt, bind, progress)
+        os.replace(temp_path, path)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+    if progress is not None and count % PROGRESS_INTERVAL:
+        progress(count)
+    return count
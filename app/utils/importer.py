@@ -0,0 +1,413 @@
+"""
+批量导入
+从 CSV 或 JSONL 文件流式导入任务（标题、截止日期、优先级、标签、完成状态）。
+
+- 流式读取：按块读取原始记录，内存占用与文件大小无关
+- 并行解析：解析和校验在进程池中进行，最多领先写入若干块
+- 单一写入者：每块在一个事务中用 executemany 插入任务，
+  标签用一次批量 INSERT OR IGNORE 创建并查回ID，断点记录与数据一起提交
+- 断点续传：中断后再次导入同一文件，从最后提交的块之后继续
+
+CSV 文件的表头为 title,due_date,priority,tags,completed（除 title 外均可省略），
+JSONL 文件每行一个对象，字段名相同，tags 可以是字符串或字符串数组。
+导入直接写数据库，不经过控制器，正在运行的界面需要重新加载才能看到新任务。
+"""
+
+import csv
+import itertools
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.models.base import engine, task_tags
+from app.models.import_checkpoint import ImportCheckpoint
+from app.models.tag import Tag
+from app.models.task import LEGACY_NO_DUE_DATE, PRIORITY_NAMES, Priority, Task
+from app.utils.bulk import chunked, insert_returning_ids
+
+# 文件扩展名对应的格式
+SUPPORTED_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# 每块的记录数（每块一个事务）
+DEFAULT_CHUNK_SIZE = 2000
+
+# 默认最多使用的解析进程数
+DEFAULT_MAX_WORKERS = 4
+
+# 每个解析进程最多领先写入的块数，限制已解析未写入的数据量
+_PENDING_CHUNKS_PER_WORKER = 2
+
+# 结果中最多保留的错误记录数（失败总数仍全部计入）
+MAX_REPORTED_ERRORS = 100
+
+# 与模型定义一致的长度限制
+TITLE_MAX_LENGTH = Task.title.type.length
+TAG_MAX_LENGTH = Tag.tag.type.length
+
+# 优先级的写法：英文名称、中文名称或数字
+_PRIORITY_VALUES = {
+    **{priority.name.lower(): priority for priority in Priority},
+    **{name: priority for priority, name in PRIORITY_NAMES.items()},
+    **{str(int(priority)): priority for priority in Priority},
+}
+
+# 完成状态的写法
+_TRUE_VALUES = {"1", "true", "yes", "y", "x", "是", "已完成"}
+_FALSE_VALUES = {"", "0", "false", "no", "n", "否", "未完成"}
+
+# CSV 中多个标签之间的分隔符
+_TAG_SEPARATORS = re.compile(r"[\s,;，；]+")
+
+class ImportRow(NamedTuple):
+    """校验通过的一条记录"""
+    title: str
+    due_date: Optional[date]
+    priority: int
+    completed: bool
+    tags: Tuple[str, ...]
+
+class RecordError(NamedTuple):
+    """校验失败的记录"""
+    record: int  # 记录序号，从1开始（CSV 不含表头，JSONL 不含空行）
+    message: str
+
+class ImportProgress(NamedTuple):
+    """导入进度（累计值，包含之前中断的导入）"""
+    records: int
+    imported: int
+    failed: int
+    elapsed: float  # 本次导入已用秒数
+
+class ImportResult(NamedTuple):
+    """导入结果"""
+    records: int  # 累计处理的记录数
+    imported: int  # 累计导入的任务数
+    failed: int  # 累计校验失败的记录数
+    resumed_from: int  # 本次从第几条记录之后继续，0 表示从头导入
+    errors: List[RecordError]  # 本次导入中校验失败的记录（最多 MAX_REPORTED_ERRORS 条）
+
+def detect_format(path) -> str:
+    """根据扩展名判断文件格式
+
+    Raises:
+        ValueError: 不支持的扩展名
+    """
+    fmt = SUPPORTED_FORMATS.get(Path(path).suffix.lower())
+    if fmt is None:
+        raise ValueError(f"无法识别的文件格式: {path}（支持 {', '.join(SUPPORTED_FORMATS)}）")
+    return fmt
+
+def _text(value: Any) -> str:
+    """把字段值转换为去掉首尾空白的字符串，None 视为空字符串"""
+    return "" if value is None else str(value).strip()
+
+def _parse_due_date(value: Any) -> Optional[date]:
+    """解析截止日期，接受 yyyy-MM-dd 或以其开头的 ISO 时间"""
+    text = _text(value)
+    if not text:
+        return None
+    try:
+        due_date = date.fromisoformat(text[:10])
+    except ValueError:
+        raise ValueError(f"无效的截止日期: {text}")
+    return None if due_date == LEGACY_NO_DUE_DATE else due_date
+
+def _parse_priority(value: Any) -> int:
+    """解析优先级"""
+    text = _text(value).lower()
+    if not text:
+        return Priority.NONE
+    try:
+        return int(_PRIORITY_VALUES[text])
+    except KeyError:
+        raise ValueError(f"无效的优先级: {text}")
+
+def _parse_completed(value: Any) -> bool:
+    """解析完成状态"""
+    if isinstance(value, bool):
+        return value
+    text = _text(value).lower()
+    if text in _TRUE_VALUES:
+        return True
+    if text in _FALSE_VALUES:
+        return False
+    raise ValueError(f"无效的完成状态: {text}")
+
+def _parse_tags(value: Any) -> Tuple[str, ...]:
+    """解析标签：字符串按空白、逗号或分号分隔，数组逐项处理；去掉 # 前缀并去重"""
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        names = _TAG_SEPARATORS.split(value)
+    elif isinstance(value, list):
+        names = [_text(item) for item in value]
+    else:
+        raise ValueError(f"无效的标签: {value!r}")
+    tags = []
+    for name in names:
+        name = name.lstrip("#").strip()
+        if not name:
+            continue
+        if len(name) > TAG_MAX_LENGTH:
+            raise ValueError(f"标签过长（最多 {TAG_MAX_LENGTH} 个字符）: {name}")
+        tags.append(name)
+    return tuple(dict.fromkeys(tags))
+
+def parse_record(record: Dict[str, Any]) -> ImportRow:
+    """校验并规范化一条记录
+
+    Args:
+        record: 字段名到值的映射
+
+    Returns:
+        规范化后的记录
+
+    Raises:
+        ValueError: 记录无效
+    """
+    title = _text(record.get("title"))
+    if not title:
+        raise ValueError("标题不能为空")
+    if len(title) > TITLE_MAX_LENGTH:
+        raise ValueError(f"标题过长（最多 {TITLE_MAX_LENGTH} 个字符）")
+    return ImportRow(
+        title=title,
+        due_date=_parse_due_date(record.get("due_date")),
+        priority=_parse_priority(record.get("priority")),
+        completed=_parse_completed(record.get("completed")),
+        tags=_parse_tags(record.get("tags")),
+    )
+
+def parse_chunk(fmt: str, start: int, raw_records: List[Any]) -> Tuple[List[ImportRow], List[RecordError]]:
+    """解析一块原始记录（在解析进程中执行）
+
+    Args:
+        fmt: "csv" 或 "jsonl"
+        start: 本块之前的记录数
+        raw_records: CSV 为字段字典，JSONL 为一行文本
+
+    Returns:
+        (校验通过的记录, 校验失败的记录)
+    """
+    rows: List[ImportRow] = []
+    errors: List[RecordError] = []
+    for offset, raw in enumerate(raw_records, start + 1):
+        try:
+            if fmt == "jsonl":
+                try:
+                    raw = json.loads(raw)
+                except ValueError as e:
+                    raise ValueError(f"无效的 JSON: {e}")
+                if not isinstance(raw, dict):
+                    raise ValueError("每行必须是一个 JSON 对象")
+            rows.append(parse_record(raw))
+        except ValueError as e:
+            errors.append(RecordError(offset, str(e)))
+    return rows, errors
+
+def read_raw_records(path, fmt: str) -> Iterator[Any]:
+    """流式读取原始记录（不做解析和校验）
+
+    Args:
+        path: 文件路径
+        fmt: "csv" 或 "jsonl"
+    """
+    if fmt == "csv":
+        # utf-8-sig：兼容 Excel 导出的带 BOM 文件
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None or "title" not in [_text(name) for name in reader.fieldnames]:
+                raise ValueError("CSV 文件缺少 title 列")
+            for row in reader:
+                yield {_text(key): value for key, value in row.items() if key is not None}
+    elif fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+    else:
+        raise ValueError(f"不支持的格式: {fmt}")
+
+def _raw_chunks(records: Iterable[Any], chunk_size: int, skip: int) -> Iterator[Tuple[int, List[Any]]]:
+    """跳过已导入的记录后按块切分
+
+    Yields:
+        (本块之前的记录数, 本块原始记录)
+    """
+    records = iter(records)
+    start = sum(1 for _ in itertools.islice(records, skip))
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+class TaskImporter:
+    """任务批量导入器"""
+
+    def __init__(self, bind=None, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: Optional[int] = None):
+        """初始化导入器
+
+        Args:
+            bind: 数据库引擎，默认为全局引擎
+            chunk_size: 每块的记录数
+            workers: 解析进程数，默认为 CPU 核数（最多 DEFAULT_MAX_WORKERS 个）；1 表示在当前进程中解析
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size 必须大于0")
+        self.engine = bind or engine
+        self.chunk_size = chunk_size
+        self.workers = workers or min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS)
+
+    @staticmethod
+    def source_key(path) -> str:
+        """断点记录中标识导入文件的键（绝对路径）"""
+        return os.path.realpath(path)
+
+    def get_checkpoint(self, path) -> Optional[Tuple[int, int, int]]:
+        """读取文件的断点
+
+        Returns:
+            (已处理记录数, 已导入任务数, 校验失败数)，没有断点时返回None
+        """
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(ImportCheckpoint.records, ImportCheckpoint.imported, ImportCheckpoint.failed)
+                .where(ImportCheckpoint.source == self.source_key(path))
+            ).first()
+        return tuple(row) if row is not None else None
+
+    def clear_checkpoint(self, path):
+        """删除文件的断点，下次从头导入"""
+        with self.engine.begin() as conn:
+            conn.execute(ImportCheckpoint.__table__.delete().where(ImportCheckpoint.source == self.source_key(path)))
+
+    def run(self, path, fmt: Optional[str] = None,
+            progress: Optional[Callable[[ImportProgress], None]] = None,
+            restart: bool = False) -> ImportResult:
+        """导入文件
+
+        已完整导入过的文件再次导入时不会重复插入（没有新记录），需要重新导入时传 restart=True。
+
+        Args:
+            path: 文件路径
+            fmt: "csv" 或 "jsonl"，为None时根据扩展名判断
+            progress: 每提交一块后调用，参数为 ImportProgress
+            restart: 忽略断点，从第一条记录开始
+
+        Returns:
+            导入结果
+        """
+        fmt = fmt or detect_format(path)
+        source = self.source_key(path)
+        if restart:
+            self.clear_checkpoint(path)
+        records, imported, failed = self.get_checkpoint(path) or (0, 0, 0)
+        resumed_from = records
+        errors: List[RecordError] = []
+        started = time.perf_counter()
+
+        chunks = _raw_chunks(read_raw_records(path, fmt), self.chunk_size, records)
+        for start, size, rows, chunk_errors in self._parse_chunks(fmt, chunks):
+            records = start + size
+            imported += len(rows)
+            failed += len(chunk_errors)
+            with self.engine.begin() as conn:
+                self._write_chunk(conn, rows)
+                self._save_checkpoint(conn, source, records, imported, failed)
+            errors.extend(chunk_errors[:MAX_REPORTED_ERRORS - len(errors)])
+            if progress is not None:
+                progress(ImportProgress(records, imported, failed, time.perf_counter() - started))
+
+        return ImportResult(records, imported, failed, resumed_from, errors)
+
+    def _parse_chunks(self, fmt: str, chunks: Iterator[Tuple[int, List[Any]]]
+                      ) -> Iterator[Tuple[int, int, List[ImportRow], List[RecordError]]]:
+        """按原顺序返回解析结果，有多块数据时在进程池中解析
+
+        Yields:
+            (本块之前的记录数, 本块记录数, 校验通过的记录, 校验失败的记录)
+        """
+        first = next(chunks, None)
+        if first is None:
+            return
+        second = next(chunks, None)
+        if second is None or self.workers <= 1:
+            # 只有一块（或不使用进程池）时，启动进程的开销大于并行的收益
+            for start, raw in itertools.chain([first], [second] if second else [], chunks):
+                yield (start, len(raw)) + parse_chunk(fmt, start, raw)
+            return
+
+        max_pending = self.workers * _PENDING_CHUNKS_PER_WORKER
+        pending: Deque = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                for start, raw in itertools.chain([first, second], chunks):
+                    pending.append((start, len(raw), pool.submit(parse_chunk, fmt, start, raw)))
+                    if len(pending) >= max_pending:
+                        start, size, future = pending.popleft()
+                        yield (start, size) + future.result()
+                while pending:
+                    start, size, future = pending.popleft()
+                    yield (start, size) + future.result()
+            finally:
+                # 写入失败或调用方提前停止时，不再解析剩余的块
+                for _, _, future in pending:
+                    future.cancel()
+
+    def _write_chunk(self, conn, rows: List[ImportRow]):
+        """在当前事务中写入一块记录"""
+        if not rows:
+            return
+        tag_ids = self._resolve_tags(conn, {name for row in rows for name in row.tags})
+        now = datetime.utcnow()
+        task_ids = insert_returning_ids(conn, Task, [
+            {
+                "title": row.title,
+                "due_date": row.due_date,
+                "priority": row.priority,
+                "completed": row.completed,
+                "created_at": now,
+            }
+            for row in rows
+        ])
+        links = [
+            {"task_id": task_id, "tag_id": tag_ids[name]}
+            for task_id, row in zip(task_ids, rows)
+            for name in row.tags
+        ]
+        if links:
+            conn.execute(insert(task_tags), links)
+
+    @staticmethod
+    def _resolve_tags(conn, names) -> Dict[str, int]:
+        """批量创建不存在的标签，返回 {名称: ID}"""
+        if not names:
+            return {}
+        names = sorted(names)
+        conn.execute(insert(Tag).prefix_with("OR IGNORE"), [{"tag": name} for name in names])
+        tag_ids = {}
+        for chunk in chunked(names):
+            for name, tag_id in conn.execute(select(Tag.tag, Tag.id).where(Tag.tag.in_(chunk))):
+                tag_ids[name] = tag_id
+        return tag_ids
+
+    @staticmethod
+    def _save_checkpoint(conn, source: str, records: int, imported: int, failed: int):
+        """在当前事务中更新断点"""
+        values = {"records": records, "imported": imported, "failed": failed, "updated_at": datetime.utcnow()}
+        conn.execute(
+            sqlite_insert(ImportCheckpoint)
+            .values(source=source, **values)
+            .on_conflict_do_update(index_elements=[ImportCheckpoint.source], set_=values)
+        )
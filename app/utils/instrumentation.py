@@ -0,0 +1,357 @@
+"""
+SQL 统计
+按需启用的查询统计：监听引擎的 before_cursor_execute / after_cursor_execute 事件，
+把每条语句的次数、返回行数和耗时归到正在执行的 TaskController / TagController 方法上
+（方法内部再调用其他控制器方法时，归到最外层的方法），
+并检测同一次调用中重复执行的相同形状语句（N+1 查询）。
+
+启用方式：
+- 设置环境变量 TASKMOMENT_SQL_STATS=1，程序退出时把统计打印到标准错误输出
+- 代码中调用 install()，之后用 get_instrumentation().report() 随时查看
+
+query_budget 不依赖 install()，可以直接用来断言一段代码的查询次数。
+"""
+
+import atexit
+import functools
+import re
+import sys
+import threading
+import time
+import types
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.controllers.tag_controller import TagController
+from app.controllers.task_controller import TaskController
+from app.models.base import engine
+
+# 同一次调用中相同形状的语句执行达到该次数时视为 N+1
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+# 不在任何控制器方法中执行的语句归到这个名称下
+UNATTRIBUTED = "<other>"
+
+# 报告中每个操作最多列出的可疑语句数
+_MAX_SUSPECTS = 3
+
+# 语句形状：合并空白，把字面量和 IN 列表替换为占位符
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+def statement_shape(statement: str) -> str:
+    """语句的形状：参数或 IN 列表长度不同的同一条语句形状相同"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _VALUE_LIST.sub("(?)", shape)
+
+class _CallRecord:
+    """一次控制器方法调用期间的统计"""
+
+    __slots__ = ("name", "queries", "rows", "sql_seconds", "shapes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.queries = 0
+        self.rows = 0
+        self.sql_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+class OperationStats:
+    """一个操作（控制器方法）的累计统计"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.queries = 0
+        self.rows = 0
+        self.seconds = 0.0  # 方法总耗时（含 Python 处理）
+        self.sql_seconds = 0.0  # 其中执行 SQL 的耗时
+        self.max_queries = 0  # 单次调用最多的查询数
+        self.n_plus_one_calls = 0  # 出现 N+1 的调用次数
+        self.suspects: Dict[str, int] = {}  # {语句形状: 单次调用中最多的执行次数}
+
+    def __repr__(self):
+        return f"<OperationStats {self.name}: {self.calls} 次调用, {self.queries} 条查询>"
+
+class _CountingCursor:
+    """统计读取行数的游标代理，其余属性直接转发给原游标"""
+
+    __slots__ = ("_cursor", "_record")
+
+    def __init__(self, cursor, record: _CallRecord):
+        self._cursor = cursor
+        self._record = record
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._record.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rows = self._cursor.fetchmany(*args)
+        self._record.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._record.rows += len(rows)
+        return rows
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._record.rows += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+# 当前上下文中正在执行的最外层控制器调用（每个线程、每个协程独立）
+_current_call: ContextVar[Optional[_CallRecord]] = ContextVar("taskmoment_sql_call", default=None)
+
+class Instrumentation:
+    """查询统计：引擎事件监听 + 控制器方法包装"""
+
+    def __init__(self, n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD):
+        """初始化统计
+
+        Args:
+            n_plus_one_threshold: 单次调用中同一形状语句执行达到该次数时记为 N+1
+        """
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._lock = threading.Lock()
+        self._stats: Dict[str, OperationStats] = {}
+        self._engines: List = []
+        # {(类, 方法名): 原方法}
+        self._originals: Dict[Tuple[type, str], types.FunctionType] = {}
+
+    def attach(self, bind):
+        """开始统计该引擎上执行的语句（可多次调用以统计多个引擎）"""
+        if bind in self._engines:
+            return
+        event.listen(bind, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(bind, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(bind)
+
+    def wrap_controllers(self, *classes: type):
+        """包装控制器类的公开方法，把方法内执行的语句归到该方法上"""
+        for cls in classes:
+            for name, func in list(vars(cls).items()):
+                if name.startswith("_") or not isinstance(func, types.FunctionType):
+                    continue
+                self._originals[(cls, name)] = func
+                setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", func))
+
+    def _wrap(self, operation: str, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_call.get() is not None:
+                # 嵌套调用归到外层方法
+                return func(*args, **kwargs)
+            with self.operation(operation):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def detach(self):
+        """移除所有事件监听并还原控制器方法（已收集的统计保留）"""
+        for bind in self._engines:
+            event.remove(bind, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(bind, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.clear()
+        for (cls, name), func in self._originals.items():
+            setattr(cls, name, func)
+        self._originals.clear()
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[_CallRecord]:
+        """把代码块中执行的语句归到指定操作上（用于控制器之外的代码，如视图的加载函数）"""
+        record = _CallRecord(name)
+        token = _current_call.set(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            _current_call.reset(token)
+            self._finish(record, time.perf_counter() - started)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("taskmoment_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["taskmoment_query_start"].pop()
+        record = _current_call.get()
+        unattributed = record is None
+        if unattributed:
+            record = _CallRecord(UNATTRIBUTED)
+
+        record.queries += 1
+        record.sql_seconds += elapsed
+        record.shapes[statement_shape(statement)] += 1
+        if cursor.description is None:
+            # 写语句：使用受影响的行数
+            record.rows += max(cursor.rowcount, 0)
+        elif context is not None and context.cursor is cursor:
+            # 查询：替换结果读取使用的游标，统计实际读取的行数
+            context.cursor = _CountingCursor(cursor, record)
+
+        if unattributed:
+            self._finish(record, elapsed)
+
+    def _finish(self, record: _CallRecord, seconds: float):
+        """把一次调用的统计合并到累计统计中"""
+        with self._lock:
+            stats = self._stats.get(record.name)
+            if stats is None:
+                stats = self._stats[record.name] = OperationStats(record.name)
+            stats.calls += 1
+            stats.queries += record.queries
+            stats.rows += record.rows
+            stats.seconds += seconds
+            stats.sql_seconds += record.sql_seconds
+            stats.max_queries = max(stats.max_queries, record.queries)
+            if record.name == UNATTRIBUTED:
+                return
+            repeated = {
+                shape: count for shape, count in record.shapes.items()
+                if count >= self.n_plus_one_threshold
+            }
+            if repeated:
+                stats.n_plus_one_calls += 1
+                for shape, count in repeated.items():
+                    stats.suspects[shape] = max(stats.suspects.get(shape, 0), count)
+
+    def stats(self) -> Dict[str, OperationStats]:
+        """返回累计统计的快照 {操作名: OperationStats}"""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self):
+        """清空累计统计"""
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> str:
+        """格式化统计报告（按 SQL 总耗时从高到低排序）"""
+        stats = sorted(self.stats().values(), key=lambda s: s.sql_seconds, reverse=True)
+        if not stats:
+            return "SQL 统计: 没有执行任何语句"
+        width = max([len(s.name) for s in stats] + [len("operation")])
+        lines = [
+            "SQL 统计:",
+            f"{'operation':<{width}}  {'calls':>6}  {'queries':>7}  {'max':>5}  {'rows':>9}  {'sql ms':>9}  {'total ms':>9}",
+        ]
+        for s in stats:
+            total = f"{s.seconds * 1000:>9.1f}" if s.name != UNATTRIBUTED else f"{'-':>9}"
+            lines.append(
+                f"{s.name:<{width}}  {s.calls:>6}  {s.queries:>7}  {s.max_queries:>5}  "
+                f"{s.rows:>9}  {s.sql_seconds * 1000:>9.1f}  {total}"
+            )
+        flagged = [s for s in stats if s.suspects]
+        if flagged:
+            lines.append("")
+            lines.append(f"可能的 N+1 查询（单次调用中同一语句执行 ≥{self.n_plus_one_threshold} 次）:")
+            for s in flagged:
+                lines.append(f"  {s.name}（{s.n_plus_one_calls} 次调用）:")
+                suspects = sorted(s.suspects.items(), key=lambda item: item[1], reverse=True)
+                for shape, count in suspects[:_MAX_SUSPECTS]:
+                    lines.append(f"    最多 {count} 次: {shape[:160]}")
+        return "\n".join(lines)
+
+    def dump(self, file=None):
+        """把统计报告打印到 file（默认标准错误输出）"""
+        print(self.report(), file=file or sys.stderr)
+
+_active: Optional[Instrumentation] = None
+
+def install(bind=None, n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+            dump_at_exit: bool = False) -> Instrumentation:
+    """启用查询统计（已启用时返回现有实例）
+
+    Args:
+        bind: 要统计的引擎，默认为全局引擎
+        n_plus_one_threshold: N+1 判定阈值
+        dump_at_exit: 程序退出时把报告打印到标准错误输出
+
+    Returns:
+        统计实例
+    """
+    global _active
+    if _active is None:
+        _active = Instrumentation(n_plus_one_threshold)
+        _active.wrap_controllers(TaskController, TagController)
+        if dump_at_exit:
+            atexit.register(lambda: _active is not None and _active.dump())
+    _active.attach(bind or engine)
+    return _active
+
+def uninstall():
+    """停止查询统计"""
+    global _active
+    if _active is not None:
+        _active.detach()
+        _active = None
+
+def get_instrumentation() -> Optional[Instrumentation]:
+    """当前的统计实例，未启用时为None"""
+    return _active
+
+class QueryBudgetExceeded(AssertionError):
+    """代码块执行的查询数超过预算"""
+
+class QueryBudget:
+    """query_budget 代码块中执行的语句"""
+
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+        self.statements: List[str] = []
+
+    @property
+    def queries(self) -> int:
+        return len(self.statements)
+
+# 当前上下文中生效的查询预算（可嵌套）
+_active_budgets: ContextVar[Tuple[QueryBudget, ...]] = ContextVar("taskmoment_query_budgets", default=())
+
+@contextmanager
+def query_budget(max_queries: int, bind=None) -> Iterator[QueryBudget]:
+    """断言代码块执行的语句数不超过预算
+
+    只统计当前线程（协程）中执行的语句，其他线程同时使用同一引擎不会计入，
+    因此交给后台线程执行的查询（如界面通过 DbExecutor 加载列表）不在统计范围内。
+
+        with session_scope(), query_budget(2):
+            task_controller.get_task_page()
+
+    Args:
+        max_queries: 允许的最多语句数
+        bind: 统计的引擎，默认为全局引擎
+
+    Raises:
+        QueryBudgetExceeded: 代码块正常结束且语句数超过预算
+    """
+    budget = QueryBudget(max_queries)
+    bind = bind or engine
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if budget in _active_budgets.get():
+            budget.statements.append(statement)
+
+    token = _active_budgets.set(_active_budgets.get() + (budget,))
+    event.listen(bind, "before_cursor_execute", count)
+    try:
+        yield budget
+    finally:
+        event.remove(bind, "before_cursor_execute", count)
+        _active_budgets.reset(token)
+
+    if budget.queries > max_queries:
+        listing = "\n".join(f"  {index}. {statement_shape(sql)[:200]}" for index, sql in enumerate(budget.statements, 1))
+        raise QueryBudgetExceeded(f"执行了 {budget.queries} 条语句，超过预算 {max_queries}:\n{listing}")
@@ -3,41 +3,237 @@
 
 """
 数据库迁移工具
-用于更新数据库结构，添加新字段等
+基于 PRAGMA user_version 的版本化迁移：每个迁移步骤有一个递增的版本号，
+启动时只执行版本号大于数据库当前版本的步骤，每个步骤在独立事务中完成并更新版本号。
 """
 
 import sqlite3
-from pathlib import Path
-
-# 获取数据库路径
-CURRENT_DIR = Path(__file__).resolve().parent.parent.parent
-DB_PATH = CURRENT_DIR / "data" / "tasks.db"
-
-def migrate_database():
-    """执行数据库迁移"""
-    print(f"正在迁移数据库: {DB_PATH}")
-    
-    # 连接数据库
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # 检查task表是否存在priority列
-    cursor.execute("PRAGMA table_info(task)")
-    columns = cursor.fetchall()
-    column_names = [col[1] for col in columns]
-    
-    # 如果不存在priority列，添加它
-    if "priority" not in column_names:
-        print("添加优先级字段...")
-        cursor.execute("ALTER TABLE task ADD COLUMN priority SMALLINT DEFAULT 0 NOT NULL")
-        conn.commit()
-        print("优先级字段添加成功！")
-    else:
-        print("优先级字段已存在，无需迁移")
-    
-    # 关闭连接
-    conn.close()
-    print("数据库迁移完成！")
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.models.base import (
+    Base, DB_PATH, TAG_TASK_COUNT_TRIGGERS, TASK_FTS_TABLE, TASK_FTS_TRIGGERS, TASK_FTS_REBUILD,
+)
+# 导入所有模型，确保建表和建索引时 Base.metadata 中的表是完整的
+from app.models import task, tag, import_checkpoint  # noqa: F401
+
+# 重建表时每批复制的行数
+REBUILD_BATCH_SIZE = 5000
+
+class Migration(NamedTuple):
+    """迁移步骤"""
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+# 按版本号排序的迁移步骤
+MIGRATIONS: List[Migration] = []
+
+def migration(version: int, description: str):
+    """注册迁移步骤的装饰器
+
+    迁移步骤需要是幂等的：新建的数据库已由 create_all 建出最新的表结构，
+    同样会依次执行所有步骤。
+
+    Args:
+        version: 迁移后的版本号，必须大于已注册的所有版本号
+        description: 迁移说明
+    """
+    def decorator(func):
+        if MIGRATIONS and version <= MIGRATIONS[-1].version:
+            raise ValueError(f"迁移版本号必须递增: {version}")
+        MIGRATIONS.append(Migration(version, description, func))
+        return func
+    return decorator
+
+def _column_names(conn, table):
+    """返回表的列名列表"""
+    return [col[1] for col in conn.execute(f"PRAGMA table_info({table})")]
+
+def rebuild_table(conn, table, create_sql, columns, batch_size=REBUILD_BATCH_SIZE):
+    """在当前事务中重建表
+
+    先用新结构建临时表，按 rowid 分批 INSERT ... SELECT 复制数据，
+    再删除旧表并改名。数据在 SQLite 内部复制，不经过 Python 内存。
+    旧表上的索引和触发器会随旧表删除，需要由调用方重新创建。
+
+    Args:
+        conn: 处于事务中的数据库连接
+        table: 表名
+        create_sql: 新表的 CREATE TABLE 语句，表名用 {name} 占位
+        columns: 需要复制的列名列表
+        batch_size: 每批复制的行数
+    """
+    new_table = f"_{table}_new"
+    column_list = ", ".join(columns)
+    copy_sql = f"INSERT INTO {new_table} ({column_list}) SELECT {column_list} FROM {table}"
+
+    conn.execute(f"DROP TABLE IF EXISTS {new_table}")
+    conn.execute(create_sql.format(name=new_table))
+
+    last_rowid = 0
+    while True:
+        # 找出本批最后一行的 rowid
+        row = conn.execute(
+            f"SELECT rowid FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT 1 OFFSET ?",
+            (last_rowid, batch_size - 1),
+        ).fetchone()
+        if row is None:
+            conn.execute(f"{copy_sql} WHERE rowid > ?", (last_rowid,))
+            break
+        conn.execute(f"{copy_sql} WHERE rowid > ? AND rowid <= ?", (last_rowid, row[0]))
+        last_rowid = row[0]
+
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+def create_declared_indexes(conn):
+    """创建模型中声明的索引（已存在时跳过）"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            ddl = CreateIndex(index, if_not_exists=True).compile(dialect=sqlite.dialect())
+            conn.execute(str(ddl))
+
+@migration(1, "添加任务优先级字段")
+def _add_task_priority(conn):
+    if "priority" not in _column_names(conn, "task"):
+        conn.execute("ALTER TABLE task ADD COLUMN priority SMALLINT DEFAULT 0 NOT NULL")
+
+@migration(2, "添加标签任务数量字段及触发器")
+def _add_tag_task_count(conn):
+    if "task_count" not in _column_names(conn, "tag"):
+        conn.execute("ALTER TABLE tag ADD COLUMN task_count INTEGER DEFAULT 0 NOT NULL")
+        # 按现有关联回填
+        conn.execute(
+            "UPDATE tag SET task_count = "
+            "(SELECT COUNT(*) FROM task_tags WHERE task_tags.tag_id = tag.id)"
+        )
+    for trigger_sql in TAG_TASK_COUNT_TRIGGERS:
+        conn.execute(trigger_sql)
+
+@migration(3, "创建任务列表排序及筛选索引")
+def _create_indexes(conn):
+    create_declared_indexes(conn)
+
+@migration(4, "创建任务全文索引")
+def _create_task_fts(conn):
+    conn.execute(TASK_FTS_TABLE)
+    for trigger_sql in TASK_FTS_TRIGGERS:
+        conn.execute(trigger_sql)
+    for statement in TASK_FTS_REBUILD:
+        conn.execute(statement)
+
+@migration(5, "创建导入断点表")
+def _create_import_checkpoint(conn):
+    ddl = CreateTable(import_checkpoint.ImportCheckpoint.__table__, if_not_exists=True)
+    conn.execute(str(ddl.compile(dialect=sqlite.dialect())))
+
+# 带级联删除外键的 task_tags 表结构（与 app.models.base.task_tags 一致）
+TASK_TAGS_CASCADE_SQL = """
+    CREATE TABLE {name} (
+        task_id INTEGER NOT NULL REFERENCES task (id) ON DELETE CASCADE,
+        tag_id INTEGER NOT NULL REFERENCES tag (id) ON DELETE CASCADE,
+        PRIMARY KEY (task_id, tag_id)
+    )
+"""
+
+@migration(6, "任务标签关联改为级联删除外键")
+def _cascade_task_tags(conn):
+    foreign_keys = conn.execute("PRAGMA foreign_key_list(task_tags)").fetchall()
+    # foreign_key_list 的第7列为 ON DELETE 动作
+    if foreign_keys and all(fk[6] == "CASCADE" for fk in foreign_keys):
+        return
+    # 清理指向已删除任务或标签的关联，否则开启外键约束后无法通过检查
+    conn.execute(
+        "DELETE FROM task_tags WHERE task_id NOT IN (SELECT id FROM task) "
+        "OR tag_id NOT IN (SELECT id FROM tag)"
+    )
+    # 其他表上引用 task_tags 的触发器会阻止新表改名，先全部删除，重建后再创建
+    triggers = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND sql LIKE '%task_tags%'"
+    ).fetchall()
+    for (trigger_name,) in triggers:
+        conn.execute(f"DROP TRIGGER {trigger_name}")
+    rebuild_table(conn, "task_tags", TASK_TAGS_CASCADE_SQL, ["task_id", "tag_id"])
+    # 旧表上的索引已随旧表删除
+    create_declared_indexes(conn)
+    for trigger_sql in TAG_TASK_COUNT_TRIGGERS + TASK_FTS_TRIGGERS:
+        conn.execute(trigger_sql)
+
+@migration(7, "旧版“无截止日期”占位日期改为 NULL")
+def _clear_legacy_due_date(conn):
+    # 截止日期按 yyyy-MM-dd 文本保存，可以走 due_date 索引直接定位
+    conn.execute("UPDATE task SET due_date = NULL WHERE due_date = ?", (task.LEGACY_NO_DUE_DATE.isoformat(),))
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+def get_schema_version(db_path=DB_PATH) -> int:
+    """读取数据库的结构版本号（一次 PRAGMA 读取）
+
+    Args:
+        db_path: 数据库路径
+
+    Returns:
+        PRAGMA user_version 的值，新数据库为0
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+def is_schema_current(db_path=DB_PATH) -> bool:
+    """数据库结构是否已是最新版本
+
+    Args:
+        db_path: 数据库路径
+    """
+    return get_schema_version(db_path) >= LATEST_VERSION
+
+def migrate_database(db_path=DB_PATH, verbose=True) -> int:
+    """执行所有待执行的迁移步骤
+
+    每个步骤与版本号更新在同一个事务中提交，中途失败时回滚该步骤，
+    已完成的步骤保持生效，下次启动从失败的步骤继续。
+
+    Args:
+        db_path: 数据库路径
+        verbose: 是否打印迁移过程
+
+    Returns:
+        迁移后的版本号
+    """
+    log = print if verbose else (lambda *args: None)
+
+    # 自动提交模式，事务由下面显式控制
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= LATEST_VERSION:
+            log(f"数据库已是最新版本 ({version})，无需迁移")
+            return version
+
+        log(f"正在迁移数据库: {db_path} (版本 {version} -> {LATEST_VERSION})")
+        for step in MIGRATIONS:
+            if step.version <= version:
+                continue
+            log(f"[{step.version}] {step.description}...")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                step.apply(conn)
+                conn.execute(f"PRAGMA user_version = {step.version}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            version = step.version
+
+        log("数据库迁移完成！")
+        return version
+    finally:
+        conn.close()
 
 if __name__ == "__main__":
     migrate_database()
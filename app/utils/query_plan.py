@@ -0,0 +1,57 @@
+"""
+查询计划工具
+用 EXPLAIN QUERY PLAN 检查 SQLite 是否按索引执行查询
+"""
+
+from typing import List
+
+
+def explain_query_plan(session, statement) -> List[str]:
+    """返回语句的查询计划
+    
+    Args:
+        session: 数据库会话
+        statement: SQLAlchemy 语句或 Query 对象
+        
+    Returns:
+        查询计划各步骤的描述文本
+    """
+    statement = getattr(statement, "statement", statement)
+    connection = session.connection()
+    compiled = statement.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    params = tuple(compiled.params[name] for name in (compiled.positiontup or ()))
+    result = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled.string}", params)
+    return [row[-1] for row in result]
+
+
+def uses_temp_sort(plan: List[str]) -> bool:
+    """查询计划中是否包含临时 B 树排序
+    
+    Args:
+        plan: explain_query_plan 的结果
+        
+    Returns:
+        需要额外排序时返回True
+    """
+    return any("USE TEMP B-TREE" in step for step in plan)
+
+
+def assert_sort_free(session, statement) -> List[str]:
+    """断言语句可以直接按索引顺序返回结果
+    
+    Args:
+        session: 数据库会话
+        statement: SQLAlchemy 语句或 Query 对象
+        
+    Returns:
+        查询计划
+        
+    Raises:
+        AssertionError: 查询计划中出现了临时排序
+    """
+    plan = explain_query_plan(session, statement)
+    if uses_temp_sort(plan):
+        raise AssertionError("查询需要临时排序:\n" + "\n".join(plan))
+    return plan
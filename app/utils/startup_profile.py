@@ -0,0 +1,61 @@
+"""
+启动耗时分析
+按阶段记录启动过程的耗时，用于跟踪从进程启动到首次绘制的时间
+"""
+
+import sys
+import time
+import unicodedata
+from typing import List, Optional, Tuple
+
+def _display_width(text: str) -> int:
+    """文本在终端中的显示宽度（中文等全角字符占两列）"""
+    return sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+
+def _pad(text: str, width: int) -> str:
+    """按显示宽度在右侧补空格"""
+    return text + " " * (width - _display_width(text))
+
+class StartupProfiler:
+    """按阶段记录耗时的计时器，未启用时 mark 不做任何事"""
+
+    def __init__(self, enabled: bool = True, start: Optional[float] = None):
+        """初始化计时器
+
+        Args:
+            enabled: 是否启用
+            start: 计时起点（time.perf_counter() 的值），默认为当前时间
+        """
+        self.enabled = enabled
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        """记录从上一个阶段结束到现在的耗时
+
+        Args:
+            phase: 阶段名称
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self) -> float:
+        """从起点到最后一个阶段结束的总耗时（秒）"""
+        return self._last - self.start
+
+    def report(self, stream=None):
+        """打印各阶段耗时
+
+        Args:
+            stream: 输出流，默认为标准错误输出
+        """
+        stream = stream or sys.stderr
+        width = max((_display_width(phase) for phase, _ in self.phases), default=0)
+        print("启动耗时:", file=stream)
+        for phase, elapsed in self.phases:
+            print(f"  {_pad(phase, width)}  {elapsed * 1000:8.1f} ms", file=stream)
+        print(f"  {_pad('总计', width)}  {self.total() * 1000:8.1f} ms", file=stream)
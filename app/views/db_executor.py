@@ -0,0 +1,192 @@
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+
+from app.controllers.task_controller import TaskController
+from app.controllers.tag_controller import TagController
+
+class WorkerControllers(NamedTuple):
+    """后台请求可使用的控制器（绑定到该请求独立的会话）"""
+    tasks: TaskController
+    tags: TagController
+
+class _Request(NamedTuple):
+    """待执行的请求"""
+    request_id: int
+    key: Optional[str]
+    func: Callable[[WorkerControllers], Any]
+
+class _DbWorker(QObject):
+    """运行在后台线程中的数据库工作对象"""
+
+    finished = Signal(int, object)  # 请求ID, 结果
+    failed = Signal(int, object)  # 请求ID, 异常
+
+    def __init__(self, session_factory, is_current):
+        """初始化工作对象
+
+        Args:
+            session_factory: 创建会话的可调用对象
+            is_current: is_current(request) 判断请求是否仍需执行
+        """
+        super().__init__()
+        self.session_factory = session_factory
+        self.is_current = is_current
+
+    @Slot(object)
+    def run(self, request):
+        """执行请求，已被新请求取代的直接跳过"""
+        if not self.is_current(request):
+            return
+        # 每个请求使用独立的会话，结束后立即关闭，不会持有读事务或过期缓存
+        session = self.session_factory()
+        try:
+            tag_controller = TagController(session)
+            result = request.func(WorkerControllers(TaskController(session, tag_controller), tag_controller))
+        except Exception as e:
+            self.failed.emit(request.request_id, e)
+        else:
+            self.finished.emit(request.request_id, result)
+        finally:
+            session.close()
+
+class DbExecutor(QObject):
+    """后台数据库执行器
+
+    在独立线程中执行只读查询，结果通过信号回到GUI线程再调用回调。
+    提交时可指定 key，同一 key 的新请求会取代旧请求：
+    尚未开始的旧请求不再执行，已在执行的旧请求结果被丢弃。
+    """
+
+    _submit = Signal(object)
+
+    def __init__(self, session_factory, parent=None):
+        """初始化执行器并启动后台线程
+
+        Args:
+            session_factory: 创建会话的可调用对象（如 app.models.base.Session）
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._latest_by_key: Dict[str, int] = {}
+        # {请求ID: (成功回调, 失败回调, key)}
+        self._callbacks: Dict[int, tuple] = {}
+
+        self._thread = QThread(self)
+        self._worker = _DbWorker(session_factory, self._is_current)
+        self._worker.moveToThread(self._thread)
+        self._submit.connect(self._worker.run)
+        self._worker.finished.connect(self._on_finished)
+        self._worker.failed.connect(self._on_failed)
+        self._thread.start()
+
+    def submit(self, func: Callable[[WorkerControllers], Any], on_done: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None, key: Optional[str] = None) -> int:
+        """提交后台请求
+
+        Args:
+            func: 在后台线程中执行的函数，参数为 WorkerControllers
+            on_done: 成功后在GUI线程中调用，参数为 func 的返回值
+            on_error: 失败后在GUI线程中调用，参数为异常
+            key: 请求类别，同一类别只保留最新的请求
+
+        Returns:
+            请求ID
+        """
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            if key is not None:
+                superseded = self._latest_by_key.get(key)
+                if superseded is not None:
+                    self._callbacks.pop(superseded, None)
+                self._latest_by_key[key] = request_id
+        self._callbacks[request_id] = (on_done, on_error, key)
+        self._submit.emit(_Request(request_id, key, func))
+        return request_id
+
+    def cancel(self, key: str):
+        """取消某一类别中尚未完成的请求"""
+        with self._lock:
+            request_id = self._latest_by_key.pop(key, None)
+        if request_id is not None:
+            self._callbacks.pop(request_id, None)
+
+    def is_pending(self, key: str) -> bool:
+        """某一类别是否有尚未完成的请求"""
+        with self._lock:
+            return key in self._latest_by_key
+
+    def _is_current(self, request: _Request) -> bool:
+        """请求是否仍需执行（在后台线程中调用）"""
+        with self._lock:
+            return request.key is None or self._latest_by_key.get(request.key) == request.request_id
+
+    def _take_callbacks(self, request_id: int):
+        """取出请求的回调并清除其 key 的记录，已取消的请求返回None"""
+        callbacks = self._callbacks.pop(request_id, None)
+        if callbacks is not None and callbacks[2] is not None:
+            with self._lock:
+                if self._latest_by_key.get(callbacks[2]) == request_id:
+                    del self._latest_by_key[callbacks[2]]
+        return callbacks
+
+    @Slot(int, object)
+    def _on_finished(self, request_id, result):
+        callbacks = self._take_callbacks(request_id)
+        if callbacks is not None:
+            callbacks[0](result)
+
+    @Slot(int, object)
+    def _on_failed(self, request_id, error):
+        callbacks = self._take_callbacks(request_id)
+        if callbacks is not None and callbacks[1] is not None:
+            callbacks[1](error)
+
+    def shutdown(self):
+        """停止后台线程（等待正在执行的请求结束）"""
+        with self._lock:
+            self._latest_by_key.clear()
+        self._callbacks.clear()
+        self._thread.quit()
+        self._thread.wait()
+
+class InlineExecutor:
+    """与 DbExecutor 接口相同的同步执行器
+
+    直接使用给定的控制器在当前线程中执行，用于没有后台线程的场景。
+    """
+
+    def __init__(self, task_controller: Optional[TaskController], tag_controller: TagController):
+        """初始化执行器
+
+        Args:
+            task_controller: 任务控制器
+            tag_controller: 标签控制器
+        """
+        self.controllers = WorkerControllers(task_controller, tag_controller)
+
+    def submit(self, func, on_done, on_error=None, key=None) -> int:
+        """立即执行请求并调用回调"""
+        try:
+            result = func(self.controllers)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+        else:
+            on_done(result)
+        return 0
+
+    def cancel(self, key: str):
+        """同步执行没有待完成的请求"""
+
+    def is_pending(self, key: str) -> bool:
+        """同步执行没有待完成的请求"""
+        return False
+
+    def shutdown(self):
+        """同步执行器无需停止"""
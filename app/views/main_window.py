@@ -1,9 +1,9 @@
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QTabWidget
 
-from app.models.base import Session
+from app.models.base import OperationSession, Session
 from app.views.task_tab import TaskTab
-from app.views.tag_tab import TagTab
+from app.views.db_executor import DbExecutor
 from app.controllers.task_controller import TaskController
 from app.controllers.tag_controller import TagController
 
@@ -16,12 +16,12 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("TaskMoment")
         self.resize(800, 600)
         
-        # 创建数据库会话
-        self.session = Session()
+        # 创建控制器实例：每个操作使用一个短期会话，避免长期会话的身份映射不断增长
+        self.tag_controller = TagController(OperationSession)
+        self.task_controller = TaskController(OperationSession, self.tag_controller)
         
-        # 创建控制器实例
-        self.task_controller = TaskController(self.session)
-        self.tag_controller = TagController(self.session)
+        # 后台数据库执行器：列表查询在独立线程和独立会话中执行，不阻塞界面
+        self.db_executor = DbExecutor(Session, self)
 
         # 中心控件
         central_widget = QWidget()
@@ -35,12 +35,14 @@ class MainWindow(QMainWindow):
         vbox.addWidget(self.tab_widget)
         
         # 创建任务管理标签页
-        self.task_tab = TaskTab(self.task_controller, self.tag_controller)
+        self.task_tab = TaskTab(self.task_controller, self.tag_controller, executor=self.db_executor)
         self.tab_widget.addTab(self.task_tab, "任务管理")
         
-        # 创建标签管理标签页
-        self.tag_tab = TagTab(self.tag_controller) 
-        self.tab_widget.addTab(self.tag_tab, "标签管理")
+        # 标签管理标签页在第一次切换到时才创建，这里先放一个空容器
+        self.tag_tab = None
+        self.tag_tab_container = QWidget()
+        QVBoxLayout(self.tag_tab_container).setContentsMargins(0, 0, 0, 0)
+        self.tab_widget.addTab(self.tag_tab_container, "标签管理")
         
         # 连接标签页切换信号
         self.tab_widget.currentChanged.connect(self.handle_tab_changed)
@@ -54,16 +56,24 @@ class MainWindow(QMainWindow):
         Args:
             index: 标签页索引
         """
-        # 根据切换的标签页刷新数据
-        if index == 0:  # 任务管理标签页
-            self.task_tab.load_tasks()
-        elif index == 1:  # 标签管理标签页
-            self.tag_tab.load_tags()
+        # 任务表格通过变更事件增量更新，切换时只需刷新标签统计
+        if index == 1:  # 标签管理标签页
+            if self.tag_tab is None:
+                self._create_tag_tab()  # 创建时会加载标签
+            else:
+                self.tag_tab.load_tags()
+    
+    def _create_tag_tab(self):
+        """创建标签管理标签页（首次显示时）"""
+        from app.views.tag_tab import TagTab
+        
+        self.tag_tab = TagTab(self.tag_controller, executor=self.db_executor)
+        self.tag_tab_container.layout().addWidget(self.tag_tab)
     
     def handle_task_changed(self):
         """处理任务变更事件"""
         # 如果当前是标签管理标签页，刷新标签列表
-        if self.tab_widget.currentIndex() == 1:
+        if self.tab_widget.currentIndex() == 1 and self.tag_tab is not None:
             self.tag_tab.load_tags()
     
     def closeEvent(self, event):
@@ -72,6 +82,7 @@ class MainWindow(QMainWindow):
         Args:
             event: 关闭事件
         """
-        # 关闭数据库会话
-        self.session.close()
+        # 写入尚未写入的修改，再停止后台执行器
+        self.task_tab.flush_writes()
+        self.db_executor.shutdown()
         event.accept()
@@ -1,24 +1,30 @@
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, 
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QInputDialog
+    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QInputDialog, QLabel
 )
 
 from app.controllers.tag_controller import TagController
+from app.views.db_executor import InlineExecutor
 
 class TagTab(QWidget):
     """标签管理标签页"""
     
-    def __init__(self, tag_controller):
+    # 标签列表的后台请求类别
+    LOAD_REQUEST = "tag_list"
+    
+    def __init__(self, tag_controller, executor=None):
         """初始化标签页
         
         Args:
             tag_controller: TagController 实例
+            executor: 执行列表查询的后台执行器 (DbExecutor)，为None时同步执行
         """
         super().__init__()
         
         # 使用传入的控制器
         self.tag_controller = tag_controller
+        self.executor = executor or InlineExecutor(None, tag_controller)
         
         # 初始化UI
         self._setup_ui()
@@ -35,9 +41,11 @@ class TagTab(QWidget):
         self.new_tag_edit = QLineEdit()
         self.new_tag_edit.setPlaceholderText("添加新标签…")
         add_btn = QPushButton("添加")
+        merge_btn = QPushButton("合并选中标签")
         
         input_row.addWidget(self.new_tag_edit, 4)
         input_row.addWidget(add_btn, 1)
+        input_row.addWidget(merge_btn, 1)
         
         layout.addLayout(input_row)
         
@@ -48,37 +56,61 @@ class TagTab(QWidget):
         self.table.horizontalHeader().setDefaultAlignment(Qt.AlignCenter)
         self.table.verticalHeader().setVisible(False)
         self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.ExtendedSelection)
         
         layout.addWidget(self.table)
         
+        self.loading_label = QLabel("正在加载…")
+        self.loading_label.setVisible(False)
+        layout.addWidget(self.loading_label)
+        
         # 连接信号
         add_btn.clicked.connect(self.add_tag)
+        merge_btn.clicked.connect(self.merge_selected_tags)
         self.new_tag_edit.returnPressed.connect(self.add_tag)
     
     def load_tags(self):
-        """加载所有标签"""
-        self.table.setRowCount(0)
+        """在后台加载所有标签，返回后刷新表格"""
+        self.loading_label.setVisible(True)
+        self.executor.submit(
+            lambda controllers: controllers.tags.get_tags_with_counts(use_cached=True),
+            self._on_tags_loaded, self._on_load_failed, key=self.LOAD_REQUEST
+        )
+    
+    def _on_tags_loaded(self, tags):
+        """标签加载完成
         
-        for tag in self.tag_controller.get_all_tags():
+        Args:
+            tags: TagCount 列表
+        """
+        self.loading_label.setVisible(False)
+        self.table.setRowCount(0)
+        for tag in tags:
             self._add_tag_to_table(tag)
     
+    def _on_load_failed(self, error):
+        """后台加载失败"""
+        self.loading_label.setVisible(False)
+        QMessageBox.warning(self, "错误", f"加载标签失败: {error}")
+    
     def _add_tag_to_table(self, tag):
         """将标签添加到表格
         
         Args:
-            tag: 标签对象
+            tag: TagCount (id, name, count)
         """
         row = self.table.rowCount()
         self.table.insertRow(row)
         
         # 标签名称
-        tag_item = QTableWidgetItem(tag.tag)
+        tag_item = QTableWidgetItem(tag.name)
         tag_item.setTextAlignment(Qt.AlignCenter)
+        tag_item.setData(Qt.UserRole, tag.id)
         self.table.setItem(row, 0, tag_item)
         
         # 任务数量
-        task_count = len(tag.tasks)
-        count_item = QTableWidgetItem(str(task_count))
+        count_item = QTableWidgetItem(str(tag.count))
         count_item.setTextAlignment(Qt.AlignCenter)
         self.table.setItem(row, 1, count_item)
         
@@ -157,7 +189,7 @@ class TagTab(QWidget):
             return
             
         # 确认删除
-        task_count = len(tag.tasks)
+        task_count = tag.task_count
         if task_count > 0:
             if QMessageBox.question(
                 self, 
@@ -178,3 +210,43 @@ class TagTab(QWidget):
         
         # 更新UI
         self.load_tags()
+    
+    def selected_tags(self):
+        """获取当前选中的标签
+        
+        Returns:
+            [(标签ID, 标签名称)]，按表格顺序
+        """
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        items = [self.table.item(row, 0) for row in rows]
+        return [(item.data(Qt.UserRole), item.text()) for item in items]
+    
+    def merge_selected_tags(self):
+        """把选中的标签合并为一个（如 work 和 Work）"""
+        tags = self.selected_tags()
+        if len(tags) < 2:
+            QMessageBox.information(self, "合并标签", "请先选中至少两个标签")
+            return
+            
+        # 选择保留的标签，其余标签的任务并入该标签后删除
+        names = [name for _, name in tags]
+        target_name, ok = QInputDialog.getItem(
+            self, "合并标签", "合并后保留的标签:", names, 0, False
+        )
+        if not ok:
+            return
+        target_id = tags[names.index(target_name)][0]
+        source_ids = [tag_id for tag_id, _ in tags if tag_id != target_id]
+        
+        others = "、".join(f"'{name}'" for name in names if name != target_name)
+        if QMessageBox.question(
+            self,
+            "确认合并",
+            f"将 {others} 的任务并入 '{target_name}'，并删除这些标签，确定吗？"
+        ) != QMessageBox.Yes:
+            return
+            
+        self.tag_controller.merge_tags(source_ids, target_id)
+        
+        # 更新UI
+        self.load_tags()
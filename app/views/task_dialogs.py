@@ -0,0 +1,369 @@
+from PySide6.QtCore import Qt, QDate
+from PySide6.QtWidgets import (
+    QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, 
+    QCalendarWidget, QDialogButtonBox, QDialog, QLabel, QGridLayout, 
+    QListWidget, QListWidgetItem, QAbstractItemView, QComboBox
+)
+
+from app.models.task import Priority
+
+class TaskEditDialog(QDialog):
+    """任务编辑对话框"""
+    
+    def __init__(self, task_controller, tag_controller, task=None, parent=None):
+        """初始化对话框
+        
+        Args:
+            task_controller: 任务控制器
+            tag_controller: 标签控制器
+            task: 要编辑的任务，如果为None则为新建任务
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.task_controller = task_controller
+        self.tag_controller = tag_controller
+        self.task = task
+        self.setWindowTitle("编辑任务" if task else "新建任务")
+        
+        self._init_ui()
+        
+        # 如果是编辑任务，填充表单
+        if task:
+            self.set_task_data(task)
+    
+    def _init_ui(self):
+        """初始化UI"""
+        # 创建控件
+        self.title_edit = QLineEdit()
+        
+        # 新的日期选择UI
+        self.date_display = QLineEdit()
+        self.date_display.setPlaceholderText("无截止日期")
+        self.date_display.setReadOnly(True)
+        self.date_button = QPushButton("📅") # 修正图标
+        self.date_button.setToolTip("选择截止日期")
+        self.date_button.clicked.connect(self._open_calendar_dialog)
+
+        date_layout = QHBoxLayout()
+        date_layout.addWidget(self.date_display)
+        date_layout.addWidget(self.date_button)
+
+        # 优先级选择下拉框
+        self.priority_combo = QComboBox()
+        self.priority_combo.addItem("无优先级", Priority.NONE)
+        self.priority_combo.addItem("低优先级", Priority.LOW)
+        self.priority_combo.addItem("中优先级", Priority.MEDIUM)
+        self.priority_combo.addItem("高优先级", Priority.HIGH)
+        
+        # 为优先级选项设置颜色
+        self.priority_combo.setItemData(0, "#808080", Qt.ForegroundRole)  # 灰色
+        self.priority_combo.setItemData(1, "#4D94FF", Qt.ForegroundRole)  # 蓝色
+        self.priority_combo.setItemData(2, "#FFD700", Qt.ForegroundRole)  # 黄色
+        self.priority_combo.setItemData(3, "#FF4D4D", Qt.ForegroundRole)  # 红色
+        
+        # 标签列表和添加标签控件
+        self.tag_list = QListWidget()
+        self.tag_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        self.tag_list.setMaximumHeight(100)
+        
+        self.new_tag_edit = QLineEdit()
+        self.new_tag_edit.setPlaceholderText("输入新标签")
+        self.add_tag_btn = QPushButton("+")
+        self.add_tag_btn.setMaximumWidth(30)
+        
+        # 初始化标签列表
+        self._init_tag_list()
+        
+        # 布局
+        layout = QGridLayout()
+        layout.addWidget(QLabel("任务内容:"), 0, 0)
+        layout.addWidget(self.title_edit, 0, 1)
+        layout.addWidget(QLabel("截止日期:"), 1, 0)
+        layout.addLayout(date_layout, 1, 1) # 使用新的 date_layout
+        layout.addWidget(QLabel("优先级:"), 2, 0)
+        layout.addWidget(self.priority_combo, 2, 1)
+        layout.addWidget(QLabel("标签:"), 3, 0)
+        
+        # 标签选择区域
+        tag_area = QVBoxLayout()
+        tag_area.addWidget(self.tag_list)
+        
+        # 新标签输入区域
+        new_tag_layout = QHBoxLayout()
+        new_tag_layout.addWidget(self.new_tag_edit)
+        new_tag_layout.addWidget(self.add_tag_btn)
+        tag_area.addLayout(new_tag_layout)
+        
+        layout.addLayout(tag_area, 3, 1)
+        
+        # 按钮区域
+        btn_box = QHBoxLayout()
+        save_btn = QPushButton("保存")
+        cancel_btn = QPushButton("取消")
+        btn_box.addWidget(save_btn)
+        btn_box.addWidget(cancel_btn)
+        layout.addLayout(btn_box, 4, 0, 1, 2)
+        
+        self.setLayout(layout)
+        
+        # 连接信号
+        save_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+        self.add_tag_btn.clicked.connect(self._add_new_tag)
+    
+    def _init_tag_list(self):
+        """初始化标签列表"""
+        self.tag_list.clear()
+        self.tag_map = {}  # 用于存储标签项和标签对象的映射
+        
+        # 加载所有标签（走标签缓存，不查询数据库）
+        for tag_id, tag_name in self.tag_controller.list_tags():
+            item = QListWidgetItem(tag_name)
+            item.setData(Qt.UserRole, tag_id)
+            self.tag_list.addItem(item)
+            self.tag_map[tag_id] = item
+    
+    def _open_calendar_dialog(self):
+        # 标记是否已选择"无截止日期"
+        no_due_date_selected = [False]
+        dialog = QDialog(self)
+        dialog.setWindowTitle("选择截止日期")
+        layout = QVBoxLayout(dialog)
+
+        calendar = QCalendarWidget(dialog)
+        calendar.setMinimumDate(QDate.currentDate()) # 只能选择当天及以后
+        if self.date_display.text() != "无截止日期" and self.date_display.text():
+            try:
+                current_date = QDate.fromString(self.date_display.text(), "yyyy-MM-dd")
+                if current_date.isValid():
+                    calendar.setSelectedDate(current_date)
+            except Exception:
+                pass # 如果解析失败，则不设置日期
+
+        layout.addWidget(calendar)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.Reset, dialog)
+        clear_button = button_box.button(QDialogButtonBox.Reset)
+        if clear_button: # QDialogButtonBox.Reset 可能不存在于所有样式中
+            clear_button.setText("无截止日期")
+            clear_button.clicked.connect(lambda: self._set_no_due_date_edit(dialog, no_due_date_selected))
+        
+        button_box.accepted.connect(dialog.accept)
+        button_box.rejected.connect(dialog.reject)
+        
+        # QCalendarWidget 没有直接的清除按钮，我们通过 Reset 按钮实现
+        # 如果 Reset 按钮不存在，则需要手动添加一个“清除”按钮
+        if not clear_button:
+            manual_clear_button = QPushButton("无截止日期")
+            manual_clear_button.clicked.connect(lambda: self._set_no_due_date_edit(dialog, no_due_date_selected))
+            button_box.addButton(manual_clear_button, QDialogButtonBox.ActionRole)
+
+        layout.addWidget(button_box)
+        dialog.setLayout(layout)
+
+        if dialog.exec():
+            if no_due_date_selected[0]:
+                # 已在_set_no_due_date_edit中设置为"无截止日期"
+                pass
+            else:
+                selected_date = calendar.selectedDate()
+                self.date_display.setText(selected_date.toString("yyyy-MM-dd"))
+        # 如果用户按下了 Cancel，则不做任何操作
+
+    def _set_no_due_date_edit(self, dialog, no_due_date_flag):
+        """设置为无截止日期并关闭对话框"""
+        self.date_display.setText("无截止日期")
+        no_due_date_flag[0] = True
+        dialog.accept()
+
+    def set_task_data(self, task):
+        """设置任务数据显示到UI"""
+        self.title_edit.setText(task.title)
+        if task.due_date:
+            # 兼容字符串或 datetime.date 两种类型
+            if isinstance(task.due_date, str):
+                date_str = task.due_date
+            else:
+                # 假设为 datetime.date 类型
+                date_str = task.due_date.strftime("%Y-%m-%d")
+            self.date_display.setText(date_str)
+        else:
+            self.date_display.setText("无截止日期")
+        
+        # 设置优先级
+        # 将整数的 task.priority 转换为 Priority 枚举成员
+        priority_enum_member = Priority(task.priority)
+        index = self.priority_combo.findData(priority_enum_member)
+        if index >= 0:
+            self.priority_combo.setCurrentIndex(index)
+        
+        # 选中任务已有的标签
+        for tag in task.tags:
+            if tag.id in self.tag_map:
+                self.tag_map[tag.id].setSelected(True)
+    
+    def _add_new_tag(self):
+        """添加新标签"""
+        tag_name = self.new_tag_edit.text().strip()
+        if not tag_name:
+            return
+            
+        # 获取或创建标签
+        tag = self.tag_controller.get_or_create_tag(tag_name)
+        
+        # 如果标签已在列表中，选中它
+        if tag.id in self.tag_map:
+            self.tag_map[tag.id].setSelected(True)
+        else:
+            # 添加到列表并选中
+            item = QListWidgetItem(tag.tag)
+            item.setData(Qt.UserRole, tag.id)
+            item.setSelected(True)
+            self.tag_list.addItem(item)
+            self.tag_map[tag.id] = item
+        
+        # 清空输入框
+        self.new_tag_edit.clear()
+    
+    def get_task_data(self):
+        """获取表单数据
+        
+        Returns:
+            包含任务数据的字典，如果标题为空则返回None
+        """
+        title = self.title_edit.text().strip()
+        if not title:
+            return None
+            
+        # 从标题中提取标签
+        title, tag_in_title = self.task_controller.extract_tag(title)
+        
+        # 获取选中的标签ID
+        selected_tags = []
+        for item in self.tag_list.selectedItems():
+            tag_id = item.data(Qt.UserRole)
+            selected_tags.append(tag_id)
+            
+        # 如果标题中有标签，添加到选中的标签列表
+        if tag_in_title:
+            tag = self.tag_controller.get_or_create_tag(tag_in_title)
+            if tag.id not in selected_tags:
+                selected_tags.append(tag.id)
+                
+        # 获取截止日期
+        due_date_str = self.date_display.text()
+        due_date = None
+        if due_date_str and due_date_str != "无截止日期":
+            # QDate.fromString 如果格式不匹配会返回一个无效的QDate，我们需要检查
+            parsed_date = QDate.fromString(due_date_str, "yyyy-MM-dd")
+            if parsed_date.isValid():
+                 due_date = parsed_date.toString("yyyy-MM-dd")
+
+        # 获取优先级
+        priority = self.priority_combo.currentData()
+        
+        return {
+            "title": title,
+            "due_date": due_date,
+            "priority": priority,
+            "tag_ids": selected_tags
+        }
+
+
+class TagSelectionDialog(QDialog):
+    """标签选择对话框"""
+    
+    def __init__(self, tag_controller, selected_tag_ids=None, parent=None):
+        """初始化对话框
+        
+        Args:
+            tag_controller: 标签控制器
+            selected_tag_ids: 已选中的标签ID列表
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.tag_controller = tag_controller
+        self.selected_tag_ids = selected_tag_ids or []
+        self.setWindowTitle("选择标签")
+        self.setMinimumWidth(300)
+        
+        self._init_ui()
+    
+    def _init_ui(self):
+        """初始化UI"""
+        layout = QVBoxLayout(self)
+        
+        # 标签列表
+        self.tag_list = QListWidget()
+        self.tag_list.setSelectionMode(QAbstractItemView.MultiSelection)
+        layout.addWidget(self.tag_list)
+        
+        # 添加新标签区域
+        new_tag_layout = QHBoxLayout()
+        self.new_tag_edit = QLineEdit()
+        self.new_tag_edit.setPlaceholderText("输入新标签")
+        self.add_tag_btn = QPushButton("+")
+        self.add_tag_btn.setMaximumWidth(30)
+        new_tag_layout.addWidget(self.new_tag_edit)
+        new_tag_layout.addWidget(self.add_tag_btn)
+        layout.addLayout(new_tag_layout)
+        
+        # 按钮区域
+        btn_layout = QHBoxLayout()
+        ok_btn = QPushButton("确定")
+        cancel_btn = QPushButton("取消")
+        btn_layout.addWidget(ok_btn)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+        
+        # 加载标签并选中已选标签
+        self.tag_map = {}
+        for tag_id, tag_name in self.tag_controller.list_tags():
+            item = QListWidgetItem(tag_name)
+            item.setData(Qt.UserRole, tag_id)
+            self.tag_list.addItem(item)
+            self.tag_map[tag_id] = item
+            
+            # 如果标签已经选中，则选中它
+            if tag_id in self.selected_tag_ids:
+                item.setSelected(True)
+        
+        # 连接信号
+        self.add_tag_btn.clicked.connect(self._add_new_tag)
+        ok_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+    
+    def _add_new_tag(self):
+        """添加新标签"""
+        tag_name = self.new_tag_edit.text().strip()
+        if not tag_name:
+            return
+            
+        # 获取或创建标签
+        tag = self.tag_controller.get_or_create_tag(tag_name)
+        
+        # 如果标签已在列表中，选中它
+        if tag.id in self.tag_map:
+            self.tag_map[tag.id].setSelected(True)
+        else:
+            # 添加到列表并选中
+            item = QListWidgetItem(tag.tag)
+            item.setData(Qt.UserRole, tag.id)
+            item.setSelected(True)
+            self.tag_list.addItem(item)
+            self.tag_map[tag.id] = item
+        
+        # 清空输入框
+        self.new_tag_edit.clear()
+    
+    def get_selected_tag_ids(self):
+        """获取选中的标签ID列表
+        
+        Returns:
+            标签ID列表
+        """
+        selected_tags = []
+        for item in self.tag_list.selectedItems():
+            tag_id = item.data(Qt.UserRole)
+            selected_tags.append(tag_id)
+        return selected_tags
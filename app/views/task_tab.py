@@ -1,378 +1,22 @@
-from PySide6.QtCore import Qt, QDate, Signal
-from PySide6.QtGui import QColor
+from datetime import date
+
+from PySide6.QtCore import Qt, QDate, QTimer, Signal
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, 
-    QCalendarWidget, QDialogButtonBox, QTableWidget, QTableWidgetItem, QHeaderView, 
-    QDialog, QLabel, QMessageBox, QGridLayout, QListWidget, 
-    QListWidgetItem, QAbstractItemView, QComboBox
+    QCalendarWidget, QDialogButtonBox, QTableView, QHeaderView, 
+    QDialog, QLabel, QMessageBox, QAbstractItemView, QComboBox, QListWidget, QListWidgetItem
 )
 
 from app.controllers.task_controller import TaskController
 from app.controllers.tag_controller import TagController
+from app.controllers.tag_index import TagFilter
+from app.controllers.due_index import DUE_BUCKETS, DUE_BUCKET_NAMES
+from app.controllers.events import CREATED, DELETED, MERGED
+from app.controllers.write_behind import WriteBehindQueue
 from app.models.task import Task, Priority
 from app.models.tag import Tag
-
-class TaskEditDialog(QDialog):
-    """任务编辑对话框"""
-    
-    def __init__(self, task_controller, tag_controller, task=None, parent=None):
-        """初始化对话框
-        
-        Args:
-            task_controller: 任务控制器
-            tag_controller: 标签控制器
-            task: 要编辑的任务，如果为None则为新建任务
-            parent: 父窗口
-        """
-        super().__init__(parent)
-        self.task_controller = task_controller
-        self.tag_controller = tag_controller
-        self.task = task
-        self.setWindowTitle("编辑任务" if task else "新建任务")
-        
-        self._init_ui()
-        
-        # 如果是编辑任务，填充表单
-        if task:
-            self.set_task_data(task)
-    
-    def _init_ui(self):
-        """初始化UI"""
-        # 创建控件
-        self.title_edit = QLineEdit()
-        
-        # 新的日期选择UI
-        self.date_display = QLineEdit()
-        self.date_display.setPlaceholderText("无截止日期")
-        self.date_display.setReadOnly(True)
-        self.date_button = QPushButton("📅") # 修正图标
-        self.date_button.setToolTip("选择截止日期")
-        self.date_button.clicked.connect(self._open_calendar_dialog)
-
-        date_layout = QHBoxLayout()
-        date_layout.addWidget(self.date_display)
-        date_layout.addWidget(self.date_button)
-
-        # 优先级选择下拉框
-        self.priority_combo = QComboBox()
-        self.priority_combo.addItem("无优先级", Priority.NONE)
-        self.priority_combo.addItem("低优先级", Priority.LOW)
-        self.priority_combo.addItem("中优先级", Priority.MEDIUM)
-        self.priority_combo.addItem("高优先级", Priority.HIGH)
-        
-        # 为优先级选项设置颜色
-        self.priority_combo.setItemData(0, "#808080", Qt.ForegroundRole)  # 灰色
-        self.priority_combo.setItemData(1, "#4D94FF", Qt.ForegroundRole)  # 蓝色
-        self.priority_combo.setItemData(2, "#FFD700", Qt.ForegroundRole)  # 黄色
-        self.priority_combo.setItemData(3, "#FF4D4D", Qt.ForegroundRole)  # 红色
-        
-        # 标签列表和添加标签控件
-        self.tag_list = QListWidget()
-        self.tag_list.setSelectionMode(QAbstractItemView.MultiSelection)
-        self.tag_list.setMaximumHeight(100)
-        
-        self.new_tag_edit = QLineEdit()
-        self.new_tag_edit.setPlaceholderText("输入新标签")
-        self.add_tag_btn = QPushButton("+")
-        self.add_tag_btn.setMaximumWidth(30)
-        
-        # 初始化标签列表
-        self._init_tag_list()
-        
-        # 布局
-        layout = QGridLayout()
-        layout.addWidget(QLabel("任务内容:"), 0, 0)
-        layout.addWidget(self.title_edit, 0, 1)
-        layout.addWidget(QLabel("截止日期:"), 1, 0)
-        layout.addLayout(date_layout, 1, 1) # 使用新的 date_layout
-        layout.addWidget(QLabel("优先级:"), 2, 0)
-        layout.addWidget(self.priority_combo, 2, 1)
-        layout.addWidget(QLabel("标签:"), 3, 0)
-        
-        # 标签选择区域
-        tag_area = QVBoxLayout()
-        tag_area.addWidget(self.tag_list)
-        
-        # 新标签输入区域
-        new_tag_layout = QHBoxLayout()
-        new_tag_layout.addWidget(self.new_tag_edit)
-        new_tag_layout.addWidget(self.add_tag_btn)
-        tag_area.addLayout(new_tag_layout)
-        
-        layout.addLayout(tag_area, 3, 1)
-        
-        # 按钮区域
-        btn_box = QHBoxLayout()
-        save_btn = QPushButton("保存")
-        cancel_btn = QPushButton("取消")
-        btn_box.addWidget(save_btn)
-        btn_box.addWidget(cancel_btn)
-        layout.addLayout(btn_box, 4, 0, 1, 2)
-        
-        self.setLayout(layout)
-        
-        # 连接信号
-        save_btn.clicked.connect(self.accept)
-        cancel_btn.clicked.connect(self.reject)
-        self.add_tag_btn.clicked.connect(self._add_new_tag)
-    
-    def _init_tag_list(self):
-        """初始化标签列表"""
-        self.tag_list.clear()
-        self.tag_map = {}  # 用于存储标签项和标签对象的映射
-        
-        # 加载所有标签
-        for tag in self.tag_controller.get_all_tags():
-            item = QListWidgetItem(tag.tag)
-            item.setData(Qt.UserRole, tag.id)
-            self.tag_list.addItem(item)
-            self.tag_map[tag.id] = item
-    
-    def _open_calendar_dialog(self):
-        # 标记是否已选择"无截止日期"
-        no_due_date_selected = [False]
-        dialog = QDialog(self)
-        dialog.setWindowTitle("选择截止日期")
-        layout = QVBoxLayout(dialog)
-
-        calendar = QCalendarWidget(dialog)
-        calendar.setMinimumDate(QDate.currentDate()) # 只能选择当天及以后
-        if self.date_display.text() != "无截止日期" and self.date_display.text():
-            try:
-                current_date = QDate.fromString(self.date_display.text(), "yyyy-MM-dd")
-                if current_date.isValid():
-                    calendar.setSelectedDate(current_date)
-            except Exception:
-                pass # 如果解析失败，则不设置日期
-
-        layout.addWidget(calendar)
-
-        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.Reset, dialog)
-        clear_button = button_box.button(QDialogButtonBox.Reset)
-        if clear_button: # QDialogButtonBox.Reset 可能不存在于所有样式中
-            clear_button.setText("无截止日期")
-            clear_button.clicked.connect(lambda: self._set_no_due_date_edit(dialog, no_due_date_selected))
-        
-        button_box.accepted.connect(dialog.accept)
-        button_box.rejected.connect(dialog.reject)
-        
-        # QCalendarWidget 没有直接的清除按钮，我们通过 Reset 按钮实现
-        # 如果 Reset 按钮不存在，则需要手动添加一个“清除”按钮
-        if not clear_button:
-            manual_clear_button = QPushButton("无截止日期")
-            manual_clear_button.clicked.connect(lambda: self._set_no_due_date_edit(dialog, no_due_date_selected))
-            button_box.addButton(manual_clear_button, QDialogButtonBox.ActionRole)
-
-        layout.addWidget(button_box)
-        dialog.setLayout(layout)
-
-        if dialog.exec():
-            if no_due_date_selected[0]:
-                # 已在_set_no_due_date_edit中设置为"无截止日期"
-                pass
-            else:
-                selected_date = calendar.selectedDate()
-                self.date_display.setText(selected_date.toString("yyyy-MM-dd"))
-        # 如果用户按下了 Cancel，则不做任何操作
-
-    def _set_no_due_date_edit(self, dialog, no_due_date_flag):
-        """设置为无截止日期并关闭对话框"""
-        self.date_display.setText("无截止日期")
-        no_due_date_flag[0] = True
-        dialog.accept()
-
-    def set_task_data(self, task):
-        """设置任务数据显示到UI"""
-        self.title_edit.setText(task.title)
-        if task.due_date:
-            # 兼容字符串或 datetime.date 两种类型
-            if isinstance(task.due_date, str):
-                date_str = task.due_date
-            else:
-                # 假设为 datetime.date 类型
-                date_str = task.due_date.strftime("%Y-%m-%d")
-            self.date_display.setText(date_str)
-        else:
-            self.date_display.setText("无截止日期")
-        
-        # 设置优先级
-        # 将整数的 task.priority 转换为 Priority 枚举成员
-        priority_enum_member = Priority(task.priority)
-        index = self.priority_combo.findData(priority_enum_member)
-        if index >= 0:
-            self.priority_combo.setCurrentIndex(index)
-        
-        # 选中任务已有的标签
-        for tag in task.tags:
-            if tag.id in self.tag_map:
-                self.tag_map[tag.id].setSelected(True)
-    
-    def _add_new_tag(self):
-        """添加新标签"""
-        tag_name = self.new_tag_edit.text().strip()
-        if not tag_name:
-            return
-            
-        # 获取或创建标签
-        tag = self.tag_controller.get_or_create_tag(tag_name)
-        
-        # 如果标签已在列表中，选中它
-        if tag.id in self.tag_map:
-            self.tag_map[tag.id].setSelected(True)
-        else:
-            # 添加到列表并选中
-            item = QListWidgetItem(tag.tag)
-            item.setData(Qt.UserRole, tag.id)
-            item.setSelected(True)
-            self.tag_list.addItem(item)
-            self.tag_map[tag.id] = item
-        
-        # 清空输入框
-        self.new_tag_edit.clear()
-    
-    def get_task_data(self):
-        """获取表单数据
-        
-        Returns:
-            包含任务数据的字典，如果标题为空则返回None
-        """
-        title = self.title_edit.text().strip()
-        if not title:
-            return None
-            
-        # 从标题中提取标签
-        title, tag_in_title = self.task_controller.extract_tag(title)
-        
-        # 获取选中的标签ID
-        selected_tags = []
-        for item in self.tag_list.selectedItems():
-            tag_id = item.data(Qt.UserRole)
-            selected_tags.append(tag_id)
-            
-        # 如果标题中有标签，添加到选中的标签列表
-        if tag_in_title:
-            tag = self.tag_controller.get_or_create_tag(tag_in_title)
-            if tag.id not in selected_tags:
-                selected_tags.append(tag.id)
-                
-        # 获取截止日期
-        due_date_str = self.date_display.text()
-        due_date = None
-        if due_date_str and due_date_str != "无截止日期":
-            # QDate.fromString 如果格式不匹配会返回一个无效的QDate，我们需要检查
-            parsed_date = QDate.fromString(due_date_str, "yyyy-MM-dd")
-            if parsed_date.isValid():
-                 due_date = parsed_date.toString("yyyy-MM-dd")
-
-        # 获取优先级
-        priority = self.priority_combo.currentData()
-        
-        return {
-            "title": title,
-            "due_date": due_date,
-            "priority": priority,
-            "tag_ids": selected_tags
-        }
-
-
-class TagSelectionDialog(QDialog):
-    """标签选择对话框"""
-    
-    def __init__(self, tag_controller, selected_tag_ids=None, parent=None):
-        """初始化对话框
-        
-        Args:
-            tag_controller: 标签控制器
-            selected_tag_ids: 已选中的标签ID列表
-            parent: 父窗口
-        """
-        super().__init__(parent)
-        self.tag_controller = tag_controller
-        self.selected_tag_ids = selected_tag_ids or []
-        self.setWindowTitle("选择标签")
-        self.setMinimumWidth(300)
-        
-        self._init_ui()
-    
-    def _init_ui(self):
-        """初始化UI"""
-        layout = QVBoxLayout(self)
-        
-        # 标签列表
-        self.tag_list = QListWidget()
-        self.tag_list.setSelectionMode(QAbstractItemView.MultiSelection)
-        layout.addWidget(self.tag_list)
-        
-        # 添加新标签区域
-        new_tag_layout = QHBoxLayout()
-        self.new_tag_edit = QLineEdit()
-        self.new_tag_edit.setPlaceholderText("输入新标签")
-        self.add_tag_btn = QPushButton("+")
-        self.add_tag_btn.setMaximumWidth(30)
-        new_tag_layout.addWidget(self.new_tag_edit)
-        new_tag_layout.addWidget(self.add_tag_btn)
-        layout.addLayout(new_tag_layout)
-        
-        # 按钮区域
-        btn_layout = QHBoxLayout()
-        ok_btn = QPushButton("确定")
-        cancel_btn = QPushButton("取消")
-        btn_layout.addWidget(ok_btn)
-        btn_layout.addWidget(cancel_btn)
-        layout.addLayout(btn_layout)
-        
-        # 加载标签并选中已选标签
-        self.tag_map = {}
-        for tag in self.tag_controller.get_all_tags():
-            item = QListWidgetItem(tag.tag)
-            item.setData(Qt.UserRole, tag.id)
-            self.tag_list.addItem(item)
-            self.tag_map[tag.id] = item
-            
-            # 如果标签已经选中，则选中它
-            if tag.id in self.selected_tag_ids:
-                item.setSelected(True)
-        
-        # 连接信号
-        self.add_tag_btn.clicked.connect(self._add_new_tag)
-        ok_btn.clicked.connect(self.accept)
-        cancel_btn.clicked.connect(self.reject)
-    
-    def _add_new_tag(self):
-        """添加新标签"""
-        tag_name = self.new_tag_edit.text().strip()
-        if not tag_name:
-            return
-            
-        # 获取或创建标签
-        tag = self.tag_controller.get_or_create_tag(tag_name)
-        
-        # 如果标签已在列表中，选中它
-        if tag.id in self.tag_map:
-            self.tag_map[tag.id].setSelected(True)
-        else:
-            # 添加到列表并选中
-            item = QListWidgetItem(tag.tag)
-            item.setData(Qt.UserRole, tag.id)
-            item.setSelected(True)
-            self.tag_list.addItem(item)
-            self.tag_map[tag.id] = item
-        
-        # 清空输入框
-        self.new_tag_edit.clear()
-    
-    def get_selected_tag_ids(self):
-        """获取选中的标签ID列表
-        
-        Returns:
-            标签ID列表
-        """
-        selected_tags = []
-        for item in self.tag_list.selectedItems():
-            tag_id = item.data(Qt.UserRole)
-            selected_tags.append(tag_id)
-        return selected_tags
-
+from app.views.task_table_model import TaskTableModel, TaskActionDelegate
+from app.views.db_executor import InlineExecutor
 
 class TaskTab(QWidget):
     """任务标签页"""
@@ -380,20 +24,56 @@ class TaskTab(QWidget):
     # 定义信号
     task_changed = Signal()
     
-    def __init__(self, task_controller, tag_controller, parent=None):
+    # 单次变更超过该数量时整体重载表格
+    INCREMENTAL_UPDATE_LIMIT = 1000
+    
+    # 搜索框停止输入多久后执行搜索（毫秒）
+    SEARCH_DEBOUNCE_MS = 250
+    
+    # 任务列表的后台请求类别，新的加载请求会取代未完成的旧请求
+    LOAD_REQUEST = "task_list"
+    
+    # 检查日期是否变化（跨过零点后截止日期分组需要重新划分）的间隔（毫秒）
+    DUE_DAY_CHECK_MS = 60 * 1000
+    
+    def __init__(self, task_controller, tag_controller, parent=None, executor=None):
         """初始化标签页
         
         Args:
             task_controller: 任务控制器
             tag_controller: 标签控制器
             parent: 父窗口
+            executor: 执行列表查询的后台执行器 (DbExecutor)，为None时在当前线程同步执行
         """
         super().__init__(parent)
         self.task_controller = task_controller
         self.tag_controller = tag_controller
+        self.executor = executor or InlineExecutor(task_controller, tag_controller)
         self.selected_tags_for_new_task = []
+        # 当前的标签筛选条件及其结果（没有筛选时为None）
+        self.tag_filter = TagFilter()
+        # 当前选中的截止日期分组（为None时显示全部任务）
+        self.due_filter = None
+        self.filter_task_ids = None
+        # 截止日期分组按哪一天划分
+        self._due_day = date.today()
+        # 后台加载期间收到的任务变更 {任务ID: 变更类型}，加载完成后再应用
+        self._pending_changes = {}
+        # 复选框修改的写回队列：界面先行更新，连续的勾选合并后在一个事务中写入
+        self.write_timer = QTimer(self)
+        self.write_timer.setSingleShot(True)
+        self.write_timer.timeout.connect(self.flush_writes)
+        self.write_queue = WriteBehindQueue(task_controller, self._schedule_write, self._on_write_failed)
+        self.due_day_timer = QTimer(self)
+        self.due_day_timer.setInterval(self.DUE_DAY_CHECK_MS)
+        self.due_day_timer.timeout.connect(self._check_due_day)
         self._setup_ui()
         self.load_tasks()
+        self.due_day_timer.start()
+        
+        # 订阅控制器的变更事件，增量更新表格
+        self.task_controller.changes.subscribe(self._on_task_changes)
+        self.tag_controller.changes.subscribe(self._on_tag_changes)
 
     def _setup_ui(self):
         """设置UI"""
@@ -432,25 +112,108 @@ class TaskTab(QWidget):
         
         layout.addLayout(input_row)
         
-        # 任务表格
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels(["完成", "任务", "截止日期", "优先级", "标签", "操作"])
+        # 搜索框（输入停止后延迟执行，避免每个按键都查询一次）
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("搜索任务标题或标签")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        
+        # 标签筛选栏：全部包含 / 包含任一 / 排除
+        self.filter_all_btn = QPushButton()
+        self.filter_any_btn = QPushButton()
+        self.filter_none_btn = QPushButton()
+        self.clear_filter_btn = QPushButton("清除筛选")
+        
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(self.search_edit, 1)
+        filter_row.addWidget(self.filter_all_btn)
+        filter_row.addWidget(self.filter_any_btn)
+        filter_row.addWidget(self.filter_none_btn)
+        filter_row.addWidget(self.clear_filter_btn)
+        
+        layout.addLayout(filter_row)
+        
+        # 批量操作行（多选后可用）
+        bulk_row = QHBoxLayout()
+        self.loading_label = QLabel("正在加载…")
+        self.loading_label.setVisible(False)
+        bulk_row.addWidget(self.loading_label)
+        self.selection_label = QLabel()
+        self.bulk_complete_btn = QPushButton("标记完成")
+        self.bulk_tag_btn = QPushButton("添加标签")
+        self.bulk_delete_btn = QPushButton("删除所选")
+        bulk_row.addWidget(self.selection_label)
+        bulk_row.addStretch(1)
+        bulk_row.addWidget(self.bulk_complete_btn)
+        bulk_row.addWidget(self.bulk_tag_btn)
+        bulk_row.addWidget(self.bulk_delete_btn)
+        
+        layout.addLayout(bulk_row)
+        
+        # 任务表格（模型/视图，仅可见行参与绘制）
+        # 不设置同步数据源，后续页通过 page_requested 信号在后台读取
+        self.model = TaskTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(TaskTableModel.COL_COMPLETED, QHeaderView.ResizeToContents)
         self.table.horizontalHeader().setDefaultAlignment(Qt.AlignCenter)
         self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        
-        layout.addWidget(self.table)
+        # 固定行高，避免为每一行计算尺寸
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        
+        # 操作列由委托绘制按钮
+        self.action_delegate = TaskActionDelegate(self.table)
+        self.table.setItemDelegateForColumn(TaskTableModel.COL_ACTIONS, self.action_delegate)
+        
+        # 左侧为截止日期分组栏，数量由控制器的分组索引增量维护
+        self.due_list = QListWidget()
+        self.due_list.setMaximumWidth(160)
+        all_item = QListWidgetItem("全部任务")
+        all_item.setData(Qt.UserRole, None)
+        self.due_list.addItem(all_item)
+        for bucket in DUE_BUCKETS:
+            item = QListWidgetItem(DUE_BUCKET_NAMES[bucket])
+            item.setData(Qt.UserRole, bucket)
+            self.due_list.addItem(item)
+        self.due_list.setCurrentRow(0)
+        
+        content_row = QHBoxLayout()
+        content_row.addWidget(self.due_list)
+        content_row.addWidget(self.table, 1)
+        layout.addLayout(content_row)
         
         # 连接信号
         add_btn.clicked.connect(self.add_task)
         self.tag_btn.clicked.connect(self.select_tags)
-        self.table.cellChanged.connect(self.handle_cell_changed)
-        self.table.itemSelectionChanged.connect(self._on_task_selection_changed)
+        self.model.completion_toggled.connect(self.handle_completion_toggled)
+        self.model.page_requested.connect(self._request_page)
+        self.action_delegate.edit_requested.connect(self.edit_task)
+        self.action_delegate.delete_requested.connect(self.delete_task)
+        self.table.selectionModel().selectionChanged.connect(self._on_task_selection_changed)
+        self.bulk_complete_btn.clicked.connect(self.complete_selected_tasks)
+        self.bulk_tag_btn.clicked.connect(self.tag_selected_tasks)
+        self.bulk_delete_btn.clicked.connect(self.delete_selected_tasks)
+        self.search_edit.textChanged.connect(lambda _text: self.search_timer.start())
+        self.search_timer.timeout.connect(self.load_tasks)
+        self.filter_all_btn.clicked.connect(lambda: self.select_filter_tags("all_of"))
+        self.filter_any_btn.clicked.connect(lambda: self.select_filter_tags("any_of"))
+        self.filter_none_btn.clicked.connect(lambda: self.select_filter_tags("none_of"))
+        self.clear_filter_btn.clicked.connect(lambda: self.set_tag_filter(TagFilter()))
+        self.due_list.currentItemChanged.connect(self._on_due_bucket_selected)
+        self._update_filter_buttons()
+        self._on_task_selection_changed()
 
     def select_tags(self):
         """打开标签选择对话框"""
+        # 对话框在首次使用时才导入
+        from app.views.task_dialogs import TagSelectionDialog
+        
         dialog = TagSelectionDialog(
             self.tag_controller,
             self.selected_tags_for_new_task,
@@ -470,12 +233,8 @@ class TaskTab(QWidget):
             self.tag_btn.setText("选择标签")
             return
             
-        # 获取所有选中标签的名称
-        tag_names = []
-        for tag_id in self.selected_tags_for_new_task:
-            tag = self.tag_controller.get_tag_by_id(tag_id)
-            if tag:
-                tag_names.append(tag.tag)
+        # 获取所有选中标签的名称（走标签缓存）
+        tag_names = list(self.tag_controller.get_tag_names(self.selected_tags_for_new_task).values())
         
         # 如果标签太多，只显示前几个
         if len(tag_names) <= 2:
@@ -483,90 +242,214 @@ class TaskTab(QWidget):
         else:
             self.tag_btn.setText(f"{tag_names[0]}, {tag_names[1]}... (+{len(tag_names)-2})")
     
+    FILTER_LABELS = {"all_of": "包含全部", "any_of": "包含任一", "none_of": "排除"}
+    
+    def select_filter_tags(self, field):
+        """打开标签选择对话框，设置一种筛选条件
+        
+        Args:
+            field: TagFilter 的字段名 (all_of / any_of / none_of)
+        """
+        from app.views.task_dialogs import TagSelectionDialog
+        
+        dialog = TagSelectionDialog(self.tag_controller, list(getattr(self.tag_filter, field)), self)
+        if dialog.exec() == QDialog.Accepted:
+            self.set_tag_filter(self.tag_filter._replace(**{field: tuple(dialog.get_selected_tag_ids())}))
+    
+    def set_tag_filter(self, tag_filter):
+        """设置标签筛选条件并重新加载任务
+        
+        Args:
+            tag_filter: TagFilter
+        """
+        self.tag_filter = tag_filter
+        self._update_filter_buttons()
+        self.load_tasks()
+    
+    def _update_filter_buttons(self):
+        """在筛选按钮上显示已选标签"""
+        for field, button in (
+            ("all_of", self.filter_all_btn),
+            ("any_of", self.filter_any_btn),
+            ("none_of", self.filter_none_btn),
+        ):
+            label = self.FILTER_LABELS[field]
+            tag_ids = getattr(self.tag_filter, field)
+            if not tag_ids:
+                button.setText(f"{label}标签")
+                continue
+            tag_names = list(self.tag_controller.get_tag_names(tag_ids).values())
+            if len(tag_names) > 2:
+                tag_names = tag_names[:2] + [f"...(+{len(tag_names) - 2})"]
+            button.setText(f"{label}: {', '.join(tag_names)}")
+        self.clear_filter_btn.setEnabled(not self.tag_filter.is_empty())
+    
+    def _on_due_bucket_selected(self, current, previous=None):
+        """切换截止日期分组并重新加载任务"""
+        due_filter = None if current is None else current.data(Qt.UserRole)
+        if due_filter != self.due_filter:
+            self.due_filter = due_filter
+            self.load_tasks()
+    
+    def _update_due_counts(self):
+        """在分组栏中显示各截止日期分组的任务数量（读取索引中的数量，不查询数据库）"""
+        counts = self.task_controller.count_due_buckets(use_cached=True)
+        for row in range(1, self.due_list.count()):
+            item = self.due_list.item(row)
+            bucket = item.data(Qt.UserRole)
+            item.setText(f"{DUE_BUCKET_NAMES[bucket]} ({counts[bucket]})")
+    
+    def _check_due_day(self):
+        """跨过零点后按新的日期重新划分分组"""
+        if date.today() != self._due_day:
+            self.load_tasks()
+    
+    def _refresh_filter(self):
+        """按当前筛选条件重新计算任务ID集合（位图运算，不查询数据库）"""
+        task_ids = None
+        if not self.tag_filter.is_empty():
+            task_ids = self.task_controller.filter_by_tags(self.tag_filter)
+        if self.due_filter is not None:
+            due_task_ids = self.task_controller.filter_by_due(self.due_filter)
+            task_ids = due_task_ids if task_ids is None else task_ids & due_task_ids
+        self.filter_task_ids = task_ids
+    
     def load_tasks(self):
-        """加载所有任务"""
-        self.table.setRowCount(0)
+        """在后台重新加载任务，加载期间显示加载状态
+        
+        搜索框有内容时显示按相关度排序的搜索结果，
+        否则只读取第一页，其余在滚动时按需加载。两种情况都应用标签筛选和截止日期分组。
+        新的加载请求会取代尚未完成的旧请求（如连续修改筛选条件）。
+        数据库在此期间被命令行、导入等修改过时，先丢弃过期的筛选索引。
+        """
+        self.flush_writes()
+        self._due_day = date.today()
+        self.task_controller.sync_indexes()
+        self._refresh_filter()
+        self._update_due_counts()
+        query = self.search_edit.text().strip()
+        task_ids = self.filter_task_ids
+        
+        if query:
+            def fetch(controllers):
+                rows = controllers.tasks.search(query)
+                if task_ids is not None:
+                    rows = [row for row in rows if row.id in task_ids]
+                return rows, None
+        else:
+            def fetch(controllers):
+                return controllers.tasks.get_task_page(task_ids=task_ids)
         
-        for task in self.task_controller.get_all_tasks():
-            self._add_task_to_table(task)
+        self.model.begin_loading()
+        self._set_loading(True)
+        self.executor.submit(fetch, self._on_first_page_loaded, self._on_load_failed, key=self.LOAD_REQUEST)
     
-    def _add_task_to_table(self, task):
-        """将任务添加到表格
+    def _request_page(self, cursor):
+        """在后台读取下一页（响应模型的 page_requested 信号）
         
         Args:
-            task: 任务对象
+            cursor: 下一页游标
         """
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        
-        # 完成复选框
-        chk_item = QTableWidgetItem()
-        chk_item.setFlags(chk_item.flags() | Qt.ItemIsUserCheckable)
-        chk_item.setCheckState(Qt.Checked if task.completed else Qt.Unchecked)
-        chk_item.setData(Qt.UserRole, task.id)
-        chk_item.setTextAlignment(Qt.AlignCenter)
-        self.table.setItem(row, 0, chk_item)
-        
-        # 标题
-        title_item = QTableWidgetItem(task.title)
-        title_item.setTextAlignment(Qt.AlignCenter)
-        self.table.setItem(row, 1, title_item)
-        
-        # 截止日期
-        due_date_display_str = "无截止日期" # Default to show if effectively null
-        if task.due_date is not None:
-            is_1752_date = (task.due_date.year == 1752 and
-                            task.due_date.month == 9 and
-                            task.due_date.day == 14)
-            if not is_1752_date:
-                # It's a valid date and not the 1752 placeholder, so format it
-                due_date_display_str = task.due_date.strftime("%Y-%m-%d")
-        # If task.due_date is None, or if it's the 1752 date, due_date_display_str remains "无截止日期"
-        
-        due_date_item = QTableWidgetItem(due_date_display_str)
-        due_date_item.setTextAlignment(Qt.AlignCenter)
-        self.table.setItem(row, 2, due_date_item)
-        
-        # 优先级
-        priority_item = QTableWidgetItem(task.get_priority_name())
-        priority_item.setTextAlignment(Qt.AlignCenter)
-        
-        # 设置优先级单元格颜色
-        if task.priority > Priority.NONE:
-            color = task.get_priority_color()
-            priority_item.setForeground(QColor("white"))
-            priority_item.setBackground(QColor(color))
+        self.flush_writes()
+        task_ids = self.filter_task_ids
+        self._set_loading(True)
+        self.executor.submit(
+            lambda controllers: controllers.tasks.get_task_page(cursor, task_ids=task_ids),
+            self._on_page_loaded, self._on_load_failed, key=self.LOAD_REQUEST
+        )
+    
+    def _on_first_page_loaded(self, page):
+        """第一页加载完成"""
+        self.model.set_page(*page)
+        self._finish_loading()
+    
+    def _on_page_loaded(self, page):
+        """后续页加载完成"""
+        self.model.append_page(*page)
+        self._finish_loading()
+    
+    def _on_load_failed(self, error):
+        """后台加载失败"""
+        self.model.cancel_loading()
+        self._finish_loading()
+        QMessageBox.warning(self, "错误", f"加载任务失败: {error}")
+    
+    def _finish_loading(self):
+        """结束加载状态，并应用加载期间收到的任务变更"""
+        self._set_loading(False)
+        changes, self._pending_changes = self._pending_changes, {}
+        deleted = [task_id for task_id, kind in changes.items() if kind == DELETED]
+        changed = [task_id for task_id, kind in changes.items() if kind != DELETED]
+        if deleted:
+            self.model.remove_tasks(deleted)
+        if changed:
+            self._apply_task_changes(changed)
+    
+    def _set_loading(self, loading):
+        """显示或隐藏加载状态"""
+        self.loading_label.setVisible(loading)
+    
+    def _on_task_changes(self, event):
+        """按任务变更事件增量更新表格
+        
+        Args:
+            event: ChangeEvent
+        """
+        # 控制器的分组索引先于视图收到事件，此时数量已更新
+        self._update_due_counts()
+        if self.search_edit.text().strip():
+            # 搜索结果按相关度排序，直接重新搜索
+            self.load_tasks()
+        elif len(event.ids) > self.INCREMENTAL_UPDATE_LIMIT:
+            # 大批量变更时整体重载比逐行移动更快
+            self.load_tasks()
+        elif self.model.is_loading():
+            # 后台读取的页面可能早于这次变更，等页面返回后再应用
+            for task_id in event.ids:
+                self._pending_changes[task_id] = event.kind
+        elif event.kind == DELETED:
+            self.model.remove_tasks(event.ids)
         else:
-            priority_item.setForeground(QColor("gray"))
-        self.table.setItem(row, 3, priority_item)
-        
-        # 标签
-        tag_text = ", ".join([tag.tag for tag in task.tags]) if task.tags else ""
-        tag_item = QTableWidgetItem(tag_text)
-        tag_item.setTextAlignment(Qt.AlignCenter)
-        self.table.setItem(row, 4, tag_item)
-        
-        # 操作按钮
-        action_widget = QWidget()
-        hl = QHBoxLayout(action_widget)
-        hl.setContentsMargins(0, 0, 0, 0)
-        edit_btn = QPushButton("编辑")
-        delete_btn = QPushButton("删除")
-        hl.addStretch(1)
-        hl.addWidget(edit_btn)
-        hl.addWidget(delete_btn)
-        hl.addStretch(1)
-        self.table.setCellWidget(row, 5, action_widget)
+            self._apply_task_changes(list(event.ids))
+    
+    def _apply_task_changes(self, task_ids):
+        """重新读取变更的任务并更新到表格（按ID读取少量行，在当前线程执行）
         
-        # 连接信号
-        edit_btn.clicked.connect(lambda _, tid=task.id: self.edit_task(tid))
-        delete_btn.clicked.connect(lambda _, tid=task.id: self.delete_task(tid))
-        
-        # 如果任务已完成，添加删除线
-        if task.completed:
-            font = title_item.font()
-            font.setStrikeOut(True)
-            title_item.setFont(font)
+        Args:
+            task_ids: 新增或修改的任务ID列表
+        """
+        rows = self.task_controller.list_task_rows(task_ids)
+        if self.filter_task_ids is not None:
+            # 变更可能让任务进入或离开筛选结果
+            self._refresh_filter()
+            self.model.remove_tasks([row.id for row in rows if row.id not in self.filter_task_ids])
+            rows = [row for row in rows if row.id in self.filter_task_ids]
+        self.model.upsert_rows(rows)
+    
+    def _on_tag_changes(self, event):
+        """标签重命名、删除或合并后刷新任务的标签列
+        
+        Args:
+            event: ChangeEvent
+        """
+        if event.kind == CREATED:
+            return
+        if event.kind == DELETED:
+            # 从筛选条件中去掉已删除的标签
+            deleted = set(event.ids)
+            self.tag_filter = TagFilter(*(
+                tuple(tag_id for tag_id in tag_ids if tag_id not in deleted)
+                for tag_ids in self.tag_filter
+            ))
+        elif event.kind == MERGED:
+            # 筛选条件中被合并的标签换成目标标签
+            target_id, merged = event.ids[0], set(event.ids[1:])
+            self.tag_filter = TagFilter(*(
+                tuple(dict.fromkeys(target_id if tag_id in merged else tag_id for tag_id in tag_ids))
+                for tag_ids in self.tag_filter
+            ))
+        self._update_filter_buttons()
+        self.load_tasks()
     
     def _open_add_task_calendar_dialog(self):
         # 标记是否已选择"无截止日期"
@@ -652,10 +535,10 @@ class TaskTab(QWidget):
             "tag_ids": self.selected_tags_for_new_task
         }
         
+        self.flush_writes()
         new_task = self.task_controller.create_task(**task_data)
         
         if new_task:
-            self.load_tasks()
             self.new_title_edit.clear()
             self.new_date_display.setText("无截止日期") # 清空日期显示
             self.selected_tags_for_new_task = [] # 清空已选标签
@@ -666,14 +549,16 @@ class TaskTab(QWidget):
             QMessageBox.critical(self, "错误", "添加任务失败！")
 
     def edit_task(self, task_id):
+        self.flush_writes()
         task = self.task_controller.get_task_by_id(task_id)
         if task:
+            from app.views.task_dialogs import TaskEditDialog
+            
             dialog = TaskEditDialog(self.task_controller, self.tag_controller, task, self)
             if dialog.exec() == QDialog.Accepted:
                 task_data = dialog.get_task_data() # 修正方法名
                 if task_data:
                     self.task_controller.update_task(task_id, task_data) # 修正参数传递
-                    self.load_tasks()
                     self.task_changed.emit()
                 else:
                     QMessageBox.warning(self, "警告", "任务标题不能为空！")
@@ -683,48 +568,101 @@ class TaskTab(QWidget):
     def delete_task(self, task_id):
         reply = QMessageBox.question(self, "确认", "确定删除该任务吗？")
         if reply == QMessageBox.Yes:
+            self.flush_writes()
             self.task_controller.delete_task(task_id)
-            self.load_tasks()
             self.task_changed.emit()
         else:
             pass # 用户取消了删除
 
-    def handle_cell_changed(self, row, column):
-        """处理单元格变更，主要用于任务完成状态切换"""
-        if column == 0: # 第一列是复选框
-            item = self.table.item(row, column)
-            if not item:
-                return
-            
-            task_id = item.data(Qt.UserRole) # 假设任务ID存储在UserRole中
-            if task_id is None:
-                return # 没有关联的任务ID
-            
-            task = self.task_controller.get_task_by_id(task_id)
-            if not task:
-                return
+    def handle_completion_toggled(self, task_id, completed):
+        """处理复选框切换：模型已先行显示新状态，修改交给写回队列延迟写入
+        
+        Args:
+            task_id: 任务ID
+            completed: 新的完成状态
+        """
+        self.write_queue.submit(task_id, {"completed": completed}, previous={"completed": not completed})
+
+    def _schedule_write(self, delay):
+        """写回队列的调度函数：重新启动单次定时器
+        
+        Args:
+            delay: 延迟（秒）
+        """
+        self.write_timer.start(int(delay * 1000))
+
+    def flush_writes(self):
+        """立即写入写回队列中的修改（定时器到期、读取任务列表和其他修改之前、关闭窗口时）"""
+        self.write_timer.stop()
+        result = self.write_queue.flush()
+        if result.written:
+            self.task_changed.emit() # 发出信号通知其他组件（如图表）更新
+
+    def _on_write_failed(self, result):
+        """写回失败：只回滚失败任务的界面状态
+        
+        Args:
+            result: FlushResult
+        """
+        if result.error is None:
+            # 没有出错但未写入，说明任务已被删除
+            self.model.remove_tasks(list(result.failed))
+            return
+        for task_id, change in result.failed.items():
+            row = self.model.row_of(task_id)
+            if row >= 0 and "completed" in change.previous:
+                self.model.set_completed(row, change.previous["completed"])
+        QMessageBox.warning(self, "错误", f"更新任务状态失败: {result.error}")
+
+    def selected_task_ids(self):
+        """获取当前选中的任务ID列表
+        
+        Returns:
+            任务ID列表
+        """
+        rows = self.table.selectionModel().selectedRows()
+        return [self.model.task_id_at(index.row()) for index in rows]
 
-            new_completed_status = item.checkState() == Qt.CheckState.Checked
+    def complete_selected_tasks(self):
+        """将选中的任务批量标记为完成"""
+        task_ids = self.selected_task_ids()
+        if not task_ids:
+            return
+        self.flush_writes()
+        self.task_controller.bulk_set_completed(task_ids, True)
+        self.task_changed.emit()
+
+    def tag_selected_tasks(self):
+        """为选中的任务批量添加标签"""
+        task_ids = self.selected_task_ids()
+        if not task_ids:
+            return
             
-            # 调用控制器更新任务状态
-            # 假设 update_task 可以处理 'completed' 字段
-            updated_task = self.task_controller.update_task(task_id, {"completed": new_completed_status})
+        from app.views.task_dialogs import TagSelectionDialog
+        
+        dialog = TagSelectionDialog(self.tag_controller, parent=self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        tag_ids = dialog.get_selected_tag_ids()
+        if tag_ids:
+            self.flush_writes()
+            self.task_controller.bulk_add_tags(task_ids, tag_ids)
+            self.task_changed.emit()
 
-            if updated_task:
-                # 更新UI上的删除线
-                title_item = self.table.item(row, 1) # 假设第二列是标题
-                if title_item:
-                    font = title_item.font()
-                    font.setStrikeOut(new_completed_status)
-                    title_item.setFont(font)
-                
-                self.task_changed.emit() # 发出信号通知其他组件（如图表）更新
-            else:
-                # 可以添加错误处理，例如弹窗提示更新失败
-                QMessageBox.warning(self, "错误", f"更新任务 {task.title} 状态失败。")
-                # 恢复复选框状态以匹配实际数据
-                item.setCheckState(Qt.CheckState.Checked if task.completed else Qt.CheckState.Unchecked)
+    def delete_selected_tasks(self):
+        """批量删除选中的任务"""
+        task_ids = self.selected_task_ids()
+        if not task_ids:
+            return
+        reply = QMessageBox.question(self, "确认", f"确定删除选中的 {len(task_ids)} 个任务吗？")
+        if reply == QMessageBox.Yes:
+            self.flush_writes()
+            self.task_controller.bulk_delete(task_ids)
+            self.task_changed.emit()
 
-    def _on_task_selection_changed(self):
-        """处理任务选择变化"""
-        pass
+    def _on_task_selection_changed(self, selected=None, deselected=None):
+        """处理任务选择变化，更新批量操作按钮状态"""
+        count = len(self.table.selectionModel().selectedRows())
+        self.selection_label.setText(f"已选 {count} 项" if count else "")
+        for btn in (self.bulk_complete_btn, self.bulk_tag_btn, self.bulk_delete_btn):
+            btn.setEnabled(count > 0)
@@ -0,0 +1,491 @@
+from array import array
+from datetime import date, datetime
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, Signal
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton
+
+from app.models.task import Priority, PRIORITY_NAMES, PRIORITY_COLORS
+
+# 无截止日期在日期数组中的占位值（date.toordinal() 最小为 1）
+NO_DUE_DATE = 0
+
+# 创建时间以相对该时刻的秒数保存
+EPOCH = datetime(1970, 1, 1)
+
+
+class TaskTableModel(QAbstractTableModel):
+    """任务表格模型
+
+    行数据按列保存在紧凑数组中，视图只为可见行调用 data()，
+    因此任务数量再多也不会为每一行创建控件。
+    """
+
+    COLUMNS = ["完成", "任务", "截止日期", "优先级", "标签", "操作"]
+    COL_COMPLETED, COL_TITLE, COL_DUE_DATE, COL_PRIORITY, COL_TAGS, COL_ACTIONS = range(6)
+
+    # 复选框切换信号 (task_id, completed)
+    completion_toggled = Signal(int, bool)
+
+    # 异步分页时请求下一页 (cursor)
+    page_requested = Signal(object)
+
+    def __init__(self, parent=None):
+        """初始化模型
+
+        Args:
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._clear_arrays()
+        # 分页数据源: fetch_page(cursor) -> (rows, next_cursor)
+        self._fetch_page = None
+        self._page_pending = False
+        self._next_cursor = None
+        # 加载失败后不再请求后续页，避免滚动时反复失败
+        self._fetch_stopped = False
+        # 已加载区域末尾的排序键，还有更多数据时排在其后的行由 fetchMore 加载
+        self._loaded_until = None
+
+    def _clear_arrays(self):
+        """重置所有列数组"""
+        self._ids = array("q")
+        self._completed = array("b")
+        self._priorities = array("b")
+        self._due_dates = array("l")
+        self._created = array("d")
+        self._titles = []
+        self._tags = []
+        # 任务ID到放入时的排序键，查找行号时按它二分查找
+        self._keys = {}
+
+    # ---- 数据装载 ----
+
+    def set_rows(self, rows):
+        """用任务行替换模型中的全部数据（不分页）
+
+        Args:
+            rows: TaskRow 的可迭代序列
+        """
+        self.set_page(rows, None)
+
+    def set_page_source(self, fetch_page):
+        """设置同步分页数据源
+
+        未设置时为异步分页：fetchMore 发出 page_requested(cursor) 信号，
+        由调用方在后台读取后调用 append_page。
+
+        Args:
+            fetch_page: 可调用对象 fetch_page(cursor) -> (TaskRow 列表, 下一页游标)
+        """
+        self._fetch_page = fetch_page
+
+    def reload(self):
+        """清空模型并从同步分页数据源读取第一页"""
+        self.set_page(*self._fetch_page(None))
+
+    def begin_loading(self):
+        """标记正在后台加载第一页，加载完成（set_page）前不再请求后续页"""
+        self._page_pending = True
+
+    def cancel_loading(self):
+        """后台加载失败或被取消时清除加载标记，重新 set_page 前不再请求后续页"""
+        self._page_pending = False
+        self._fetch_stopped = True
+
+    def is_loading(self):
+        """是否有尚未返回的页面请求"""
+        return self._page_pending
+
+    def set_page(self, rows, next_cursor):
+        """用第一页数据替换模型中的全部数据
+
+        Args:
+            rows: TaskRow 序列
+            next_cursor: 下一页游标，没有更多数据时为None
+        """
+        self.beginResetModel()
+        self._clear_arrays()
+        self._page_pending = False
+        self._fetch_stopped = False
+        self._next_cursor = next_cursor
+        self._loaded_until = None
+        for row in rows:
+            self._append(row)
+        if rows and next_cursor is not None:
+            self._loaded_until = self._sort_key(self._columns_of(rows[-1]))
+        self.endResetModel()
+
+    def append_page(self, rows, next_cursor):
+        """在末尾追加后续一页
+
+        页面在后台读取期间，已加载的行可能通过 upsert_rows 更新过，
+        已在模型中的任务会被跳过。
+
+        Args:
+            rows: TaskRow 序列
+            next_cursor: 下一页游标，没有更多数据时为None
+        """
+        self._page_pending = False
+        if rows:
+            self._loaded_until = self._sort_key(self._columns_of(rows[-1]))
+        rows = [row for row in rows if row.id not in self._keys]
+        if rows:
+            first = len(self._ids)
+            self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+            for row in rows:
+                self._append(row)
+            self.endInsertRows()
+        self._next_cursor = next_cursor
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and not self._page_pending and not self._fetch_stopped
+                and self._next_cursor is not None)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        if self._fetch_page is not None:
+            self.append_page(*self._fetch_page(self._next_cursor))
+        else:
+            self._page_pending = True
+            self.page_requested.emit(self._next_cursor)
+
+    def _append(self, row):
+        """将一行任务追加到列数组末尾（不发出信号）
+
+        Args:
+            row: TaskRow
+        """
+        self._put(len(self._ids), self._columns_of(row))
+
+    @staticmethod
+    def _columns_of(row):
+        """将 TaskRow 转换为各列数组中保存的值
+
+        Args:
+            row: TaskRow
+
+        Returns:
+            (id, completed, priority, due_date, created, title, tags) 元组
+        """
+        # 没有创建时间的任务在 SQL 的降序排序中排在最后
+        created = (row.created_at - EPOCH).total_seconds() if row.created_at else float("-inf")
+        return (
+            row.id,
+            1 if row.completed else 0,
+            int(row.priority or Priority.NONE),
+            row.due_date.toordinal() if row.due_date else NO_DUE_DATE,
+            created,
+            row.title,
+            ", ".join(row.tags),
+        )
+
+    def _put(self, i, values):
+        """在第 i 行插入一行列值（不发出信号）"""
+        task_id, completed, priority, due_date, created, title, tags = values
+        self._keys[task_id] = self._sort_key(values)
+        self._ids.insert(i, task_id)
+        self._completed.insert(i, completed)
+        self._priorities.insert(i, priority)
+        self._due_dates.insert(i, due_date)
+        self._created.insert(i, created)
+        self._titles.insert(i, title)
+        self._tags.insert(i, tags)
+
+    def _take(self, i):
+        """移除第 i 行并返回其列值（不发出信号）"""
+        values = (
+            self._ids[i], self._completed[i], self._priorities[i], self._due_dates[i],
+            self._created[i], self._titles[i], self._tags[i],
+        )
+        del self._keys[self._ids[i]]
+        for column in (self._ids, self._completed, self._priorities, self._due_dates,
+                       self._created, self._titles, self._tags):
+            del column[i]
+        return values
+
+    # ---- 增量更新 ----
+
+    @staticmethod
+    def _sort_key(values):
+        """计算与 TaskController.list_task_rows 相同的排序键
+
+        Args:
+            values: _columns_of 返回的列值
+
+        Returns:
+            可比较的元组
+        """
+        task_id, completed, priority, due_date, created, _, _ = values
+        return (completed, due_date == NO_DUE_DATE, due_date, -priority, -created, -task_id)
+
+    def _row_key(self, i):
+        """第 i 行放入时的排序键
+
+        set_completed 的临时修改在变更事件到达、行被移动之前不改变该键，
+        各行的键因此始终与行的顺序一致，可以二分查找。
+        """
+        return self._keys[self._ids[i]]
+
+    def _insertion_point(self, key):
+        """二分查找排序键在当前行中的插入位置
+
+        Args:
+            key: 排序键
+
+        Returns:
+            行号
+        """
+        low, high = 0, len(self._ids)
+        while low < high:
+            mid = (low + high) // 2
+            if self._row_key(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _beyond_loaded(self, key):
+        """排序键是否落在尚未加载的区域（之后由 fetchMore 加载）"""
+        return self._next_cursor is not None and self._loaded_until is not None and key > self._loaded_until
+
+    def upsert_rows(self, rows):
+        """插入新任务或更新已有任务，并放到排序后的正确位置
+
+        分页加载时，排在已加载区域之后的行不插入，等滚动到时再加载。
+
+        Args:
+            rows: TaskRow 序列
+        """
+        for row in rows:
+            values = self._columns_of(row)
+            old = self.row_of(row.id)
+            if self._beyond_loaded(self._sort_key(values)):
+                if old >= 0:
+                    self.beginRemoveRows(QModelIndex(), old, old)
+                    self._take(old)
+                    self.endRemoveRows()
+                continue
+            if old < 0:
+                position = self._insertion_point(self._sort_key(values))
+                self.beginInsertRows(QModelIndex(), position, position)
+                self._put(position, values)
+                self.endInsertRows()
+                continue
+
+            # 先临时移除旧行，计算新位置后再放回，保证 begin/end 之间才修改数据
+            old_values = self._take(old)
+            position = self._insertion_point(self._sort_key(values))
+            self._put(old, old_values)
+            if position != old:
+                # beginMoveRows 的目标位置按移除前的行号计算
+                self.beginMoveRows(QModelIndex(), old, old, QModelIndex(), position + 1 if position > old else position)
+                self._take(old)
+                self._put(position, values)
+                self.endMoveRows()
+            else:
+                self._take(old)
+                self._put(old, values)
+            self.dataChanged.emit(self.index(position, 0), self.index(position, self.columnCount() - 1))
+
+    def remove_tasks(self, task_ids):
+        """从模型中移除任务
+
+        Args:
+            task_ids: 任务ID序列
+        """
+        for task_id in task_ids:
+            row = self.row_of(task_id)
+            if row < 0:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._take(row)
+            self.endRemoveRows()
+
+    def task_id_at(self, row):
+        """返回指定行的任务ID
+
+        Args:
+            row: 行号
+
+        Returns:
+            任务ID
+        """
+        return self._ids[row]
+
+    def row_of(self, task_id):
+        """返回任务所在行号
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            行号，如果任务不在模型中则返回-1
+        """
+        key = self._keys.get(task_id)
+        if key is None:
+            return -1
+        row = self._insertion_point(key)
+        if row < len(self._ids) and self._ids[row] == task_id:
+            return row
+        # 行不是按排序键排列的（如按相关度排序的搜索结果），逐行查找
+        return self._ids.index(task_id)
+
+    def set_completed(self, row, completed):
+        """更新指定行的完成状态（不发出 completion_toggled 信号）
+
+        Args:
+            row: 行号
+            completed: 是否完成
+        """
+        self._completed[row] = 1 if completed else 0
+        self.dataChanged.emit(self.index(row, self.COL_COMPLETED), self.index(row, self.COL_TITLE))
+
+    # ---- Qt 模型接口 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == self.COL_COMPLETED:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+
+        if role == Qt.DisplayRole:
+            if column == self.COL_TITLE:
+                return self._titles[row]
+            if column == self.COL_DUE_DATE:
+                return self._format_due_date(self._due_dates[row])
+            if column == self.COL_PRIORITY:
+                return PRIORITY_NAMES[self._priorities[row]]
+            if column == self.COL_TAGS:
+                return self._tags[row]
+            return None
+        if role == Qt.CheckStateRole and column == self.COL_COMPLETED:
+            return Qt.Checked if self._completed[row] else Qt.Unchecked
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.FontRole and column == self.COL_TITLE and self._completed[row]:
+            # 已完成的任务显示删除线
+            font = QApplication.font()
+            font.setStrikeOut(True)
+            return font
+        if column == self.COL_PRIORITY:
+            priority = self._priorities[row]
+            if role == Qt.ForegroundRole:
+                return QColor("white") if priority > Priority.NONE else QColor("gray")
+            if role == Qt.BackgroundRole and priority > Priority.NONE:
+                return QColor(PRIORITY_COLORS[priority])
+        if role == Qt.UserRole:
+            return self._ids[row]
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole or index.column() != self.COL_COMPLETED:
+            return False
+        # PySide6 在不同版本中可能传入枚举或整数
+        completed = Qt.CheckState(value) == Qt.Checked
+        row = index.row()
+        if bool(self._completed[row]) == completed:
+            return False
+        self.set_completed(row, completed)
+        self.completion_toggled.emit(self._ids[row], completed)
+        return True
+
+    @staticmethod
+    def _format_due_date(ordinal):
+        """格式化截止日期
+
+        Args:
+            ordinal: 日期序数，NO_DUE_DATE 表示无截止日期
+
+        Returns:
+            显示用的日期字符串
+        """
+        if ordinal == NO_DUE_DATE:
+            return "无截止日期"
+        return date.fromordinal(ordinal).strftime("%Y-%m-%d")
+
+
+class TaskActionDelegate(QStyledItemDelegate):
+    """操作列委托
+
+    直接绘制“编辑”“删除”两个按钮并处理点击，代替每行一个真实的按钮控件。
+    """
+
+    edit_requested = Signal(int)
+    delete_requested = Signal(int)
+
+    BUTTON_TEXTS = ("编辑", "删除")
+    BUTTON_SPACING = 4
+    BUTTON_PADDING = 16
+
+    def _button_rects(self, option):
+        """计算两个按钮在单元格中的位置
+
+        Args:
+            option: 单元格样式选项
+
+        Returns:
+            按钮矩形列表
+        """
+        metrics = option.fontMetrics
+        widths = [metrics.horizontalAdvance(text) + self.BUTTON_PADDING for text in self.BUTTON_TEXTS]
+        total = sum(widths) + self.BUTTON_SPACING * (len(widths) - 1)
+        rect = option.rect
+        x = rect.x() + max(0, (rect.width() - total) // 2)
+        height = min(rect.height() - 2, metrics.height() + 8)
+        y = rect.y() + (rect.height() - height) // 2
+        rects = []
+        for width in widths:
+            rects.append(QRect(x, y, width, height))
+            x += width + self.BUTTON_SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        style = option.widget.style() if option.widget else QApplication.style()
+        # 先绘制选中等背景
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+        for text, rect in zip(self.BUTTON_TEXTS, self._button_rects(option)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = text
+            button.state = QStyle.State_Enabled | QStyle.State_Raised
+            style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        rects = self._button_rects(option)
+        size.setWidth(rects[-1].right() - rects[0].left() + self.BUTTON_PADDING)
+        return size
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+        pos = event.position().toPoint()
+        edit_rect, delete_rect = self._button_rects(option)
+        task_id = index.data(Qt.UserRole)
+        if edit_rect.contains(pos):
+            self.edit_requested.emit(task_id)
+            return True
+        if delete_rect.contains(pos):
+            self.delete_requested.emit(task_id)
+            return True
+        return False
@@ -0,0 +1,129 @@
+"""
+基准测试命令行
+用法:
+    python -m benchmarks generate --preset 100k
+    python -m benchmarks run --preset 10k --output results.json [--baseline baseline.json]
+    python -m benchmarks compare baseline.json results.json
+    python -m benchmarks list
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.compare import (
+    DEFAULT_MIN_DELTA, DEFAULT_THRESHOLD, REGRESSION,
+    compare_results, compatibility_warnings, format_comparison, load_results,
+)
+from benchmarks.dataset import PRESETS, build_dataset, dataset_path, resolve_spec
+from benchmarks.suite import DEFAULT_REPEAT, DEFAULT_WARMUP, run_suite, select_benchmarks
+
+def _spec(args):
+    """由命令行参数得到数据集参数"""
+    return resolve_spec(args.preset, args.tasks, args.tags, args.seed)
+
+def _report_compare(baseline, current, args) -> int:
+    """打印对比结果，有回归时返回1"""
+    for warning in compatibility_warnings(baseline, current):
+        print(f"警告: {warning}", file=sys.stderr)
+    comparisons = compare_results(baseline, current, args.metric, args.threshold, args.min_delta)
+    print(format_comparison(comparisons, args.metric))
+    regressions = [c for c in comparisons if c.status == REGRESSION]
+    if regressions:
+        print(f"\n{len(regressions)} 项回归（阈值 {args.threshold:.0%}）", file=sys.stderr)
+        return 1
+    return 0
+
+def cmd_generate(args):
+    """生成（或重新生成）数据集"""
+    spec = _spec(args)
+    path = dataset_path(spec, args.data_dir)
+    if path.exists() and not args.force:
+        print(f"数据集已存在: {path}")
+        return 0
+    started = time.perf_counter()
+    build_dataset(spec, path, lambda written: print(f"\r已写入 {written} 个任务", end="", file=sys.stderr, flush=True))
+    print(file=sys.stderr)
+    print(f"已生成 {path}（{time.perf_counter() - started:.1f}s）")
+    return 0
+
+def cmd_run(args):
+    """运行基准并输出结果"""
+    spec = _spec(args)
+    baseline = load_results(args.baseline) if args.baseline else None
+
+    def report(name, stats):
+        print(f"{name:<36} median {stats['median'] * 1000:>10.3f} ms  min {stats['min'] * 1000:>10.3f} ms", flush=True)
+
+    print(f"数据集: {spec.tasks} 个任务，{spec.tags} 个标签（种子 {spec.seed}）", file=sys.stderr)
+    results = run_suite(spec, args.warmup, args.repeat, args.only, args.data_dir, report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}", file=sys.stderr)
+    if baseline is not None:
+        print()
+        return _report_compare(baseline, results, args)
+    return 0
+
+def cmd_compare(args):
+    """对比两个结果文件"""
+    return _report_compare(load_results(args.baseline), load_results(args.current), args)
+
+def cmd_list(args):
+    """列出所有基准"""
+    for benchmark in select_benchmarks(args.only):
+        print(f"{benchmark.name}{'  (写)' if benchmark.write else ''}")
+    return 0
+
+def _add_dataset_arguments(parser):
+    parser.add_argument("--preset", choices=list(PRESETS), help="数据集规模预设（默认 10k）")
+    parser.add_argument("--tasks", type=int, help="任务数（覆盖预设）")
+    parser.add_argument("--tags", type=int, help="标签数（覆盖预设）")
+    parser.add_argument("--seed", type=int, help="随机种子（覆盖预设）")
+    parser.add_argument("--data-dir", help="数据集缓存目录")
+
+def _add_compare_arguments(parser):
+    parser.add_argument("--metric", choices=["min", "median", "mean", "p95"], default="median", help="对比的统计量")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="判定回归的相对阈值")
+    parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA, help="忽略小于该值（秒）的绝对变化")
+
+def build_parser() -> argparse.ArgumentParser:
+    """构造命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="TaskMoment 控制器基准测试")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="生成数据集")
+    _add_dataset_arguments(generate)
+    generate.add_argument("--force", action="store_true", help="数据集已存在时重新生成")
+    generate.set_defaults(func=cmd_generate)
+
+    run = commands.add_parser("run", help="运行基准")
+    _add_dataset_arguments(run)
+    run.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="每个基准的预热次数")
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="每个基准计时的次数")
+    run.add_argument("--only", action="append", help="只运行名称匹配该通配符的基准，可重复指定")
+    run.add_argument("--output", help="结果 JSON 文件路径")
+    run.add_argument("--baseline", help="与该基线结果对比，有回归时返回非零退出码")
+    _add_compare_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="对比两个结果文件")
+    compare.add_argument("baseline", help="基线结果文件")
+    compare.add_argument("current", help="本次结果文件")
+    _add_compare_arguments(compare)
+    compare.set_defaults(func=cmd_compare)
+
+    list_ = commands.add_parser("list", help="列出所有基准")
+    list_.add_argument("--only", action="append", help="名称通配符")
+    list_.set_defaults(func=cmd_list)
+    return parser
+
+def main(argv=None) -> int:
+    """命令行入口函数"""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
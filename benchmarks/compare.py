@@ -0,0 +1,106 @@
+"""
+基准结果对比
+把本次结果与保存的基线逐项对比，超过阈值的变慢标记为回归。
+"""
+
+import json
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from benchmarks.suite import RESULT_VERSION
+
+# 判定回归的默认阈值：比基线慢 10% 以上
+DEFAULT_THRESHOLD = 0.10
+
+# 绝对差值小于该值（秒）时不判定回归，避免微秒级操作的计时噪声
+DEFAULT_MIN_DELTA = 0.0005
+
+# 对比状态
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "ok"
+MISSING = "missing"  # 基线中有、本次没有
+NEW = "new"  # 本次新增
+
+class Comparison(NamedTuple):
+    """一个基准的对比结果"""
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+    change: Optional[float]  # 相对变化，0.25 表示慢了 25%
+    status: str
+
+def load_results(path) -> Dict[str, Any]:
+    """读取结果文件
+
+    Raises:
+        ValueError: 文件格式版本不支持
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != RESULT_VERSION:
+        raise ValueError(f"不支持的结果文件版本: {data.get('version')}（{path}）")
+    return data
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], metric: str = "median",
+                    threshold: float = DEFAULT_THRESHOLD, min_delta: float = DEFAULT_MIN_DELTA) -> List[Comparison]:
+    """逐项对比两次结果
+
+    Args:
+        baseline: 基线结果
+        current: 本次结果
+        metric: 使用的统计量（min/median/mean/p95）
+        threshold: 相对变化超过该值时判定为回归或改进
+        min_delta: 绝对变化不超过该值（秒）时视为不变
+
+    Returns:
+        按本次结果顺序排列的对比结果，基线中多出的基准排在最后
+    """
+    base_results = baseline["results"]
+    current_results = current["results"]
+    comparisons = []
+    for name, stats in current_results.items():
+        value = stats[metric]
+        base_stats = base_results.get(name)
+        if base_stats is None:
+            comparisons.append(Comparison(name, None, value, None, NEW))
+            continue
+        base_value = base_stats[metric]
+        change = value / base_value - 1 if base_value else 0.0
+        if abs(value - base_value) <= min_delta:
+            status = UNCHANGED
+        elif change > threshold:
+            status = REGRESSION
+        elif change < -threshold:
+            status = IMPROVEMENT
+        else:
+            status = UNCHANGED
+        comparisons.append(Comparison(name, base_value, value, change, status))
+    for name, stats in base_results.items():
+        if name not in current_results:
+            comparisons.append(Comparison(name, stats[metric], None, None, MISSING))
+    return comparisons
+
+def compatibility_warnings(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """列出两次结果中影响可比性的差异（数据集、环境）"""
+    warnings = []
+    if baseline.get("dataset") != current.get("dataset"):
+        warnings.append("数据集参数不同，结果不可直接比较")
+    for key, value in current.get("environment", {}).items():
+        base_value = baseline.get("environment", {}).get(key)
+        if base_value != value:
+            warnings.append(f"运行环境不同: {key} {base_value} -> {value}")
+    if baseline.get("profile") != current.get("profile"):
+        warnings.append("SQLite 配置不同")
+    return warnings
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.3f}"
+
+def format_comparison(comparisons: List[Comparison], metric: str = "median") -> str:
+    """格式化为对比表格"""
+    width = max([len(c.name) for c in comparisons] + [len("benchmark")])
+    lines = [f"{'benchmark':<{width}}  {'base ' + metric + ' ms':>18}  {'current ms':>12}  {'change':>8}  status"]
+    for c in comparisons:
+        change = "-" if c.change is None else f"{c.change:+.1%}"
+        lines.append(f"{c.name:<{width}}  {_ms(c.baseline):>18}  {_ms(c.current):>12}  {change:>8}  {c.status}")
+    return "\n".join(lines)
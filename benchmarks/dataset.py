@@ -0,0 +1,203 @@
+"""
+基准测试数据集
+按 DatasetSpec 确定性地生成任务、标签和关联：相同的参数总是生成完全相同的数据库。
+
+- 标签使用频率服从 Zipf 分布，少数常用标签覆盖大部分任务
+- 每个任务 0~5 个标签，截止日期以参考日期为中心正态分布，部分任务没有截止日期
+- 创建时间、优先级、完成状态按固定比例随机分布
+
+生成的数据库缓存在数据目录中，文件名包含参数摘要，参数不变时直接复用。
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from app.models.base import Base, TASK_FTS_REBUILD, TASK_FTS_TRIGGERS, create_sqlite_engine
+from app.utils.migrate_db import migrate_database
+
+# 默认的数据集缓存目录
+DEFAULT_DATA_DIR = Path(tempfile.gettempdir()) / "taskmoment-benchmarks"
+
+# 生成时每个事务写入的任务数
+GENERATE_CHUNK_SIZE = 50000
+
+# 标题用词
+_TITLE_VERBS = ("整理", "提交", "审核", "准备", "回复", "更新", "讨论", "修复", "安排", "确认", "编写", "检查")
+_TITLE_NOUNS = (
+    "周报", "合同", "预算", "邮件", "设计稿", "会议纪要", "报销单", "测试用例",
+    "发布计划", "客户反馈", "年度总结", "需求文档", "体检预约", "机票", "房租", "读书笔记",
+)
+# 最常用的几个标签名称，其余标签按序号命名
+_COMMON_TAGS = ("工作", "家庭", "学习", "重要", "紧急", "购物", "健康", "财务", "旅行", "阅读")
+
+# 每个任务的标签数及其权重
+_TAGS_PER_TASK = (0, 1, 2, 3, 4, 5)
+_TAGS_PER_TASK_WEIGHTS = (20, 35, 25, 12, 5, 3)
+
+# 优先级（无/低/中/高）的权重
+_PRIORITY_WEIGHTS = (50, 25, 15, 10)
+
+class DatasetSpec(NamedTuple):
+    """数据集参数"""
+    tasks: int
+    tags: int
+    seed: int = 42
+    zipf_exponent: float = 1.1  # 标签频率的 Zipf 指数，越大越集中
+    no_due_ratio: float = 0.3  # 没有截止日期的任务比例
+    due_spread_days: int = 60  # 截止日期的标准差（天）
+    completed_ratio: float = 0.35  # 已完成任务比例
+    reference_date: str = "2025-01-01"  # 截止日期分布的中心，也是创建时间的上限
+
+    @property
+    def digest(self) -> str:
+        """参数摘要，用作缓存文件名"""
+        payload = json.dumps(self._asdict(), sort_keys=True).encode("utf-8")
+        return hashlib.sha1(payload).hexdigest()[:12]
+
+# 预设规模
+PRESETS = {
+    "10k": DatasetSpec(tasks=10_000, tags=200),
+    "100k": DatasetSpec(tasks=100_000, tags=1_000),
+    "1m": DatasetSpec(tasks=1_000_000, tags=5_000),
+}
+
+def tag_names(spec: DatasetSpec) -> List[str]:
+    """按使用频率从高到低排列的标签名称（第 i 个标签的ID为 i+1）"""
+    names = list(_COMMON_TAGS[:spec.tags])
+    names.extend(f"项目{index:05d}" for index in range(len(names), spec.tags))
+    return names
+
+def generate_rows(spec: DatasetSpec) -> Iterator[Tuple[tuple, List[int]]]:
+    """确定性地生成任务行
+
+    Yields:
+        ((id, title, completed, created_at, due_date, priority), 标签ID列表)
+    """
+    rng = random.Random(spec.seed)
+    reference = date.fromisoformat(spec.reference_date)
+    created_end = datetime.combine(reference, datetime.min.time())
+    year_seconds = 365 * 24 * 3600
+
+    # Zipf 累计权重，rng.choices 按累计权重二分查找
+    tag_cum_weights = list(accumulate(1.0 / rank ** spec.zipf_exponent for rank in range(1, spec.tags + 1)))
+    count_cum_weights = list(accumulate(_TAGS_PER_TASK_WEIGHTS))
+    priority_cum_weights = list(accumulate(_PRIORITY_WEIGHTS))
+    tag_ids = range(1, spec.tags + 1)
+
+    for task_id in range(1, spec.tasks + 1):
+        title = f"{rng.choice(_TITLE_VERBS)}{rng.choice(_TITLE_NOUNS)} {task_id}"
+        if rng.random() < spec.no_due_ratio:
+            due_date = None
+        else:
+            due_date = (reference + timedelta(days=round(rng.gauss(0, spec.due_spread_days)))).isoformat()
+        created_at = (created_end - timedelta(seconds=rng.randrange(year_seconds))).isoformat(" ")
+        completed = rng.random() < spec.completed_ratio
+        priority = rng.choices((0, 1, 2, 3), cum_weights=priority_cum_weights)[0]
+
+        tag_count = rng.choices(_TAGS_PER_TASK, cum_weights=count_cum_weights)[0] if spec.tags else 0
+        links = list(dict.fromkeys(rng.choices(tag_ids, cum_weights=tag_cum_weights, k=tag_count))) if tag_count else []
+        yield (task_id, title, completed, created_at, due_date, priority), links
+
+def dataset_path(spec: DatasetSpec, data_dir=None) -> Path:
+    """数据集的缓存文件路径"""
+    return Path(data_dir or DEFAULT_DATA_DIR) / f"tasks-{spec.tasks}-{spec.digest}.db"
+
+def build_dataset(spec: DatasetSpec, path, progress=None):
+    """生成数据集数据库
+
+    先用应用自身的建表和迁移流程建出最新结构，再用 sqlite3 批量写入。
+    写入期间暂时删除全文索引触发器，写完后重建触发器并一次性重建全文索引，
+    结果与逐条写入完全一致；标签计数仍由触发器维护。
+
+    Args:
+        spec: 数据集参数
+        path: 输出路径（已存在时覆盖）
+        progress: progress(已写入任务数) 回调
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    if temp_path.exists():
+        temp_path.unlink()
+
+    engine = create_sqlite_engine(temp_path)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    migrate_database(temp_path, verbose=False)
+
+    conn = sqlite3.connect(temp_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("BEGIN")
+        fts_triggers = [name for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'task_fts_%'"
+        )]
+        for name in fts_triggers:
+            conn.execute(f"DROP TRIGGER {name}")
+
+        conn.executemany("INSERT INTO tag (id, tag) VALUES (?, ?)", enumerate(tag_names(spec), 1))
+        tasks: List[tuple] = []
+        links: List[Tuple[int, int]] = []
+        written = 0
+
+        def flush():
+            conn.executemany(
+                "INSERT INTO task (id, title, completed, created_at, due_date, priority) VALUES (?, ?, ?, ?, ?, ?)",
+                tasks,
+            )
+            conn.executemany("INSERT INTO task_tags (task_id, tag_id) VALUES (?, ?)", links)
+            tasks.clear()
+            links.clear()
+
+        for task, tag_ids in generate_rows(spec):
+            tasks.append(task)
+            links.extend((task[0], tag_id) for tag_id in tag_ids)
+            if len(tasks) >= GENERATE_CHUNK_SIZE:
+                written += len(tasks)
+                flush()
+                if progress is not None:
+                    progress(written)
+        written += len(tasks)
+        flush()
+
+        for trigger_sql in TASK_FTS_TRIGGERS:
+            conn.execute(trigger_sql)
+        for statement in TASK_FTS_REBUILD:
+            conn.execute(statement)
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    if progress is not None and written % GENERATE_CHUNK_SIZE:
+        progress(written)
+    os.replace(temp_path, path)
+
+def ensure_dataset(spec: DatasetSpec, data_dir=None, progress=None) -> Path:
+    """返回数据集路径，缓存中没有时先生成，已缓存的旧数据集先升级到当前结构"""
+    path = dataset_path(spec, data_dir)
+    if not path.exists():
+        build_dataset(spec, path, progress)
+    else:
+        migrate_database(path, verbose=False)
+    return path
+
+def resolve_spec(preset: Optional[str] = None, tasks: Optional[int] = None,
+                 tags: Optional[int] = None, seed: Optional[int] = None) -> DatasetSpec:
+    """由预设名称和覆盖参数得到数据集参数
+
+    Raises:
+        ValueError: 未知的预设名称
+    """
+    if preset is not None and preset not in PRESETS:
+        raise ValueError(f"未知的数据集预设: {preset}（可选 {', '.join(PRESETS)}）")
+    spec = PRESETS[preset or "10k"]
+    overrides = {key: value for key, value in (("tasks", tasks), ("tags", tags), ("seed", seed)) if value is not None}
+    return spec._replace(**overrides)
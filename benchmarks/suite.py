@@ -0,0 +1,278 @@
+"""
+控制器基准测试
+在数据集的工作副本上逐个计时 TaskController / TagController 的操作。
+
+每个基准先预热若干次，再重复执行并记录每次耗时；需要准备数据的操作（如删除）
+在 setup 中准备，准备时间不计入。每个基准使用新的会话和控制器，
+缓存状态只来自本基准的预热。写操作排在读操作之后，避免影响读操作的数据规模。
+"""
+
+import fnmatch
+import math
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import sqlalchemy
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers.tag_controller import TagController
+from app.controllers.tag_index import TagFilter
+from app.controllers.task_controller import TaskController
+from app.models.base import create_sqlite_engine
+from app.models.task import Priority
+from benchmarks.dataset import DatasetSpec, ensure_dataset, tag_names
+
+# 结果文件格式版本
+RESULT_VERSION = 1
+
+# 默认预热和重复次数
+DEFAULT_WARMUP = 1
+DEFAULT_REPEAT = 5
+
+# 批量操作每次处理的任务数
+BULK_SIZE = 100
+
+class BenchContext:
+    """基准执行时可用的控制器和数据集信息"""
+
+    def __init__(self, session, spec: DatasetSpec):
+        self.session = session
+        self.spec = spec
+        self.tags = TagController(session)
+        self.tasks = TaskController(session, self.tags)
+        # 每个基准用固定种子，多次运行选中相同的任务和标签
+        self.rng = random.Random(spec.seed)
+        self.tag_names = tag_names(spec)
+        self._counter = 0
+
+    def unique(self, prefix: str) -> str:
+        """本次运行中不重复的名称"""
+        self._counter += 1
+        return f"{prefix}-{self._counter}"
+
+    def task_id(self) -> int:
+        """随机选取一个数据集中的任务ID"""
+        return self.rng.randint(1, self.spec.tasks)
+
+    def task_ids(self, count: int = BULK_SIZE) -> List[int]:
+        """随机选取多个不同的任务ID"""
+        return self.rng.sample(range(1, self.spec.tasks + 1), min(count, self.spec.tasks))
+
+    def tag_id(self, rank: int = 0) -> int:
+        """按使用频率排名取标签ID（0 为最常用），超出范围时取最后一个"""
+        return min(rank, self.spec.tags - 1) + 1
+
+class Benchmark(NamedTuple):
+    """一个基准操作"""
+    name: str
+    run: Callable[..., Any]  # run(ctx, *setup 返回值)
+    setup: Optional[Callable[[BenchContext], tuple]] = None  # 每次执行前调用，不计时
+    write: bool = False
+
+def _deep_cursor(ctx: BenchContext) -> tuple:
+    """读取中间位置的分页游标（按默认排序第 N/2 行）"""
+    rows = ctx.tasks.task_rows_query().offset(max(ctx.spec.tasks // 2 - 1, 0)).limit(1).all()
+    if not rows:
+        return (None,)
+    return (ctx.tasks._encode_cursor(ctx.tasks._row_key(rows[0])),)
+
+def _new_task(ctx: BenchContext) -> tuple:
+    return (ctx.tasks.create_task(ctx.unique("待删除任务"), "2025-01-01", [ctx.tag_id(0)]).id,)
+
+def _new_tasks(ctx: BenchContext) -> tuple:
+    return (ctx.tasks.bulk_create([{"title": ctx.unique("待删除任务")} for _ in range(BULK_SIZE)]),)
+
+def _new_linked_tag(ctx: BenchContext) -> tuple:
+    tag = ctx.tags.create_tag(ctx.unique("待删除标签"))
+    ctx.tasks.bulk_add_tags(ctx.task_ids(), [tag.id])
+    return (tag.id,)
+
+def _linked_tags(ctx: BenchContext) -> tuple:
+    return ([_new_linked_tag(ctx)[0] for _ in range(2)],)
+
+def _queued_changes(ctx: BenchContext) -> tuple:
+    """写回队列一次合并提交的修改：勾选完成和修改优先级交替"""
+    changes = {}
+    for n, task_id in enumerate(ctx.task_ids()):
+        changes[task_id] = {"completed": True} if n % 2 else {"priority": Priority.HIGH}
+    return (changes,)
+
+def _invalidate_tag_index(ctx: BenchContext) -> tuple:
+    ctx.tasks.tag_index.invalidate()
+    return ()
+
+def _invalidate_due_index(ctx: BenchContext) -> tuple:
+    ctx.tasks.due_index.invalidate()
+    return ()
+
+def _reference_week(ctx: BenchContext) -> tuple:
+    start = date.fromisoformat(ctx.spec.reference_date)
+    return start, start + timedelta(days=7)
+
+BENCHMARKS: List[Benchmark] = [
+    # 任务读取
+    Benchmark("tasks.get_all_tasks", lambda ctx: ctx.tasks.get_all_tasks()),
+    Benchmark("tasks.list_task_rows", lambda ctx: ctx.tasks.list_task_rows()),
+    Benchmark("tasks.list_task_rows[100]", lambda ctx, ids: ctx.tasks.list_task_rows(ids),
+              lambda ctx: (ctx.task_ids(),)),
+    Benchmark("tasks.get_task_page[first]", lambda ctx: ctx.tasks.get_task_page()),
+    Benchmark("tasks.get_task_page[middle]", lambda ctx, cursor: ctx.tasks.get_task_page(cursor), _deep_cursor),
+    Benchmark("tasks.get_task_by_id", lambda ctx, task_id: ctx.tasks.get_task_by_id(task_id),
+              lambda ctx: (ctx.task_id(),)),
+    Benchmark("tasks.get_tasks_by_priority", lambda ctx: ctx.tasks.get_tasks_by_priority(Priority.HIGH)),
+    Benchmark("tasks.search[word]", lambda ctx: ctx.tasks.search("周报")),
+    Benchmark("tasks.search[prefix]", lambda ctx: ctx.tasks.search("项目0")),
+    Benchmark("tasks.filter_by_tags[cold]",
+              lambda ctx: ctx.tasks.filter_by_tags(TagFilter(all_of=(ctx.tag_id(0),))), _invalidate_tag_index),
+    Benchmark("tasks.filter_by_tags[and/or/not]", lambda ctx: ctx.tasks.filter_by_tags(TagFilter(
+        all_of=(ctx.tag_id(0),), any_of=(ctx.tag_id(1), ctx.tag_id(2)), none_of=(ctx.tag_id(3),),
+    ))),
+    Benchmark("tasks.tasks_due_between[week]", lambda ctx, start, end: ctx.tasks.tasks_due_between(start, end),
+              _reference_week),
+    Benchmark("tasks.count_due_buckets", lambda ctx: ctx.tasks.count_due_buckets(
+        today=date.fromisoformat(ctx.spec.reference_date),
+    )),
+    Benchmark("tasks.count_due_buckets[cached]", lambda ctx: ctx.tasks.count_due_buckets(use_cached=True)),
+    Benchmark("tasks.filter_by_due[cold]", lambda ctx: ctx.tasks.filter_by_due("overdue"), _invalidate_due_index),
+    # 标签读取
+    Benchmark("tags.get_all_tags", lambda ctx: ctx.tags.get_all_tags()),
+    Benchmark("tags.get_tags_with_counts", lambda ctx: ctx.tags.get_tags_with_counts()),
+    Benchmark("tags.get_tags_with_counts[cached]", lambda ctx: ctx.tags.get_tags_with_counts(use_cached=True)),
+    Benchmark("tags.list_tags", lambda ctx: ctx.tags.list_tags()),
+    Benchmark("tags.get_tag_id", lambda ctx: ctx.tags.get_tag_id(ctx.tag_names[-1])),
+    Benchmark("tags.get_tag_names[100]", lambda ctx: ctx.tags.get_tag_names(range(1, BULK_SIZE + 1))),
+    Benchmark("tags.get_tag_by_id", lambda ctx: ctx.tags.get_tag_by_id(ctx.tag_id(ctx.spec.tags // 2))),
+    Benchmark("tags.get_tag_by_name", lambda ctx: ctx.tags.get_tag_by_name(ctx.tag_names[-1])),
+    # 任务写入
+    Benchmark("tasks.create_task", lambda ctx: ctx.tasks.create_task(
+        ctx.unique("新任务"), "2025-01-15", [ctx.tag_id(0), ctx.tag_id(5)], Priority.MEDIUM,
+    ), write=True),
+    Benchmark("tasks.update_task", lambda ctx, task_id: ctx.tasks.update_task(
+        task_id, {"title": ctx.unique("修改后的任务"), "priority": Priority.HIGH, "tag_ids": [ctx.tag_id(1)]},
+    ), lambda ctx: (ctx.task_id(),), write=True),
+    Benchmark("tasks.toggle_task_completed", lambda ctx, task_id: ctx.tasks.toggle_task_completed(task_id),
+              lambda ctx: (ctx.task_id(),), write=True),
+    Benchmark("tasks.delete_task", lambda ctx, task_id: ctx.tasks.delete_task(task_id), _new_task, write=True),
+    Benchmark("tasks.bulk_create[100]", lambda ctx: ctx.tasks.bulk_create([
+        {"title": ctx.unique("批量任务"), "due_date": "2025-02-01", "tag_ids": [ctx.tag_id(0)]}
+        for _ in range(BULK_SIZE)
+    ]), write=True),
+    Benchmark("tasks.bulk_update[100]", lambda ctx, ids: ctx.tasks.bulk_update(ids, {"priority": Priority.LOW}),
+              lambda ctx: (ctx.task_ids(),), write=True),
+    Benchmark("tasks.bulk_set_completed[100]", lambda ctx, ids: ctx.tasks.bulk_set_completed(ids, True),
+              lambda ctx: (ctx.task_ids(),), write=True),
+    Benchmark("tasks.bulk_add_tags[100]", lambda ctx, ids: ctx.tasks.bulk_add_tags(ids, [ctx.tag_id(2)]),
+              lambda ctx: (ctx.task_ids(),), write=True),
+    Benchmark("tasks.bulk_delete[100]", lambda ctx, ids: ctx.tasks.bulk_delete(ids), _new_tasks, write=True),
+    Benchmark("tasks.apply_changes[100]", lambda ctx, changes: ctx.tasks.apply_changes(changes),
+              _queued_changes, write=True),
+    # 标签写入
+    Benchmark("tags.create_tag", lambda ctx: ctx.tags.create_tag(ctx.unique("新标签")), write=True),
+    Benchmark("tags.get_or_create_tag", lambda ctx: ctx.tags.get_or_create_tag(ctx.tag_names[0]), write=True),
+    Benchmark("tags.update_tag", lambda ctx: ctx.tags.update_tag(ctx.tag_id(20), ctx.unique("改名标签")), write=True),
+    Benchmark("tags.delete_tag", lambda ctx, tag_id: ctx.tags.delete_tag(tag_id), _new_linked_tag, write=True),
+    Benchmark("tags.merge_tags", lambda ctx, tag_ids: ctx.tags.merge_tags(tag_ids, ctx.tag_id(3)),
+              _linked_tags, write=True),
+]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """计算耗时统计（秒）"""
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.mean(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "p95": ordered[p95_index],
+        "max": ordered[-1],
+    }
+
+def time_benchmark(benchmark: Benchmark, ctx: BenchContext, warmup: int, repeat: int) -> List[float]:
+    """执行一个基准，返回每次的耗时（秒）"""
+    samples = []
+    for index in range(warmup + repeat):
+        args = benchmark.setup(ctx) if benchmark.setup is not None else ()
+        started = time.perf_counter()
+        benchmark.run(ctx, *args)
+        elapsed = time.perf_counter() - started
+        if index >= warmup:
+            samples.append(elapsed)
+    return samples
+
+def environment() -> Dict[str, str]:
+    """记录运行环境，便于判断两次结果是否可比"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": sqlite3.sqlite_version,
+    }
+
+def select_benchmarks(patterns: Optional[List[str]] = None) -> List[Benchmark]:
+    """按名称通配符筛选基准，patterns 为空时返回全部"""
+    if not patterns:
+        return list(BENCHMARKS)
+    return [b for b in BENCHMARKS if any(fnmatch.fnmatchcase(b.name, pattern) for pattern in patterns)]
+
+def run_suite(spec: DatasetSpec, warmup: int = DEFAULT_WARMUP, repeat: int = DEFAULT_REPEAT,
+              patterns: Optional[List[str]] = None, data_dir=None,
+              progress: Optional[Callable[[str, Dict[str, float]], None]] = None) -> Dict[str, Any]:
+    """在数据集的工作副本上运行基准
+
+    Args:
+        spec: 数据集参数
+        warmup: 每个基准的预热次数
+        repeat: 每个基准计时的次数
+        patterns: 只运行名称匹配这些通配符的基准
+        data_dir: 数据集缓存目录
+        progress: 每完成一个基准调用 progress(名称, 统计)
+
+    Returns:
+        可直接写入 JSON 的结果
+    """
+    if repeat < 1:
+        raise ValueError("repeat 必须大于0")
+    benchmarks = select_benchmarks(patterns)
+    dataset = ensure_dataset(spec, data_dir)
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="taskmoment-bench-") as work_dir:
+        db_path = Path(work_dir) / "tasks.db"
+        shutil.copyfile(dataset, db_path)
+        engine = create_sqlite_engine(db_path)
+        Session = sessionmaker(bind=engine)
+        try:
+            for benchmark in benchmarks:
+                session = Session()
+                try:
+                    samples = time_benchmark(benchmark, BenchContext(session, spec), warmup, repeat)
+                finally:
+                    session.close()
+                stats = summarize(samples)
+                stats["runs"] = len(samples)
+                results[benchmark.name] = stats
+                if progress is not None:
+                    progress(benchmark.name, stats)
+        finally:
+            engine.dispose()
+
+    return {
+        "version": RESULT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "profile": engine.sqlite_profile._asdict(),
+        "dataset": spec._asdict(),
+        "warmup": warmup,
+        "repeat": repeat,
+        "results": results,
+    }
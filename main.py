@@ -1,23 +1,75 @@
+import time
+
+# 进程开始计时，用于 --profile-startup
+_START = time.perf_counter()
+
 import sys
-from PySide6.QtWidgets import QApplication
 
-from app.models.base import Base, init_db
-from app.views.main_window import MainWindow
+from app.utils.startup_profile import StartupProfiler
+
+# 启动耗时分析参数：打印各阶段耗时（到首次绘制和任务列表加载完成）后退出
+PROFILE_STARTUP_FLAG = "--profile-startup"
+
+def _finish_profiling(app, window, profiler):
+    """首次绘制和第一页任务都完成后打印耗时并退出"""
+    from PySide6.QtCore import QEvent, QObject
+
+    pending = {"首次绘制", "加载任务列表"}
+
+    def done(phase):
+        if phase in pending:
+            pending.discard(phase)
+            profiler.mark(phase)
+            if not pending:
+                profiler.report()
+                app.quit()
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                done("首次绘制")
+            return False
+
+    watcher = PaintWatcher(window)
+    window.installEventFilter(watcher)
+    window.task_tab.model.modelReset.connect(lambda: done("加载任务列表"))
 
 def main():
     """应用程序入口函数"""
-    # 初始化数据库
+    profiler = StartupProfiler(PROFILE_STARTUP_FLAG in sys.argv, _START)
+    argv = [arg for arg in sys.argv if arg != PROFILE_STARTUP_FLAG]
+    
+    # 初始化数据库（结构已是最新时只读取一次 PRAGMA user_version）
+    from app.models.base import init_db
+    profiler.mark("导入数据模型")
+    from app.utils.db_config import sql_stats_enabled
+    if sql_stats_enabled():
+        from app.utils.instrumentation import install
+        install(dump_at_exit=True)
     init_db()
+    profiler.mark("检查数据库结构")
     
     # 创建应用程序
-    app = QApplication(sys.argv)
+    from PySide6.QtWidgets import QApplication
+    profiler.mark("导入 PySide6")
+    app = QApplication(argv)
+    profiler.mark("创建 QApplication")
     
     # 创建主窗口
+    from app.views.main_window import MainWindow
+    profiler.mark("导入界面模块")
     window = MainWindow()
+    profiler.mark("创建主窗口")
+    if profiler.enabled:
+        _finish_profiling(app, window, profiler)
     window.show()
+    profiler.mark("显示窗口")
     
     # 运行应用程序
-    sys.exit(app.exec())
+    status = app.exec()
+    # 分析模式直接退出事件循环，不经过 closeEvent，这里确保后台线程已停止
+    window.db_executor.shutdown()
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,46 @@
+"""
+测试公共夹具
+每个测试使用临时目录中新建的 SQLite 数据库，不会读写 data/tasks.db。
+"""
+
+import os
+import tempfile
+
+# app.models.base 导入时按配置创建默认引擎，先指向临时目录
+os.environ.setdefault("TASKMOMENT_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="taskmoment-tests-"), "tasks.db"))
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.controllers.tag_controller import TagController
+from app.controllers.task_controller import TaskController
+from app.models.base import Base, create_sqlite_engine
+from app.utils.migrate_db import migrate_database
+
+@pytest.fixture
+def db_path(tmp_path):
+    """已建好最新表结构的临时数据库路径"""
+    path = tmp_path / "tasks.db"
+    engine = create_sqlite_engine(path)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    migrate_database(path, verbose=False)
+    return path
+
+@pytest.fixture
+def engine(db_path):
+    """临时数据库的引擎"""
+    engine = create_sqlite_engine(db_path)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(engine):
+    """每个操作一个短期会话的会话工厂（与界面的用法相同）"""
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+@pytest.fixture
+def controllers(session_factory):
+    """(TaskController, TagController)"""
+    tags = TagController(session_factory)
+    return TaskController(session_factory, tags), tags
@@ -0,0 +1,49 @@
+from app.controllers.events import DELETED, UPDATED
+from app.utils.instrumentation import query_budget
+
+def test_bulk_create_is_one_executemany(controllers, engine):
+    tasks, tags = controllers
+    tag_id = tags.create_tag("work").id
+    tasks.create_task("existing")
+    items = [{"title": f"task {i}", "tag_ids": [tag_id] if i % 2 else []} for i in range(5000)]
+
+    with query_budget(5, bind=engine) as budget:
+        task_ids = tasks.bulk_create(items)
+    inserts = [sql for sql in budget.statements if sql.lstrip().upper().startswith("INSERT INTO TASK ")]
+    assert len(inserts) == 1
+
+    assert len(set(task_ids)) == 5000
+    rows = {row.id: row for row in tasks.list_task_rows(task_ids)}
+    for task_id, item in zip(task_ids, items):
+        assert rows[task_id].title == item["title"]
+        assert rows[task_id].tags == (("work",) if item["tag_ids"] else ())
+
+def _record_events(tasks):
+    events = []
+    tasks.changes.subscribe(lambda event: events.append((event.kind, sorted(event.ids))))
+    return events
+
+def test_bulk_update_counts_existing_tasks(controllers):
+    tasks, tags = controllers
+    tag_id = tags.create_tag("work").id
+    task_ids = tasks.bulk_create([{"title": "a"}, {"title": "b"}])
+    missing = max(task_ids) + 100
+    events = _record_events(tasks)
+
+    assert tasks.bulk_update(task_ids + [missing], {"tag_ids": [tag_id]}) == 2
+    assert tasks.bulk_update(task_ids + [missing], {"priority": 1}) == 2
+    assert tasks.bulk_update([missing], {"tag_ids": [tag_id]}) == 0
+    # 关联都已存在，没有插入任何行，也不发出事件
+    tasks.bulk_add_tags([missing] + task_ids, [tag_id])
+    assert events == [(UPDATED, sorted(task_ids))] * 2
+    assert [row.tags for row in tasks.list_task_rows(task_ids)] == [("work",), ("work",)]
+
+def test_bulk_delete_counts_deleted_tasks(controllers):
+    tasks, _ = controllers
+    task_ids = tasks.bulk_create([{"title": "a"}, {"title": "b"}])
+    missing = max(task_ids) + 100
+    events = _record_events(tasks)
+
+    assert tasks.bulk_delete(task_ids + [missing]) == 2
+    assert tasks.bulk_delete(task_ids + [missing]) == 0
+    assert events == [(DELETED, sorted(task_ids))]
@@ -0,0 +1,35 @@
+import sqlite3
+from datetime import datetime
+
+import app.cli as cli
+from app.models.task import Task
+
+class _FrozenDateTime(datetime):
+    """微秒为 0 的当前时间"""
+
+    @classmethod
+    def utcnow(cls):
+        return cls(2024, 1, 1, 0, 0, 9)
+
+def test_fast_add_stores_created_at_like_the_orm(db_path, session_factory, controllers, monkeypatch):
+    tasks, _ = controllers
+    monkeypatch.setenv("TASKMOMENT_DB_PATH", str(db_path))
+    monkeypatch.setattr(cli, "datetime", _FrozenDateTime)
+    with session_factory() as session:
+        session.add_all([Task(title=f"orm {n}", created_at=datetime(2024, 1, 1, 0, 0, 9)) for n in range(2)])
+        session.commit()
+
+    fast_id = cli._add_fast("fast", None, 0, [])
+    assert fast_id is not None
+    with sqlite3.connect(db_path) as conn:
+        stored = {text for (text,) in conn.execute("SELECT created_at FROM task")}
+    assert stored == {"2024-01-01 00:00:09.000000"}
+
+    # 排序键相同的行之间翻页仍能前进到末尾
+    seen, cursor = [], None
+    while True:
+        rows, cursor = tasks.get_task_page(cursor, 1)
+        seen += [row.id for row in rows]
+        if cursor is None:
+            break
+    assert seen == [row.id for row in tasks.list_task_rows()]
@@ -0,0 +1,92 @@
+import random
+import sqlite3
+from datetime import date, timedelta
+
+from app.controllers.due_index import (
+    DUE_BUCKETS, LATER, NO_DUE_DATE, OVERDUE, THIS_WEEK, TODAY, DueIndex, due_bucket,
+)
+from app.models.task import LEGACY_NO_DUE_DATE
+from app.utils.migrate_db import get_schema_version, migrate_database
+
+def _assert_index_matches_sql(tasks):
+    assert tasks.count_due_buckets(use_cached=True) == tasks.count_due_buckets()
+    for bucket in DUE_BUCKETS:
+        expected = {row.id for row in tasks.list_task_rows() if due_bucket(row.due_date, row.completed, date.today()) == bucket}
+        assert set(tasks.filter_by_due(bucket)) == expected
+
+def test_week_boundaries():
+    sunday, monday = date(2024, 6, 9), date(2024, 6, 10)
+    assert due_bucket(monday - timedelta(days=1), False, monday) == OVERDUE
+    assert due_bucket(monday, False, monday) == TODAY
+    assert due_bucket(sunday, False, monday) == OVERDUE
+    assert due_bucket(monday + timedelta(days=6), False, monday) == THIS_WEEK
+    assert due_bucket(monday + timedelta(days=7), False, monday) == LATER
+    # 周日时本周分组为空，明天已属于下一周
+    assert due_bucket(sunday + timedelta(days=1), False, sunday) == LATER
+    assert due_bucket(None, False, monday) == NO_DUE_DATE
+    assert due_bucket(monday, True, monday) is None
+
+def test_cached_counts_follow_random_changes(controllers):
+    tasks, _ = controllers
+    rng = random.Random(11)
+    today = date.today()
+
+    def some_due():
+        return None if rng.random() < 0.25 else (today + timedelta(days=rng.randint(-10, 20))).isoformat()
+
+    task_ids = tasks.bulk_create([{"title": f"task {n}", "due_date": some_due(), "completed": rng.random() < 0.2}
+                                  for n in range(60)])
+    _assert_index_matches_sql(tasks)
+    for step in range(200):
+        roll = rng.random()
+        if roll < 0.3:
+            tasks.update_task(rng.choice(task_ids), {"due_date": some_due()})
+        elif roll < 0.5:
+            tasks.toggle_task_completed(rng.choice(task_ids))
+        elif roll < 0.6:
+            tasks.bulk_update(rng.sample(task_ids, 5), {"due_date": some_due()})
+        elif roll < 0.7:
+            tasks.apply_changes({task_id: {"completed": rng.random() < 0.5} for task_id in rng.sample(task_ids, 5)})
+        elif roll < 0.85:
+            task_ids += tasks.bulk_create([{"title": f"new {step}", "due_date": some_due()}])
+        elif len(task_ids) > 10:
+            victim = task_ids.pop(rng.randrange(len(task_ids)))
+            tasks.bulk_delete([victim])
+        _assert_index_matches_sql(tasks)
+
+def test_index_rebuilds_when_the_day_changes(controllers, session_factory):
+    tasks, _ = controllers
+    monday = date(2024, 6, 10)
+    tasks.bulk_create([{"title": f"task {n}", "due_date": (monday + timedelta(days=n)).isoformat()} for n in range(10)])
+    day = [monday]
+    with session_factory() as session:
+        index = DueIndex(session, clock=lambda: day[0])
+        assert index.counts() == tasks.count_due_buckets(today=monday)
+        day[0] = monday + timedelta(days=3)
+        assert index.counts() == tasks.count_due_buckets(today=day[0])
+        assert index.counts()[OVERDUE] == 3
+
+def test_legacy_placeholder_date_is_stored_as_null(controllers):
+    tasks, _ = controllers
+    task_id = tasks.create_task("legacy", due_date=LEGACY_NO_DUE_DATE.isoformat()).id
+    assert tasks.list_task_rows([task_id])[0].due_date is None
+    assert tasks.count_due_buckets()[NO_DUE_DATE] == 1
+
+def test_migration_clears_legacy_placeholder_date(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        "INSERT INTO task (title, completed, due_date, priority) VALUES ('legacy', 0, '1752-09-14', 0);"
+        "INSERT INTO task (title, completed, due_date, priority) VALUES ('dated', 0, '2024-06-10', 0);"
+        "PRAGMA user_version = 6;"
+    )
+    conn.close()
+
+    migrate_database(db_path, verbose=False)
+
+    assert get_schema_version(db_path) == 7
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = dict(conn.execute("SELECT title, due_date FROM task"))
+    finally:
+        conn.close()
+    assert rows == {"legacy": None, "dated": "2024-06-10"}
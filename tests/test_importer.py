@@ -0,0 +1,22 @@
+import json
+
+from app.utils.importer import TaskImporter
+from app.utils.instrumentation import query_budget
+
+def test_import_writes_each_chunk_with_one_executemany(controllers, engine, tmp_path):
+    tasks, _ = controllers
+    path = tmp_path / "tasks.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(3000):
+            f.write(json.dumps({"title": f"task {i}", "tags": [f"tag{i % 3}"]}) + "\n")
+
+    with query_budget(100, bind=engine) as budget:
+        result = TaskImporter(bind=engine, chunk_size=1000, workers=1).run(path)
+    assert result.imported == 3000
+    inserts = [sql for sql in budget.statements if sql.lstrip().upper().startswith("INSERT INTO TASK ")]
+    assert len(inserts) == 3
+
+    rows = tasks.list_task_rows()
+    assert len(rows) == 3000
+    for row in rows:
+        assert row.tags == (f"tag{int(row.title.split()[1]) % 3}",)
@@ -0,0 +1,31 @@
+from datetime import date
+
+from app.controllers.due_index import NO_DUE_DATE, TODAY
+from app.controllers.tag_index import TagFilter
+from app.models.base import task_tags
+from app.models.task import Task
+
+def test_indexes_follow_writes_from_another_session(controllers, session_factory):
+    task_controller, tags = controllers
+    tag_id = tags.create_tag("work").id
+    task_id = task_controller.create_task("plain").id
+    work = TagFilter(all_of=(tag_id,))
+
+    # 建立索引，此后没有新的提交时不丢弃
+    task_controller.sync_indexes()
+    assert list(task_controller.filter_by_tags(work)) == []
+    assert task_controller.count_due_buckets(use_cached=True)[NO_DUE_DATE] == 1
+    assert not task_controller.sync_indexes()
+
+    # 另一个会话（如命令行、导入）的修改不会发出变更事件
+    with session_factory() as other:
+        other.add(Task(title="imported", due_date=date.today()))
+        other.query(Task).filter(Task.id == task_id).update({"due_date": date.today()})
+        other.execute(task_tags.insert(), {"task_id": task_id, "tag_id": tag_id})
+        other.commit()
+        imported_id = other.query(Task.id).filter(Task.title == "imported").scalar()
+
+    assert task_controller.sync_indexes()
+    assert list(task_controller.filter_by_tags(work)) == [task_id]
+    assert sorted(task_controller.filter_by_due(TODAY)) == sorted([task_id, imported_id])
+    assert task_controller.count_due_buckets(use_cached=True) == task_controller.count_due_buckets()
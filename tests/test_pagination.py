@@ -0,0 +1,62 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import app.controllers.task_controller as task_controller_module
+from app.models.task import Task
+
+@pytest.fixture
+def tasks(controllers, session_factory):
+    """包含大量排序键相同的行，以及 NULL 截止日期和 NULL 创建时间的任务"""
+    task_controller, _ = controllers
+    created = datetime(2024, 3, 1, 12, 0, 0)
+    with session_factory() as session:
+        for n in range(240):
+            session.add(Task(
+                title=f"task {n}",
+                completed=n % 5 == 0,
+                due_date=None if n % 3 == 0 else date(2024, 3, 1) + timedelta(days=n % 4),
+                priority=n % 2 * 2,
+                created_at=created + timedelta(seconds=n % 3),
+            ))
+        session.commit()
+        # 默认值只在未赋值时生效，NULL 创建时间需另外写入
+        session.query(Task).filter(Task.id % 7 == 0).update({"created_at": None})
+        session.commit()
+    return task_controller
+
+def _all_pages(tasks, limit, task_ids=None):
+    ids, cursor = [], None
+    while True:
+        rows, cursor = tasks.get_task_page(cursor, limit, task_ids)
+        assert len(rows) <= limit
+        ids += [row.id for row in rows]
+        if cursor is None:
+            return ids
+
+@pytest.mark.parametrize("limit", [1, 7, 200])
+def test_pages_match_list_task_rows(tasks, limit):
+    assert _all_pages(tasks, limit) == [row.id for row in tasks.list_task_rows()]
+
+@pytest.mark.parametrize("limit", [1, 7, 200])
+@pytest.mark.parametrize("in_limit", [task_controller_module.FILTER_IN_LIMIT, 10])
+def test_filtered_pages_match_list_task_rows(tasks, limit, in_limit, monkeypatch):
+    # 调小 FILTER_IN_LIMIT，使筛选集合走逐批扫描的路径
+    monkeypatch.setattr(task_controller_module, "FILTER_IN_LIMIT", in_limit)
+    task_ids = {task_id for task_id in range(1, 241) if task_id % 4 != 1}
+    expected = [row.id for row in tasks.list_task_rows() if row.id in task_ids]
+    assert _all_pages(tasks, limit, task_ids) == expected
+
+def test_cursor_that_does_not_advance_is_rejected(controllers, session_factory):
+    tasks, _ = controllers
+    with session_factory() as session:
+        session.add_all([Task(title=f"task {n}", created_at=datetime(2024, 1, 1, 0, 0, 9)) for n in range(3)])
+        session.commit()
+        # 旧版命令行写入的创建时间没有小数部分，按文本比较时排在自己之后
+        session.connection().exec_driver_sql("UPDATE task SET created_at = '2024-01-01 00:00:09' WHERE id = 2")
+        session.commit()
+
+    cursor = None
+    with pytest.raises(RuntimeError):
+        for _ in range(10):
+            _, cursor = tasks.get_task_page(cursor, 1)
@@ -0,0 +1,62 @@
+import re
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, func, select
+
+from app.controllers.due_index import DUE_BUCKETS, bucket_conditions
+from app.controllers.task_controller import TaskController
+from app.models.task import Task
+from app.utils.query_plan import assert_sort_free, explain_query_plan, uses_temp_sort
+
+@pytest.fixture
+def session(controllers, session_factory):
+    tasks, _ = controllers
+    today = date.today()
+    tasks.bulk_create([
+        {
+            "title": f"task {i}",
+            "due_date": None if i % 4 == 0 else (today + timedelta(days=i % 30 - 15)).isoformat(),
+            "priority": i % 4,
+            "completed": i % 5 == 0,
+        }
+        for i in range(300)
+    ])
+    session = session_factory()
+    yield session
+    session.close()
+
+def test_list_order_uses_index(session):
+    plan = assert_sort_free(session, TaskController(session).task_rows_query())
+    assert any("ix_task_list_order" in step for step in plan), plan
+
+def test_keyset_page_queries_are_sort_free(session, engine):
+    tasks = TaskController(session)
+    _, cursor = tasks.get_task_page(limit=50)
+    assert cursor is not None
+
+    executed = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and re.search(r"\bFROM task\s", statement):
+            executed.append((statement, parameters))
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        # 跨过多个分组，覆盖“组内续读”和“下一个分组”两条查询
+        rows, _ = tasks.get_task_page(cursor, limit=200)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert len(rows) == 200
+    assert len(executed) >= 2
+
+    connection = session.connection()
+    for statement, parameters in executed:
+        plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        assert not uses_temp_sort(plan), (statement, plan)
+        assert any("ix_task_list_order" in step for step in plan), (statement, plan)
+
+@pytest.mark.parametrize("bucket", DUE_BUCKETS)
+def test_due_bucket_count_is_index_range_scan(session, bucket):
+    statement = select(func.count(Task.id)).where(*bucket_conditions(bucket, date.today()))
+    plan = explain_query_plan(session, statement)
+    assert plan == [step for step in plan if step.startswith("SEARCH")], plan
+    assert any("ix_task_list_order" in step for step in plan), plan
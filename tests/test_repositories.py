@@ -0,0 +1,24 @@
+import pytest
+
+from app.repositories.conformance import SqliteRepositories, compare_backends, run_checks
+from app.repositories.memory import MemoryRepository
+
+@pytest.fixture
+def sqlite_repositories(tmp_path):
+    """每次调用新建一个临时 SQLite 数据库的存储工厂"""
+    factory = SqliteRepositories(tmp_path)
+    yield factory
+    factory.dispose()
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository_factory(request, sqlite_repositories):
+    return MemoryRepository if request.param == "memory" else sqlite_repositories
+
+def test_conformance_checks(repository_factory):
+    failures = [(name, error) for name, error in run_checks(repository_factory) if error is not None]
+    assert failures == []
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_backends_agree_on_random_operations(sqlite_repositories, seed):
+    repos = {"memory": MemoryRepository(), "sqlite": sqlite_repositories()}
+    assert compare_backends(repos, 1000, seed) == []
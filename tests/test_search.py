@@ -0,0 +1,65 @@
+import pytest
+
+def _titles(rows):
+    return [row.title for row in rows]
+
+@pytest.mark.parametrize("query", [
+    '"', '""', 'say "hi', "NOT", "a OR", "AND b", "(", "report)", "*", "-x", "title:report", "tags:", "^report", "NEAR(a b)",
+])
+def test_fts_syntax_in_input_is_matched_literally(controllers, query):
+    tasks, _ = controllers
+    tasks.create_task('say "hi" (report) NOT now')
+    # 输入中的运算符和引号不会被解释为 FTS5 语法，不会报错
+    tasks.search(query)
+
+def test_quotes_and_operators_match_as_words(controllers):
+    tasks, _ = controllers
+    tasks.create_task('say "hi" (report) NOT now')
+    tasks.create_task("unrelated")
+    assert _titles(tasks.search('"hi"')) == ['say "hi" (report) NOT now']
+    assert _titles(tasks.search("NOT")) == ['say "hi" (report) NOT now']
+    assert _titles(tasks.search("report)")) == ['say "hi" (report) NOT now']
+
+def test_terms_match_by_prefix_and_all_must_match(controllers):
+    tasks, _ = controllers
+    tasks.create_task("weekly report")
+    tasks.create_task("report archive")
+    tasks.create_task("weekend plans")
+    assert sorted(_titles(tasks.search("rep"))) == ["report archive", "weekly report"]
+    assert _titles(tasks.search("rep wee")) == ["weekly report"]
+    assert _titles(tasks.search("reports")) == []
+    assert tasks.search("   ") == []
+
+def test_index_follows_title_updates_and_deletes(controllers):
+    tasks, _ = controllers
+    task_id = tasks.create_task("draft budget").id
+    tasks.update_task(task_id, {"title": "final budget"})
+    assert _titles(tasks.search("draft")) == []
+    assert _titles(tasks.search("final")) == ["final budget"]
+    tasks.bulk_update([task_id], {"title": "approved budget"})
+    assert _titles(tasks.search("appro")) == ["approved budget"]
+    tasks.delete_task(task_id)
+    assert tasks.search("budget") == []
+
+def test_index_follows_tag_links_renames_and_deletes(controllers):
+    tasks, tags = controllers
+    work_id = tags.create_tag("work").id
+    home_id = tags.create_tag("home").id
+    task_id = tasks.create_task("call bob", tag_ids=[work_id]).id
+    assert _titles(tasks.search("work")) == ["call bob"]
+
+    tasks.update_task(task_id, {"tag_ids": [home_id]})
+    assert tasks.search("work") == []
+    assert _titles(tasks.search("home")) == ["call bob"]
+
+    tags.update_tag(home_id, "household")
+    assert tasks.search("home") == []
+    assert _titles(tasks.search("house")) == ["call bob"]
+
+    tags.merge_tags([home_id], work_id)
+    assert tasks.search("household") == []
+    assert _titles(tasks.search("work call")) == ["call bob"]
+
+    tags.delete_tag(work_id)
+    assert tasks.search("work") == []
+    assert _titles(tasks.search("call")) == ["call bob"]
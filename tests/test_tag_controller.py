@@ -0,0 +1,49 @@
+from app.models.tag import Tag
+
+def test_tag_created_elsewhere_is_found(controllers, session_factory):
+    _, tags = controllers
+    # 先加载缓存，再由另一个会话（如命令行、导入）创建标签
+    assert tags.list_tags() == []
+    with session_factory() as other:
+        other.add(Tag(tag="fresh"))
+        other.commit()
+        fresh_id = other.query(Tag.id).filter(Tag.tag == "fresh").scalar()
+
+    assert tags.get_tag_id("fresh") == fresh_id
+    assert tags.create_tag("fresh") is None
+    assert tags.get_or_create_tag("fresh").id == fresh_id
+    assert tags.get_tag_by_name("fresh").id == fresh_id
+
+def test_tag_recreated_elsewhere_replaces_stale_id(controllers, session_factory):
+    _, tags = controllers
+    old_id = tags.create_tag("work").id
+    tags.create_tag("home")
+    with session_factory() as other:
+        other.query(Tag).filter(Tag.id == old_id).delete()
+        other.add(Tag(tag="work"))
+        other.commit()
+
+    tag = tags.get_or_create_tag("work")
+    assert tag.id != old_id
+    assert tags.get_tag_id("work") == tag.id
+    assert tags.create_tag("work") is None
+
+def test_tag_deleted_elsewhere_is_not_linked(controllers, session_factory):
+    tasks, tags = controllers
+    work_id = tags.create_tag("work").id
+    home_id = tags.create_tag("home").id
+    assert tags.list_tags() == [(home_id, "home"), (work_id, "work")]
+    with session_factory() as other:
+        other.query(Tag).filter(Tag.id == work_id).delete()
+        other.commit()
+
+    # 缓存中仍有该标签，关联在数据库中按标签是否存在过滤
+    task = tasks.create_task("x", tag_ids=[work_id, home_id])
+    task_ids = tasks.bulk_create([{"title": "y", "tag_ids": [work_id]}])
+    tasks.bulk_add_tags(task_ids, [work_id, home_id])
+    assert tags.merge_tags([home_id], work_id) == 0
+    assert [row.tags for row in tasks.list_task_rows([task.id] + task_ids)] == [("home",), ("home",)]
+
+    # 检测到其他连接的提交后缓存重新加载
+    assert tasks.sync_indexes()
+    assert tags.list_tags() == [(home_id, "home")]
@@ -0,0 +1,55 @@
+from app.controllers.events import MERGED
+
+def _counts(tags):
+    return {count.name: count.count for count in tags.get_tags_with_counts()}
+
+def _assert_cached_counts_match(tags):
+    assert tags.get_tags_with_counts(use_cached=True) == tags.get_tags_with_counts()
+
+def test_merge_with_overlapping_associations(controllers):
+    tasks, tags = controllers
+    a, b, c = (tags.create_tag(name).id for name in ("a", "b", "c"))
+    both = tasks.create_task("both", tag_ids=[a, b]).id
+    only_b = tasks.create_task("only b", tag_ids=[b]).id
+    a_and_c = tasks.create_task("a and c", tag_ids=[a, c]).id
+    tasks.create_task("untagged")
+    events = []
+    tags.changes.subscribe(lambda event: events.append((event.kind, list(event.ids))))
+
+    assert tags.merge_tags([b, c, a, 10 ** 6], a) == 2
+
+    assert events == [(MERGED, [a, b, c])]
+    assert tags.list_tags() == [(a, "a")]
+    rows = {row.id: row.tags for row in tasks.list_task_rows()}
+    assert rows[both] == rows[only_b] == rows[a_and_c] == ("a",)
+    assert _counts(tags) == {"a": 3}
+    _assert_cached_counts_match(tags)
+
+def test_merge_into_missing_target_changes_nothing(controllers):
+    tasks, tags = controllers
+    a = tags.create_tag("a").id
+    tasks.create_task("x", tag_ids=[a])
+    assert tags.merge_tags([a], 10 ** 6) == 0
+    assert tags.merge_tags([a], a) == 0
+    assert _counts(tags) == {"a": 1}
+
+def test_cached_counts_follow_every_link_change(controllers):
+    tasks, tags = controllers
+    a, b = tags.create_tag("a").id, tags.create_tag("b").id
+    first = tasks.create_task("first", tag_ids=[a]).id
+    task_ids = tasks.bulk_create([{"title": f"task {n}", "tag_ids": [a, b]} for n in range(5)])
+    _assert_cached_counts_match(tags)
+
+    tasks.update_task(first, {"tag_ids": [b]})
+    tasks.bulk_add_tags([first] + task_ids, [a])
+    tasks.bulk_update(task_ids[:2], {"tag_ids": []})
+    _assert_cached_counts_match(tags)
+
+    tasks.delete_task(first)
+    tasks.bulk_delete(task_ids[2:3])
+    _assert_cached_counts_match(tags)
+    assert _counts(tags) == {"a": 2, "b": 2}
+
+    tags.delete_tag(b)
+    _assert_cached_counts_match(tags)
+    assert _counts(tags) == {"a": 2}
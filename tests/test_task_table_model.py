@@ -0,0 +1,76 @@
+import os
+import random
+from array import array
+from datetime import date, datetime, timedelta
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from app.controllers.task_controller import TaskRow
+from app.views.task_table_model import TaskTableModel
+
+@pytest.fixture(scope="module")
+def qt_app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+class _NoScanArray(array):
+    """不允许逐行查找的ID数组"""
+
+    def index(self, *args):
+        raise AssertionError("row_of 逐行查找了行号")
+
+def _random_row(rng, task_id):
+    return TaskRow(
+        task_id,
+        f"task {task_id}",
+        rng.random() < 0.3,
+        None if rng.random() < 0.3 else date(2024, 1, 1) + timedelta(days=rng.randint(0, 5)),
+        rng.randint(0, 3),
+        None if rng.random() < 0.1 else datetime(2024, 1, 1) + timedelta(seconds=rng.randint(0, 3)),
+        (),
+    )
+
+def _assert_consistent(model, missing_id):
+    ids = [model.task_id_at(row) for row in range(model.rowCount())]
+    keys = [model._row_key(row) for row in range(model.rowCount())]
+    assert keys == sorted(keys)
+    assert [model.row_of(task_id) for task_id in ids] == list(range(len(ids)))
+    assert model.row_of(missing_id) == -1
+
+def test_row_lookup_follows_upserts_and_removals(qt_app):
+    rng = random.Random(7)
+    model = TaskTableModel()
+    rows = [_random_row(rng, task_id) for task_id in range(1, 201)]
+    model.set_page(sorted(rows, key=lambda row: model._sort_key(model._columns_of(row))), None)
+    model._ids = _NoScanArray("q", model._ids)
+    _assert_consistent(model, 10 ** 6)
+
+    next_id = 201
+    for _ in range(300):
+        roll = rng.random()
+        if roll < 0.5:
+            model.upsert_rows([_random_row(rng, rng.randint(1, next_id - 1))])
+        elif roll < 0.7:
+            model.upsert_rows([_random_row(rng, next_id)])
+            next_id += 1
+        elif roll < 0.85:
+            model.remove_tasks([rng.randint(1, next_id - 1)])
+        elif model.rowCount():
+            # 勾选后在变更事件到达前，行的位置和查找都不变
+            row = rng.randrange(model.rowCount())
+            task_id = model.task_id_at(row)
+            model.set_completed(row, not model._completed[row])
+            assert model.row_of(task_id) == row
+        _assert_consistent(model, 10 ** 6)
+
+def test_row_lookup_on_unsorted_rows(qt_app):
+    rng = random.Random(3)
+    model = TaskTableModel()
+    # 搜索结果按相关度排列，不是默认排序
+    rows = [_random_row(rng, task_id) for task_id in range(1, 51)]
+    rng.shuffle(rows)
+    model.set_page(rows, None)
+    assert [model.row_of(row.id) for row in rows] == list(range(len(rows)))
+    assert model.row_of(10 ** 6) == -1
@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import text
+
+from app.controllers.write_behind import WriteBehindQueue
+from app.models.task import Task
+from app.utils.instrumentation import query_budget
+
+class _Scheduler:
+    """记录调度请求的假定时器"""
+
+    def __init__(self):
+        self.delays = []
+
+    def __call__(self, delay):
+        self.delays.append(delay)
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+def _completed(session_factory, task_ids):
+    with session_factory() as session:
+        rows = session.query(Task.id, Task.completed).filter(Task.id.in_(task_ids))
+        return {task_id: bool(completed) for task_id, completed in rows}
+
+def test_changes_are_merged_and_written_in_one_update(controllers, session_factory, engine):
+    tasks, _ = controllers
+    task_ids = tasks.bulk_create([{"title": f"task {n}"} for n in range(49)])
+    events = []
+    tasks.changes.subscribe(events.append)
+    schedule = _Scheduler()
+    queue = WriteBehindQueue(tasks, schedule)
+
+    for task_id in task_ids:
+        queue.submit(task_id, {"completed": True}, {"completed": False})
+    # 勾选后又取消，改回原值的修改直接去掉
+    queue.submit(task_ids[0], {"completed": False})
+    assert len(queue) == 48
+    assert schedule.delays
+    assert _completed(session_factory, task_ids) == {task_id: False for task_id in task_ids}
+
+    with query_budget(5, bind=engine) as budget:
+        result = queue.flush()
+    updates = [sql for sql in budget.statements if sql.lstrip().upper().startswith("UPDATE TASK ")]
+    assert len(updates) == 1
+    assert sorted(result.written) == sorted(task_ids[1:])
+    assert not result.failed
+    assert [sorted(event.ids) for event in events] == [sorted(task_ids[1:])]
+    assert _completed(session_factory, task_ids) == {task_id: task_id != task_ids[0] for task_id in task_ids}
+    assert len(queue) == 0
+    assert queue.flush().written == ()
+
+def test_flush_is_not_postponed_past_max_delay(controllers):
+    tasks, _ = controllers
+    task_id = tasks.create_task("x").id
+    schedule, clock = _Scheduler(), _Clock()
+    queue = WriteBehindQueue(tasks, schedule, delay=0.5, max_delay=2.0, clock=clock)
+
+    queue.submit(task_id, {"priority": 1})
+    clock.now += 1.8
+    queue.submit(task_id, {"priority": 2})
+    # 第二次只等到第一条修改满 max_delay 为止
+    assert schedule.delays == pytest.approx([0.5, 0.2])
+    clock.now += 0.2
+    queue.submit(task_id, {"priority": 3})
+    # 距第一条修改已满 max_delay，立即写入
+    assert len(queue) == 0
+    assert tasks.list_task_rows([task_id])[0].priority == 3
+
+def test_only_failing_tasks_are_reported(controllers, session_factory):
+    tasks, _ = controllers
+    task_ids = tasks.bulk_create([{"title": f"task {n}"} for n in range(4)])
+    broken, deleted = task_ids[1], task_ids[2]
+    with session_factory() as session:
+        session.execute(text(
+            f"CREATE TRIGGER reject_task AFTER UPDATE ON task WHEN NEW.id = {broken} "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        ))
+        session.commit()
+    tasks.delete_task(deleted)
+    reported = []
+    queue = WriteBehindQueue(tasks, _Scheduler(), on_failed=reported.append)
+
+    for task_id in task_ids:
+        queue.submit(task_id, {"completed": True}, {"completed": False})
+    result = queue.flush()
+
+    # 整批失败后逐个重试，其余任务的修改仍然写入
+    assert sorted(result.written) == sorted([task_ids[0], task_ids[3]])
+    assert set(result.failed) == {broken, deleted}
+    assert result.failed[broken].previous == {"completed": False}
+    assert "rejected" in str(result.error)
+    assert reported == [result]
+    assert _completed(session_factory, task_ids) == {task_ids[0]: True, broken: False, task_ids[3]: True}